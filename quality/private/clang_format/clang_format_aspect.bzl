@@ -23,16 +23,21 @@ load(
     "cc_get_toolchain_binary",
 )
 
-def _aspect_return(direct_outputs, transitive_outputs):
+def _aspect_return(direct_outputs, transitive_outputs, direct_traces = [], transitive_traces = []):
     """Returns the default output of this aspect.
 
     Args:
         direct_outputs: List of objects.
         transitive_outputs: List of depsets.
+        direct_traces: List of Chrome traces of the runner, see the `trace_clang_format` feature.
+        transitive_traces: List of depsets of Chrome traces.
     Returns:
-        OutputGroupInfo: The default output provider augmented with clang_format_output.
+        OutputGroupInfo: The default output provider augmented with clang_format_output and clang_format_traces.
     """
-    return [OutputGroupInfo(clang_format_output = depset(direct_outputs, transitive = transitive_outputs))]
+    return [OutputGroupInfo(
+        clang_format_output = depset(direct_outputs, transitive = transitive_outputs),
+        clang_format_traces = depset(direct_traces, transitive = transitive_traces),
+    )]
 
 def _is_target_excluded(target, excludes, excludes_override):
     """Returns whether a certain target is excluded or not given a list of exclusions and overrided exclusions.
@@ -52,12 +57,12 @@ def _is_target_excluded(target, excludes, excludes_override):
             return True
     return False
 
-def _collect_transitive_outputs(ctx):
-    """Collects transitive outputs from the context."""
+def _collect_transitive_outputs(ctx, output_group = "clang_format_output"):
+    """Collects transitive outputs of the given output group from the context."""
     transitive_outputs = []
     for dep in getattr(ctx.rule.attr, "deps", []):
-        if "clang_format_output" in dep[OutputGroupInfo]:
-            transitive_outputs.append(dep[OutputGroupInfo].clang_format_output)
+        if output_group in dep[OutputGroupInfo]:
+            transitive_outputs.append(getattr(dep[OutputGroupInfo], output_group))
     return transitive_outputs
 
 def _clang_format_aspect_implementation(target, ctx):
@@ -65,6 +70,7 @@ def _clang_format_aspect_implementation(target, ctx):
 
     outputs = []
     transitive_outputs = _collect_transitive_outputs(ctx)
+    transitive_traces = _collect_transitive_outputs(ctx, "clang_format_traces")
 
     is_valid_target = CcInfo in target
     clang_format_config = ctx.attr._clang_format_config[ClangFormatConfigInfo]
@@ -81,14 +87,14 @@ def _clang_format_aspect_implementation(target, ctx):
         is_valid_target = False
 
     if not is_valid_target:
-        return _aspect_return([], transitive_outputs)
+        return _aspect_return([], transitive_outputs, transitive_traces = transitive_traces)
 
     toolchain = find_cpp_toolchain(ctx)
     sources = cc_aspect_get_files(ctx, "srcs")
     headers = cc_aspect_get_files(ctx, "hdrs")
 
     if not sources:
-        return _aspect_return([], transitive_outputs)
+        return _aspect_return([], transitive_outputs, transitive_traces = transitive_traces)
 
     for header in target[CcInfo].compilation_context.headers.to_list():
         if header not in headers:
@@ -112,6 +118,12 @@ def _clang_format_aspect_implementation(target, ctx):
     args.add("--tool-output-text", findings_text_file.path, format = "%s")
     args.add("--tool-output-json", findings_json_file.path, format = "%s")
 
+    traces = []
+    if "trace_clang_format" in ctx.features:
+        trace_file = ctx.actions.declare_file(target.label.name + ".clang_format_trace.json")
+        args.add("--trace-file", trace_file.path, format = "%s")
+        traces.append(trace_file)
+
     file_refactor = "false"
     if "refactor" in ctx.features:
         args.add("--refactor", True, format = "%s")
@@ -124,7 +136,7 @@ def _clang_format_aspect_implementation(target, ctx):
 
     ctx.actions.run(
         inputs = inputs,
-        outputs = outputs,
+        outputs = outputs + traces,
         arguments = [args],
         tools = [ctx.executable._runner, toolchain.all_files],
         executable = ctx.executable._runner,
@@ -133,7 +145,7 @@ def _clang_format_aspect_implementation(target, ctx):
         mnemonic = "ClangFormat",
     )
 
-    return _aspect_return(outputs, transitive_outputs)
+    return _aspect_return(outputs, transitive_outputs, traces, transitive_traces)
 
 def _clang_format_aspect_instance():
     """Clang-format aspect instance.
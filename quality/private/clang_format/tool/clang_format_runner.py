@@ -23,6 +23,8 @@ import re
 import subprocess
 import typing as t
 
+from quality.private.common.tools import tracing
+
 
 class Severity(str, enum.Enum):
     """Enum for severity types."""
@@ -120,7 +122,7 @@ class SubprocessInfo:
 def execute_subprocess(commands: t.List[str]) -> SubprocessInfo:
     """Function that calls a subprocess and expects a zero return code."""
 
-    result = subprocess.run(
+    result = tracing.run(
         commands,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
@@ -147,6 +149,7 @@ class AspectArguments:
     tool_output_json: pathlib.Path
     refactor: bool
     compiler_executable: pathlib.Path
+    trace_file: t.Optional[pathlib.Path] = None
 
     def __post_init__(self):
         if self.compiler_executable.exists():
@@ -203,6 +206,12 @@ def parse_args() -> AspectArguments:
         default=False,
         help="",
     )
+    parser.add_argument(
+        "--trace-file",
+        type=pathlib.Path,
+        required=False,
+        help="Path of a Chrome trace recording the phases of the runner and the resource usage of clang-format.",
+    )
 
     return AspectArguments(**vars(parser.parse_args()))
 
@@ -261,21 +270,38 @@ def clang_format_output_parser(tool_output: SubprocessInfo) -> Findings:
     return findings
 
 
-def main():
-    """Main entry point."""
+def run_clang_format(args: AspectArguments) -> Findings:
+    """Runs clang-format on the target files and writes the findings to the tool outputs."""
+    with tracing.phase("clang-format lookup"):
+        clang_format = list(args.compiler_executable.parent.glob("clang-format"))[0]
 
-    args = parse_args()
+    subprocess_list = get_clang_format_command(args, clang_format)
 
-    clang_format = list(args.compiler_executable.parent.glob("clang-format"))[0]
+    with tracing.phase("clang-format", files=len(args.target_files)):
+        tool_output = execute_subprocess(subprocess_list)
+
+    with tracing.phase("output parse"):
+        findings = clang_format_output_parser(tool_output)
+
+    with tracing.phase("findings write", findings=len(findings)):
+        findings.to_text_file(args.tool_output_text)
+        findings.to_json_file(args.tool_output_json)
+    return findings
 
-    subprocess_list = get_clang_format_command(args, clang_format)
 
-    tool_output = execute_subprocess(subprocess_list)
+def main():
+    """Main entry point."""
+
+    args = parse_args()
 
-    findings = clang_format_output_parser(tool_output)
+    tracer = tracing.Tracer("clang-format runner") if args.trace_file else None
+    try:
+        with tracing.activated(tracer):
+            findings = run_clang_format(args)
+    finally:
+        if tracer:
+            tracer.write(args.trace_file)
 
-    findings.to_text_file(args.tool_output_text)
-    findings.to_json_file(args.tool_output_json)
     if findings:
         raise LinterFindingAsError(
             tool_name="clang-format",
@@ -13,6 +13,7 @@
 
 """Tests for the clang_format runner."""
 
+import json
 import pathlib
 import subprocess
 import typing
@@ -21,6 +22,7 @@ import pytest
 from pytest_mock import MockerFixture
 
 from quality.private.clang_format.tool import clang_format_runner
+from quality.private.common.tools.test import benchmark
 
 
 def test_clang_format_output_parser_with_no_issues() -> None:
@@ -320,7 +322,7 @@ def test_execute_subprocess_success(mocker: MockerFixture):
     """Test execute_subprocess returns correct SubprocessInfo on success."""
 
     mocker.patch(
-        "subprocess.run",
+        "quality.private.common.tools.tracing.run",
         return_value=subprocess.CompletedProcess(
             args=[],
             returncode=0,
@@ -508,3 +510,82 @@ def test_aspectarguments_post_init_file_error(tmp_path) -> None:
 
     with pytest.raises(FileNotFoundError):
         clang_format_runner.AspectArguments(**aspect_arguments)
+
+
+# The runner is started once per target, hence its startup is budgeted
+STARTUP_BUDGET_SECONDS = 0.2
+
+
+def run_startup(tmp_path: pathlib.Path) -> typing.Dict[str, typing.Any]:
+    """Runs the runner up to the clang-format launch in a fresh interpreter."""
+    compiler_executable = tmp_path / "clang"
+    compiler_executable.touch()
+    (tmp_path / "clang-format").touch()
+    arguments = [
+        "--target-files",
+        "file.cpp",
+        "--compiler-executable",
+        str(compiler_executable),
+        "--tool-output-text",
+        str(tmp_path / "out.txt"),
+        "--tool-output-json",
+        str(tmp_path / "out.json"),
+    ]
+    startup = benchmark.run_startup(
+        "quality.private.clang_format.tool.clang_format_runner", "clang_format_runner.main()", arguments
+    )
+    assert startup["launched"], "The runner finished without launching clang-format"
+    return startup
+
+
+def test_startup_launches_clang_format(tmp_path: pathlib.Path) -> None:
+    """The runner reaches the clang-format launch in a fresh interpreter."""
+    assert run_startup(tmp_path)["launched"]
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+def test_startup_within_budget(tmp_path: pathlib.Path) -> None:
+    """The runner reaches the clang-format launch within the budget, measured in a fresh interpreter."""
+    seconds = min(run_startup(tmp_path)["seconds"] for _ in range(3))
+
+    assert seconds < STARTUP_BUDGET_SECONDS
+
+
+def test_main_writes_trace_file(mocker: MockerFixture, tmp_path: pathlib.Path):
+    """The phases of the runner are written as Chrome trace, even if there are findings."""
+    trace_file = tmp_path / "trace.json"
+    test_clang_format = tmp_path / "clang-format"
+    test_clang_format.touch()
+
+    mocker.patch(
+        "quality.private.clang_format.tool.clang_format_runner.parse_args",
+        return_value=clang_format_runner.AspectArguments(
+            target_files={tmp_path / "test.c"},
+            tool_output_text=tmp_path / "test.text",
+            tool_output_json=tmp_path / "test.json",
+            refactor=False,
+            compiler_executable=test_clang_format,
+            config_file=None,
+            trace_file=trace_file,
+        ),
+    )
+    mocker.patch(
+        "quality.private.clang_format.tool.clang_format_runner.execute_subprocess",
+        return_value=clang_format_runner.SubprocessInfo(
+            stdout="",
+            stderr="test.c:1:1: warning: code should be clang-formatted [-Wclang-format-violations]\n",
+            return_code=0,
+        ),
+    )
+
+    with pytest.raises(clang_format_runner.LinterFindingAsError):
+        clang_format_runner.main()
+
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == [
+        "process_name",
+        "clang-format lookup",
+        "clang-format",
+        "output parse",
+        "findings write",
+    ]
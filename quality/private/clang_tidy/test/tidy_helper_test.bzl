@@ -16,7 +16,7 @@ This module tests the tidy_aspect module.
 """
 
 load("@bazel_skylib//lib:unittest.bzl", "asserts", "unittest")
-load("@score_bazel_tools_cc//quality/private/clang_tidy:tidy_helper.bzl", "determine_module_type", "get_fixes_filename")
+load("@score_bazel_tools_cc//quality/private/clang_tidy:tidy_helper.bzl", "determine_module_type", "get_batch_jobs", "get_changed_sources", "get_fixes_filename", "get_header_owners", "get_reported_headers")
 
 def _determine_module_type_test_impl(ctx):
     env = unittest.begin(ctx)
@@ -61,12 +61,76 @@ def _is_correct_filename_returned_test_impl(ctx):
 
     return unittest.end(env)
 
+def _mock_file(path):
+    return struct(path = path, basename = path.rpartition("/")[2])
+
+def _get_header_owners_test_impl(ctx):
+    env = unittest.begin(ctx)
+
+    headers = [_mock_file("lib/include/foo.h"), _mock_file("lib/include/bar.hpp"), _mock_file("lib/include/types.h")]
+    srcs = [_mock_file("lib/src/foo.cpp"), _mock_file("lib/src/bar.cpp"), _mock_file("lib/test/foo.cpp")]
+
+    expected_owners = {
+        "lib/include/bar.hpp": "lib/src/bar.cpp",
+        "lib/include/foo.h": "lib/src/foo.cpp",
+    }
+    asserts.equals(env, expected_owners, get_header_owners(headers, srcs))
+    asserts.equals(env, {}, get_header_owners(headers, []))
+
+    return unittest.end(env)
+
+def _get_batch_jobs_test_impl(ctx):
+    env = unittest.begin(ctx)
+
+    srcs = [_mock_file("lib/src/foo.cpp"), _mock_file("lib/src/bar.cpp"), _mock_file("lib/src/baz.cpp")]
+
+    asserts.equals(env, 2, get_batch_jobs(2, srcs))
+    asserts.equals(env, 3, get_batch_jobs(8, srcs))
+    asserts.equals(env, 1, get_batch_jobs(4, []))
+
+    return unittest.end(env)
+
+def _get_reported_headers_test_impl(ctx):
+    env = unittest.begin(ctx)
+
+    # A header-only dependency does not analyze any source file, hence its headers are reported by its dependents
+    header_only_headers = get_reported_headers([_mock_file("header_only/types.h")], [], [])
+    asserts.equals(env, [], header_only_headers.to_list())
+
+    dep_headers = get_reported_headers([_mock_file("dep/dep.h")], [_mock_file("dep/dep.cpp")], [header_only_headers])
+    asserts.equals(env, ["dep/dep.h"], [header.path for header in dep_headers.to_list()])
+
+    lib_headers = get_reported_headers([_mock_file("lib/lib.h")], [_mock_file("lib/lib.cpp")], [dep_headers, header_only_headers])
+    asserts.equals(env, ["dep/dep.h", "lib/lib.h"], sorted([header.path for header in lib_headers.to_list()]))
+
+    return unittest.end(env)
+
+def _get_changed_sources_test_impl(ctx):
+    env = unittest.begin(ctx)
+
+    headers = [_mock_file("lib/include/foo.h"), _mock_file("dep/include/dep.h")]
+    srcs = [_mock_file("lib/src/foo.cpp"), _mock_file("lib/src/bar.cpp")]
+
+    asserts.equals(env, [], get_changed_sources(srcs, headers, {"other/baz.cpp": True}))
+    asserts.equals(env, [srcs[1]], get_changed_sources(srcs, headers, {"lib/src/bar.cpp": True}))
+    asserts.equals(env, srcs, get_changed_sources(srcs, headers, {"dep/include/dep.h": True}))
+
+    return unittest.end(env)
+
 determine_module_type_test = unittest.make(_determine_module_type_test_impl)
 is_correct_filename_returned_test = unittest.make(_is_correct_filename_returned_test_impl)
+get_header_owners_test = unittest.make(_get_header_owners_test_impl)
+get_batch_jobs_test = unittest.make(_get_batch_jobs_test_impl)
+get_reported_headers_test = unittest.make(_get_reported_headers_test_impl)
+get_changed_sources_test = unittest.make(_get_changed_sources_test_impl)
 
 def tidy_aspect_test_suite(name):
     unittest.suite(
         name,
         determine_module_type_test,
         is_correct_filename_returned_test,
+        get_header_owners_test,
+        get_batch_jobs_test,
+        get_reported_headers_test,
+        get_changed_sources_test,
     )
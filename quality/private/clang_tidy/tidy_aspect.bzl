@@ -26,8 +26,14 @@ load(
 )
 load(
     "@score_bazel_tools_cc//quality/private/clang_tidy:tidy_helper.bzl",
+    "declare_merged_config_action",
     "determine_module_type",
+    "get_batch_jobs",
+    "get_changed_sources",
     "get_fixes_filename",
+    "get_header_owners",
+    "get_merged_config_key",
+    "get_reported_headers",
     "tidy_aspect_init",
     "tidy_get_enabled_features",
 )
@@ -41,6 +47,7 @@ load(
 )
 load(
     "@score_bazel_tools_cc//quality/private/common:cc_helper.bzl",
+    "cc_aspect_get_compilation_contexts_of_implementation_deps",
     "cc_aspect_get_compiler_flags",
     "cc_aspect_is_c_source",
     "cc_aspect_is_cpp_source",
@@ -54,12 +61,73 @@ load(
     "is_valid_target_filter",
 )
 
-def _tidy_aspect_return(outputs, cc_aspect_ctx):
+# Optional outputs of the clang-tidy actions, only built when requested via `--output_groups`
+_EXTRA_OUTPUT_GROUPS = [
+    # Time spent per check, see the `profile_clang_tidy` feature
+    "clang_tidy_check_profiles",
+    # Phases of the runner as Chrome trace, see the `trace_clang_tidy` feature
+    "clang_tidy_traces",
+    # Machine readable findings per translation unit, see the `findings_clang_tidy` feature
+    "clang_tidy_findings",
+    # Hits per suppress pattern of each translation unit, see the `suppression_stats_clang_tidy` feature
+    "clang_tidy_suppression_stats",
+    # Compile command per translation unit, merged into a workspace database by `clang_tidy_compilation_database`
+    "clang_tidy_compile_commands",
+]
+
+# The CPUs of a batched action are declared via a resource set, which bazel only accepts as top-level function
+def _tidy_aspect_resource_set_1(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 1}
+
+def _tidy_aspect_resource_set_2(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 2}
+
+def _tidy_aspect_resource_set_3(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 3}
+
+def _tidy_aspect_resource_set_4(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 4}
+
+def _tidy_aspect_resource_set_5(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 5}
+
+def _tidy_aspect_resource_set_6(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 6}
+
+def _tidy_aspect_resource_set_7(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 7}
+
+def _tidy_aspect_resource_set_8(os_name, inputs_size):
+    _ignore = [os_name, inputs_size]  # @unused
+    return {"cpu": 8}
+
+# Resource set per number of jobs, covering the allowed values of `batch_jobs`
+_BATCH_RESOURCE_SETS = {
+    1: _tidy_aspect_resource_set_1,
+    2: _tidy_aspect_resource_set_2,
+    3: _tidy_aspect_resource_set_3,
+    4: _tidy_aspect_resource_set_4,
+    5: _tidy_aspect_resource_set_5,
+    6: _tidy_aspect_resource_set_6,
+    7: _tidy_aspect_resource_set_7,
+    8: _tidy_aspect_resource_set_8,
+}
+
+def _tidy_aspect_return(outputs, cc_aspect_ctx, extra_outputs = {}, reported_headers = depset()):
     """Return helper for aspects
 
     Args:
         outputs: Desired aspect outputs
         cc_aspect_ctx: Aspect Context
+        extra_outputs: Dictionary from each of the `_EXTRA_OUTPUT_GROUPS` to its depset of outputs
+        reported_headers: Depset of the headers reported by the clang-tidy actions of the target and its dependencies
     Returns:
         A output group depset
     """
@@ -74,8 +142,12 @@ def _tidy_aspect_return(outputs, cc_aspect_ctx):
             outputs = outputs,
             srcs = cc_aspect_ctx["srcs"],
             hdrs = cc_aspect_ctx["hdrs"],
+            reported_headers = reported_headers,
+        ),
+        OutputGroupInfo(
+            clang_tidy_output = outputs,
+            **{output_group: extra_outputs.get(output_group, depset()) for output_group in _EXTRA_OUTPUT_GROUPS}
         ),
-        OutputGroupInfo(clang_tidy_output = outputs),
     ]
 
 def _tidy_aspect_construct_compiler_flags(ctx, src, target, cc_toolchain):
@@ -153,7 +225,8 @@ def _tidy_aspect_construct_compiler_flags(ctx, src, target, cc_toolchain):
 
     return forced_include_flags + priority_include_directories_flags + builtin_include_directories_flags + filtered_compiler_flags + additional_flags
 
-def _tidy_aspect_prepare_arguments(ctx, src, target, clang_tidy_path, cc_toolchain):
+def _tidy_aspect_add_translation_unit(ctx, args, src, target, clang_tidy_path, cc_toolchain):
+    """Declares the outputs of a single translation unit and adds its arguments"""
     compiler_flags = _tidy_aspect_construct_compiler_flags(ctx, src, target, cc_toolchain)
 
     clang_tidy_fixes_file = ctx.actions.declare_file(paths.join(
@@ -162,18 +235,8 @@ def _tidy_aspect_prepare_arguments(ctx, src, target, clang_tidy_path, cc_toolcha
         get_fixes_filename("{}.fixes.yaml".format(src.path.replace("/", "_"))),
     ))
 
-    args = ctx.actions.args()
-    if hasattr(ctx.attr, "checks"):
-        if ".clang-tidy" not in ctx.attr.checks:
-            # Required for argument parsing
-            checks = " " + ctx.attr.checks
-            args.add_all(["--checks", checks])
-
     compiler_flags.insert(0, clang_tidy_path)
 
-    args.use_param_file("@%s", use_always = True)
-    args.set_param_file_format("multiline")
-
     compile_commands_file = ctx.actions.declare_file(paths.join(
         "_tidy",
         target.label.name,
@@ -186,6 +249,141 @@ def _tidy_aspect_prepare_arguments(ctx, src, target, clang_tidy_path, cc_toolcha
     args.add_all(["--src_file", src.path])
     args.add_joined("--arguments", compiler_flags, join_with = ";")
     args.add_all(["--fixes", clang_tidy_fixes_file])
+
+    return clang_tidy_fixes_file, compile_commands_file
+
+def _tidy_aspect_add_check_profile(ctx, args, src, target):
+    """Declares the check profile of a single translation unit, i.e. the time spent per check"""
+    check_profile = ctx.actions.declare_file(paths.join(
+        "_tidy",
+        target.label.name,
+        get_fixes_filename("{}.check_profile.json".format(src.path.replace("/", "_"))),
+    ))
+
+    args.add_all(["--check_profile", check_profile])
+
+    return check_profile
+
+def _tidy_aspect_add_findings(ctx, args, src, target):
+    """Declares the machine readable findings of a single translation unit, one JSON object per line"""
+    findings = ctx.actions.declare_file(paths.join(
+        "_tidy",
+        target.label.name,
+        get_fixes_filename("{}.findings.jsonl".format(src.path.replace("/", "_"))),
+    ))
+
+    args.add_all(["--findings", findings])
+
+    return findings
+
+def _tidy_aspect_add_suppression_stats(ctx, args, src, target):
+    """Declares the hits per suppress pattern of a single translation unit"""
+    suppression_stats = ctx.actions.declare_file(paths.join(
+        "_tidy",
+        target.label.name,
+        get_fixes_filename("{}.suppression_stats.json".format(src.path.replace("/", "_"))),
+    ))
+
+    args.add_all(["--suppression_stats", suppression_stats])
+
+    return suppression_stats
+
+def _tidy_aspect_add_trace_file(ctx, args, src, target):
+    """Declares the Chrome trace of an action, recording the phases of the runner"""
+    trace_file = ctx.actions.declare_file(paths.join(
+        "_tidy",
+        target.label.name,
+        get_fixes_filename("{}.trace.json".format(src.path.replace("/", "_"))),
+    ))
+
+    args.add_all(["--trace_file", trace_file])
+
+    return trace_file
+
+def _tidy_aspect_add_unused_inputs(ctx, args, src, target, prunable_inputs, cc_toolchain):
+    """Declares the unused inputs list of an action, headers not included by any of its translation units are pruned"""
+    unused_inputs_file = ctx.actions.declare_file(paths.join(
+        "_tidy",
+        target.label.name,
+        get_fixes_filename("{}.unused_inputs".format(src.path.replace("/", "_"))),
+    ))
+
+    args.add_all(["--unused_inputs_list", unused_inputs_file])
+    args.add_all("--prunable_inputs", prunable_inputs)
+
+    # Already added along with the result cache
+    if not ctx.attr._clang_tidy_config[ClangTidyConfigInfo].result_cache_dir:
+        args.add_all(["--preprocessor", cc_toolchain.compiler_executable])
+
+    return unused_inputs_file
+
+def _tidy_aspect_get_dependency_reported_headers(ctx):
+    """Returns the depsets of the headers reported by the dependencies, their findings are dropped by the dependents"""
+    dependencies = getattr(ctx.rule.attr, "deps", []) + getattr(ctx.rule.attr, "implementation_deps", [])
+    return [dep[ClangTidyAspectOutputInfo].reported_headers for dep in dependencies if ClangTidyAspectOutputInfo in dep]
+
+def _tidy_aspect_add_dependency_headers(ctx, target, dependency_headers):
+    """Writes the headers reported by the dependencies once per target, such that the actions only refer to the file"""
+    dependency_headers_file = ctx.actions.declare_file(paths.join(
+        "_tidy",
+        target.label.name,
+        "dependency_headers.txt",
+    ))
+    content = ctx.actions.args()
+    content.set_param_file_format("multiline")
+    content.add_all(dependency_headers)
+    ctx.actions.write(output = dependency_headers_file, content = content)
+    return dependency_headers_file
+
+def _tidy_aspect_select_changed_sources(ctx, target, action_groups, changed_files):
+    """Restricts the action groups to the sources which are changed or directly include a changed header"""
+    compilation_contexts = [dep[CcInfo].compilation_context for dep in getattr(ctx.rule.attr, "deps", []) if CcInfo in dep]
+    compilation_contexts += cc_aspect_get_compilation_contexts_of_implementation_deps(ctx)
+    compilation_contexts.append(target[CcInfo].compilation_context)
+
+    headers = []
+    for compilation_context in compilation_contexts:
+        headers += compilation_context.direct_headers + compilation_context.direct_textual_headers
+
+    changed_action_groups = {}
+    for group_key, group_srcs in action_groups.items():
+        changed_srcs = get_changed_sources(group_srcs, headers, changed_files)
+        if changed_srcs:
+            changed_action_groups[group_key] = changed_srcs
+    return changed_action_groups
+
+def _tidy_aspect_get_merged_config_file(ctx, config_files, module_type, merged_config_files):
+    """Returns the merged config, either shared via the config rule or merged once for this target"""
+    clang_tidy_config = ctx.attr._clang_tidy_config[ClangTidyConfigInfo]
+    merged_config_key = get_merged_config_key(config_files, module_type)
+
+    if merged_config_key in clang_tidy_config.merged_configs:
+        return clang_tidy_config.merged_configs[merged_config_key]
+
+    # Combinations of multiple configs are only known per target
+    if merged_config_key not in merged_config_files:
+        merged_config_file = ctx.actions.declare_file(paths.join(
+            "_tidy",
+            ctx.label.name,
+            "{}.clang-tidy-merged".format(hash(merged_config_key)),
+        ))
+        declare_merged_config_action(ctx, clang_tidy_config.config_merger, config_files, module_type, merged_config_file)
+        merged_config_files[merged_config_key] = merged_config_file
+
+    return merged_config_files[merged_config_key]
+
+def _tidy_aspect_prepare_arguments(ctx, src, clang_tidy_path, cc_toolchain, merged_config_files):
+    """Prepares the arguments shared by all translation units of the same language"""
+    args = ctx.actions.args()
+    if hasattr(ctx.attr, "checks"):
+        if ".clang-tidy" not in ctx.attr.checks:
+            # Required for argument parsing
+            checks = " " + ctx.attr.checks
+            args.add_all(["--checks", checks])
+
+    args.use_param_file("@%s", use_always = True)
+    args.set_param_file_format("multiline")
+
     args.add_all(["--tool_bin", clang_tidy_path])
 
     module_type = determine_module_type(ctx)
@@ -205,6 +403,9 @@ def _tidy_aspect_prepare_arguments(ctx, src, target, clang_tidy_path, cc_toolcha
     if is_feature_active(ctx, "allow_analyzer_alpha_checkers_clang_tidy", extra_features):
         args.add("--allow-enabling-analyzer-alpha-checkers")
 
+    if is_feature_active(ctx, "streaming_output_clang_tidy", extra_features):
+        args.add("--stream_output")
+
     clang_tidy_config = ctx.attr._clang_tidy_config[ClangTidyConfigInfo]
     feature_mapping = clang_tidy_config.feature_mapping
 
@@ -216,23 +417,28 @@ def _tidy_aspect_prepare_arguments(ctx, src, target, clang_tidy_path, cc_toolcha
 
     default_feature = clang_tidy_config.default_feature
 
-    config_file = None
-    has_at_least_one_custom_feature_active = False
+    selected_config_files = []
     default_feature_config_file = None
 
     for config_label, feature_name in feature_mapping.items():
-        config_file_name = config_label.files.to_list()[0].basename
+        config_file = config_label.files.to_list()[0]
         if feature_name == default_feature:
-            config_file = config_file_name
             default_feature_config_file = config_file
 
         if is_feature_active(ctx, feature_name):
-            has_at_least_one_custom_feature_active = True
-            config_file = config_file_name
-            args.add_all(["--config_file", config_file])
+            selected_config_files.append(config_file)
 
-    if not has_at_least_one_custom_feature_active:
-        args.add_all(["--config_file", default_feature_config_file])
+    if not selected_config_files:
+        selected_config_files.append(default_feature_config_file)
+
+    if is_feature_active(ctx, "merged_config_clang_tidy", extra_features):
+        merged_config_file = _tidy_aspect_get_merged_config_file(ctx, selected_config_files, module_type, merged_config_files)
+        args.add_all(["--merged_config_file", merged_config_file])
+        config_inputs = [merged_config_file]
+    else:
+        for config_file in selected_config_files:
+            args.add_all(["--config_file", config_file.path])
+        config_inputs = [config_files.files.to_list()[0] for config_files in feature_mapping.keys()]
 
     header_filter = clang_tidy_config.header_filter
     if header_filter:
@@ -245,9 +451,26 @@ def _tidy_aspect_prepare_arguments(ctx, src, target, clang_tidy_path, cc_toolcha
     if suppress_patterns:
         args.add_all("--suppress_patterns", suppress_patterns)
 
-    return args, feature_mapping, clang_tidy_fixes_file, compile_commands_file
+    # The result cache lives outside of bazel, the preprocessed translation unit serves as its key
+    if clang_tidy_config.result_cache_dir:
+        args.add_all(["--result_cache_dir", clang_tidy_config.result_cache_dir])
+        args.add_all(["--result_cache_max_size_mb", str(clang_tidy_config.result_cache_max_size_mb)])
+        args.add_all(["--preprocessor", cc_toolchain.compiler_executable])
+
+    # Aborts the analysis of translation units which would otherwise stall or exhaust the executor
+    if clang_tidy_config.timeout_seconds:
+        args.add_all(["--timeout_seconds", str(clang_tidy_config.timeout_seconds)])
+    if clang_tidy_config.memory_limit_mb:
+        args.add_all(["--memory_limit_mb", str(clang_tidy_config.memory_limit_mb)])
+
+    # Restricts the findings to the lines changed by e.g. a pull request
+    if clang_tidy_config.changed_lines:
+        args.add_all(["--changed_lines", clang_tidy_config.changed_lines])
+        config_inputs = config_inputs + [clang_tidy_config.changed_lines]
 
-def _tidy_get_transitivity(ctx):
+    return args, config_inputs
+
+def _tidy_get_transitivity(ctx, output_group = "clang_tidy_output"):
     transitive_outputs = []
     extra_features = tidy_get_enabled_features(ctx)
     if is_feature_active(ctx, "recursive_clang_tidy", extra_features):
@@ -273,8 +496,8 @@ def _tidy_get_transitivity(ctx):
                 if not dependency or type(dependency) != "Target":
                     continue
 
-                if OutputGroupInfo in dependency and hasattr(dependency[OutputGroupInfo], "clang_tidy_output"):
-                    transitive_outputs.append(dependency[OutputGroupInfo].clang_tidy_output)
+                if OutputGroupInfo in dependency and hasattr(dependency[OutputGroupInfo], output_group):
+                    transitive_outputs.append(getattr(dependency[OutputGroupInfo], output_group))
 
     return transitive_outputs
 
@@ -292,6 +515,18 @@ def _tidy_get_clang_tidy_binary(ctx):
         "Make sure the `clang_tidy_binary` attribute of the ClangTidyConfigInfo is correct and has exactly one executable to run.",
     )
 
+def _tidy_get_execution_requirements(ctx):
+    # Persistent (and optionally multiplex) workers keep the python runner alive between actions
+    extra_features = tidy_get_enabled_features(ctx)
+    execution_requirements = {}
+    if is_feature_active(ctx, "persistent_worker_clang_tidy", extra_features):
+        execution_requirements["supports-workers"] = "1"
+        execution_requirements["requires-worker-protocol"] = "json"
+    if is_feature_active(ctx, "multiplex_worker_clang_tidy", extra_features):
+        execution_requirements["supports-multiplex-workers"] = "1"
+        execution_requirements["requires-worker-protocol"] = "json"
+    return execution_requirements
+
 def _tidy_aspect_aspect_impl(target, ctx):
     """Aspect implementation preparing the call to the clang-tidy runner and checks validity"""
     aspect_ctx = tidy_aspect_init(target, ctx)
@@ -310,10 +545,16 @@ def _tidy_aspect_aspect_impl(target, ctx):
     if ctx.rule.kind in clang_tidy_config.exclude_types_including_deps:
         return _tidy_aspect_return(depset(direct = all_outputs), aspect_ctx)
 
+    # Findings in the headers of dependencies are only dropped if a clang-tidy action of a dependency reports them
+    dependency_reported_headers = _tidy_aspect_get_dependency_reported_headers(ctx)
+    early_return_reported_headers = depset(transitive = dependency_reported_headers)
+
     transitive_outputs = _tidy_get_transitivity(ctx)
+    transitive_extra_outputs = {output_group: _tidy_get_transitivity(ctx, output_group) for output_group in _EXTRA_OUTPUT_GROUPS}
 
     # Returning an empty list of outputs will not trigger any execution for this target
     early_return_depset = depset(direct = all_outputs, transitive = transitive_outputs)
+    early_return_extra_outputs = {output_group: depset(transitive = transitive) for output_group, transitive in transitive_extra_outputs.items()}
 
     has_target_type_attribute = clang_tidy_config.target_types != ["<NONE>"]
     has_supported_target_type = ctx.rule.kind in clang_tidy_config.target_types
@@ -328,26 +569,108 @@ def _tidy_aspect_aspect_impl(target, ctx):
     has_third_party_warning_feature = "third_party_warnings" in ctx.rule.attr.features
 
     if not is_valid_target or has_third_party_warning_feature:
-        return _tidy_aspect_return(early_return_depset, aspect_ctx)
-
+        return _tidy_aspect_return(early_return_depset, aspect_ctx, early_return_extra_outputs, early_return_reported_headers)
+
+    execution_requirements = _tidy_get_execution_requirements(ctx)
+    is_profiled = is_feature_active(ctx, "profile_clang_tidy", tidy_get_enabled_features(ctx))
+    is_traced = is_feature_active(ctx, "trace_clang_tidy", tidy_get_enabled_features(ctx))
+    has_findings = is_feature_active(ctx, "findings_clang_tidy", tidy_get_enabled_features(ctx))
+    has_suppression_stats = is_feature_active(ctx, "suppression_stats_clang_tidy", tidy_get_enabled_features(ctx))
+    extra_outputs = {output_group: [] for output_group in _EXTRA_OUTPUT_GROUPS}
+
+    # Either one action per source file or, when batched, one action per target and language
+    is_batched = is_feature_active(ctx, "batch_clang_tidy", tidy_get_enabled_features(ctx))
+    action_groups = {}
+    merged_config_files = {}
     for src in srcs:
         excludes = clang_tidy_config.excludes
         excludes_override = clang_tidy_config.excludes_override
         if not is_valid_target_filter(excludes, excludes_override, src) or not cc_aspect_is_source(src) or src.is_directory:
             continue
 
-        # Prepare outputs files and arguments
-        args, feature_mapping, clang_tidy_fixes_file, compile_commands_file = _tidy_aspect_prepare_arguments(
-            ctx,
-            src,
-            target,
-            clang_tidy_binary.path,
-            cc_toolchain,
-        )
-
-        all_outputs.append(clang_tidy_fixes_file)
+        group_key = cc_get_action(src) if is_batched else src.path
+        action_groups.setdefault(group_key, []).append(src)
+
+    # Only the changed set is analyzed, such that the number of actions scales with the size of a change
+    changed_files = clang_tidy_config.changed_files[BuildSettingInfo].value if clang_tidy_config.changed_files else []
+    if changed_files:
+        action_groups = _tidy_aspect_select_changed_sources(ctx, target, action_groups, {changed_file: True for changed_file in changed_files})
+        if not action_groups:
+            return _tidy_aspect_return(early_return_depset, aspect_ctx, early_return_extra_outputs, early_return_reported_headers)
+
+    compilation_context = target[CcInfo].compilation_context
+    own_headers = compilation_context.direct_headers + compilation_context.direct_textual_headers
+    analyzed_srcs = [src for group_srcs in action_groups.values() for src in group_srcs]
+    reported_headers = get_reported_headers(own_headers, analyzed_srcs, dependency_reported_headers)
+
+    # Each header is reported by a single translation unit of its owning target only
+    has_header_ownership = is_feature_active(ctx, "header_ownership_clang_tidy", tidy_get_enabled_features(ctx))
+    header_owners = {}
+    dependency_headers_file = None
+    if has_header_ownership and action_groups:
+        header_owners = get_header_owners(own_headers, analyzed_srcs)
+        dependency_headers_file = _tidy_aspect_add_dependency_headers(ctx, target, early_return_reported_headers)
+
+    for group_srcs in action_groups.values():
+        # All sources of a group share the language and thus the config and include files
+        src = group_srcs[0]
 
-        feature_mapping_conig_file_labels = feature_mapping.keys()
+        # Prepare outputs files and arguments
+        args, config_files = _tidy_aspect_prepare_arguments(ctx, src, clang_tidy_binary.path, cc_toolchain, merged_config_files)
+
+        action_outputs = []
+        for group_src in group_srcs:
+            clang_tidy_fixes_file, compile_commands_file = _tidy_aspect_add_translation_unit(
+                ctx,
+                args,
+                group_src,
+                target,
+                clang_tidy_binary.path,
+                cc_toolchain,
+            )
+            all_outputs.append(clang_tidy_fixes_file)
+            action_outputs.extend([clang_tidy_fixes_file, compile_commands_file])
+            extra_outputs["clang_tidy_compile_commands"].append(compile_commands_file)
+
+            if is_profiled:
+                check_profile = _tidy_aspect_add_check_profile(ctx, args, group_src, target)
+                extra_outputs["clang_tidy_check_profiles"].append(check_profile)
+                action_outputs.append(check_profile)
+
+            if has_findings:
+                findings = _tidy_aspect_add_findings(ctx, args, group_src, target)
+                extra_outputs["clang_tidy_findings"].append(findings)
+                action_outputs.append(findings)
+
+            if has_suppression_stats:
+                suppression_stats = _tidy_aspect_add_suppression_stats(ctx, args, group_src, target)
+                extra_outputs["clang_tidy_suppression_stats"].append(suppression_stats)
+                action_outputs.append(suppression_stats)
+
+            if has_header_ownership:
+                sibling_headers = [header for header in own_headers if header_owners.get(header.path, group_src.path) != group_src.path]
+                args.add_joined("--foreign_headers", sibling_headers, join_with = ";", omit_if_empty = False)
+
+        if dependency_headers_file:
+            args.add_all(["--dependency_headers_file", dependency_headers_file])
+
+        # The runner analyzes the sources of a batch concurrently, bazel has to reserve a CPU per job
+        resource_set = None
+        if is_batched:
+            jobs = get_batch_jobs(clang_tidy_config.batch_jobs, group_srcs)
+            args.add_all(["--jobs", str(jobs)])
+            resource_set = _BATCH_RESOURCE_SETS[jobs]
+
+        if is_traced:
+            trace_file = _tidy_aspect_add_trace_file(ctx, args, src, target)
+            extra_outputs["clang_tidy_traces"].append(trace_file)
+            action_outputs.append(trace_file)
+
+        unused_inputs_file = None
+        if is_feature_active(ctx, "prune_inputs_clang_tidy", tidy_get_enabled_features(ctx)):
+            prunable_inputs = hdrs + [target_src for target_src in srcs if target_src not in group_srcs]
+            unused_inputs_file = _tidy_aspect_add_unused_inputs(ctx, args, src, target, prunable_inputs, cc_toolchain)
+            action_outputs.append(unused_inputs_file)
 
         action_name = cc_get_action(src)
         extract_files_list_from = (lambda targets: [target.files.to_list() for target in targets])
@@ -361,30 +684,40 @@ def _tidy_aspect_aspect_impl(target, ctx):
         if clang_tidy_config.clang_tidy_forced_includes:
             forced_include_files_list = populate_include_files_list_from(clang_tidy_config.clang_tidy_forced_includes[ClangTidyForcedIncludesInfo])
 
-        config_files_list = [config_files.files.to_list() for config_files in feature_mapping_conig_file_labels]
         deps_files_list = [deps_files.files.to_list() for deps_files in clang_tidy_config.deps]
 
         priority_include_files = [priority_include_file for priority_include_files in priority_include_files_list for priority_include_file in priority_include_files]
         forced_include_files = [forced_include_file for forced_include_files in forced_include_files_list for forced_include_file in forced_include_files]
-        config_files = [config_file for config_files in config_files_list for config_file in config_files]
         dep_files = [dep_file for deps_files in deps_files_list for dep_file in deps_files]
 
+        if len(group_srcs) == 1:
+            progress_message = "Running clang-tidy on file " + src.path + " from target " + str(target.label)
+        else:
+            progress_message = "Running clang-tidy on " + str(len(group_srcs)) + " files from target " + str(target.label)
+
         # The action invoking the clang-tidy runner (python) which has all required
-        # arguments derived from the source file (i.e. compiler flags) to eventually call
+        # arguments derived from the source file(s) (i.e. compiler flags) to eventually call
         # the clang-tidy binary
         ctx.actions.run(
-            inputs = [clang_tidy_binary] + clang_tidy_files + srcs + hdrs + dep_files + config_files + forced_include_files + priority_include_files,
+            inputs = [clang_tidy_binary] + clang_tidy_files + srcs + hdrs + dep_files + config_files + forced_include_files + priority_include_files + ([dependency_headers_file] if dependency_headers_file else []),
             executable = ctx.executable._clang_tidy_runner,
-            outputs = [clang_tidy_fixes_file, compile_commands_file],
+            outputs = action_outputs,
             arguments = [args],
             tools = [clang_tidy_binary, ctx.executable._clang_tidy_runner, cc_toolchain.all_files],
-            progress_message = "Running clang-tidy on file " + src.path + " from target " + str(target.label),
+            progress_message = progress_message,
+            execution_requirements = execution_requirements,
+            unused_inputs_list = unused_inputs_file,
+            resource_set = resource_set,
             mnemonic = "ClangTidyAnalysis",
         )
 
     accumulated_outputs = depset(direct = all_outputs, transitive = transitive_outputs)
+    accumulated_extra_outputs = {
+        output_group: depset(direct = extra_outputs[output_group], transitive = transitive_extra_outputs[output_group])
+        for output_group in _EXTRA_OUTPUT_GROUPS
+    }
 
-    return _tidy_aspect_return(accumulated_outputs, aspect_ctx)
+    return _tidy_aspect_return(accumulated_outputs, aspect_ctx, accumulated_extra_outputs, reported_headers)
 
 def _tidy_aspect_instance(
         attributes = {},
@@ -24,17 +24,48 @@ load(
     "ClangTidyIncludeDirectoryInfo",
     "ClangTidyPriorityIncludesInfo",
 )
+load(
+    "@score_bazel_tools_cc//quality/private/clang_tidy:tidy_helper.bzl",
+    "MODULE_TYPES",
+    "declare_merged_config_action",
+    "get_merged_config_key",
+)
+
+def _quality_clang_tidy_config_declare_merged_configs(ctx):
+    """Merges each single config file once per module type, shared by all checked targets"""
+    config_files = {}
+    for feature_mapping in [ctx.attr.feature_mapping, ctx.attr.feature_mapping_c, ctx.attr.feature_mapping_cpp]:
+        for config_label in feature_mapping.keys():
+            config_file = config_label.files.to_list()[0]
+            config_files[config_file.path] = config_file
+
+    merged_configs = {}
+    for config_file in config_files.values():
+        for module_type in MODULE_TYPES:
+            merged_config_key = get_merged_config_key([config_file], module_type)
+            merged_config_file = ctx.actions.declare_file(paths.join(
+                ctx.label.name,
+                "{}_{}.clang-tidy-merged".format(hash(config_file.path), module_type or "default"),
+            ))
+            declare_merged_config_action(ctx, ctx.attr._config_merger[DefaultInfo].files_to_run, [config_file], module_type, merged_config_file)
+            merged_configs[merged_config_key] = merged_config_file
+
+    return merged_configs
 
 def _quality_clang_tidy_config_impl(ctx):
     return [
         ClangTidyConfigInfo(
             additional_flags = ctx.attr.additional_flags,
             autodetermine_builtin_include_directories = ctx.attr.autodetermine_builtin_include_directories,
+            batch_jobs = ctx.attr.batch_jobs,
+            changed_files = ctx.attr.changed_files,
+            changed_lines = ctx.file.changed_lines,
             clang_tidy_binary = ctx.attr.clang_tidy_binary,
             clang_tidy_enable_features = ctx.attr.clang_tidy_enable_features,
             clang_tidy_files = ctx.attr.clang_tidy_files,
             clang_tidy_forced_includes = ctx.attr.clang_tidy_forced_includes,
             clang_tidy_priority_includes = ctx.attr.clang_tidy_priority_includes,
+            config_merger = ctx.attr._config_merger[DefaultInfo].files_to_run,
             default_feature = ctx.attr.default_feature,
             dependency_attributes = ctx.attr.dependency_attributes,
             deps = ctx.attr.deps,
@@ -46,9 +77,14 @@ def _quality_clang_tidy_config_impl(ctx):
             feature_mapping_c = ctx.attr.feature_mapping_c,
             feature_mapping_cpp = ctx.attr.feature_mapping_cpp,
             header_filter = ctx.attr.header_filter,
+            memory_limit_mb = ctx.attr.memory_limit_mb,
+            merged_configs = _quality_clang_tidy_config_declare_merged_configs(ctx),
+            result_cache_dir = ctx.attr.result_cache_dir,
+            result_cache_max_size_mb = ctx.attr.result_cache_max_size_mb,
             suppress_patterns = ctx.attr.suppress_patterns,
             system_headers = ctx.attr.system_headers,
             target_types = ctx.attr.target_types,
+            timeout_seconds = ctx.attr.timeout_seconds,
             unsupported_flags = ctx.attr.unsupported_flags,
         ),
     ]
@@ -58,6 +94,21 @@ quality_clang_tidy_config = rule(
     attrs = {
         "additional_flags": attr.string_list(default = []),
         "autodetermine_builtin_include_directories": attr.bool(default = False, mandatory = False),
+        "batch_jobs": attr.int(
+            default = 4,
+            values = [1, 2, 3, 4, 5, 6, 7, 8],
+            doc = "Maximum number of concurrent clang-tidy processes of an action of the `batch_clang_tidy` feature. Bazel schedules the action with as many CPUs.",
+        ),
+        "changed_files": attr.label(
+            mandatory = False,
+            providers = [BuildSettingInfo],
+            doc = "Label to a `string_list_flag` of changed files. If not empty, only changed sources and those directly including a changed header are analyzed.",
+        ),
+        "changed_lines": attr.label(
+            allow_single_file = [".diff", ".patch", ".json"],
+            mandatory = False,
+            doc = "Unified diff or JSON file mapping files to line ranges. Only findings on changed lines are reported.",
+        ),
         "clang_tidy_binary": attr.label(cfg = "exec", mandatory = True),
         "clang_tidy_enable_features": attr.string_list(
             default = [],
@@ -113,6 +164,18 @@ quality_clang_tidy_config = rule(
             mandatory = False,
             providers = [BuildSettingInfo],
         ),
+        "memory_limit_mb": attr.int(
+            default = 0,
+            doc = "Address space limit of clang-tidy per translation unit in MiB, the analysis is aborted beyond it. Unlimited if 0.",
+        ),
+        "result_cache_dir": attr.string(
+            default = "",
+            doc = "Absolute path of a local clang-tidy result cache, which may be shared by all actions of a host.",
+        ),
+        "result_cache_max_size_mb": attr.int(
+            default = 1024,
+            doc = "Size of the result cache in MiB beyond which the least recently used entries are evicted.",
+        ),
         "suppress_patterns": attr.string_list(default = []),
         "system_headers": attr.bool(
             default = False,
@@ -123,7 +186,16 @@ quality_clang_tidy_config = rule(
             default = ["<NONE>"],
             allow_empty = True,
         ),
+        "timeout_seconds": attr.int(
+            default = 0,
+            doc = "Wall clock limit of clang-tidy per translation unit in seconds, the analysis is aborted beyond it. Unlimited if 0.",
+        ),
         "unsupported_flags": attr.string_list(default = []),
+        "_config_merger": attr.label(
+            default = Label("@score_bazel_tools_cc//quality/private/clang_tidy/tools:clang_tidy_config_merger"),
+            executable = True,
+            cfg = "exec",
+        ),
     },
 )
 
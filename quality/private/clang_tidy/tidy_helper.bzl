@@ -131,3 +131,105 @@ def tidy_get_enabled_features(ctx):
     if hasattr(ctx.attr, "_clang_tidy_config"):
         return ctx.attr._clang_tidy_config[ClangTidyConfigInfo].clang_tidy_enable_features
     return []
+
+MODULE_TYPES = [None, "executable", "dynamic_library", "static_library"]
+
+def get_merged_config_key(config_files, module_type):
+    """Returns the key identifying the merged config of the given config files and module type.
+
+    Args:
+        config_files: List of clang-tidy config files.
+        module_type: Module type as determined by `determine_module_type`, may be None.
+    Returns:
+        A string which is equal for equal sets of config files and module types.
+    """
+    return ",".join(sorted([config_file.path for config_file in config_files])) + "|" + (module_type or "")
+
+def _get_stem(file):
+    return file.basename.rpartition(".")[0] or file.basename
+
+def get_header_owners(headers, srcs):
+    """Assigns each header to the first source file with the same stem, e.g. `foo.h` is owned by `foo.cpp`.
+
+    Args:
+        headers: List of header files of the target.
+        srcs: List of analyzed source files of the target.
+    Returns:
+        A dictionary from header path to the path of its owning source file. Headers without a source file
+        of the same stem are not assigned, hence every translation unit reports their findings.
+    """
+    srcs_by_stem = {}
+    for src in srcs:
+        srcs_by_stem.setdefault(_get_stem(src), src.path)
+
+    header_owners = {}
+    for header in headers:
+        owner = srcs_by_stem.get(_get_stem(header))
+        if owner:
+            header_owners[header.path] = owner
+    return header_owners
+
+def get_batch_jobs(max_jobs, srcs):
+    """Determines the number of concurrent clang-tidy processes of a batched action.
+
+    Args:
+        max_jobs: The `batch_jobs` of the clang-tidy config.
+        srcs: List of source files analyzed by the action.
+    Returns:
+        The number of jobs, at least one and at most `max_jobs`.
+    """
+    return max(1, min(max_jobs, len(srcs)))
+
+def get_reported_headers(headers, srcs, dependency_reported_headers):
+    """Collects the headers whose findings are reported by a clang-tidy action of a target or its dependencies.
+
+    Args:
+        headers: List of header files of the target.
+        srcs: List of analyzed source files of the target.
+        dependency_reported_headers: List of the depsets of reported headers of the dependencies.
+    Returns:
+        A depset of header files. The headers of a target are only reported if it analyzes a source file,
+        such that the findings in the headers of e.g. header-only or excluded dependencies are not dropped.
+    """
+    return depset(headers if srcs else [], transitive = dependency_reported_headers)
+
+def get_changed_sources(srcs, headers, changed_files):
+    """Selects the source files which are changed or may directly include a changed header.
+
+    Args:
+        srcs: List of analyzed source files of the target.
+        headers: List of headers the sources may directly include, i.e. those of the target and its direct dependencies.
+        changed_files: Dictionary whose keys are the paths of the changed files.
+    Returns:
+        The changed source files, or all of them if any of the headers has changed.
+    """
+    for header in headers:
+        if header.path in changed_files:
+            return srcs
+    return [src for src in srcs if src.path in changed_files]
+
+def declare_merged_config_action(ctx, config_merger, config_files, module_type, output):
+    """Declares an action merging the given config files into a single clang-tidy config.
+
+    Args:
+        ctx: Context.
+        config_merger: FilesToRunProvider of the config merger tool.
+        config_files: List of clang-tidy config files.
+        module_type: Module type which is added as check option, may be None.
+        output: The declared merged config file.
+    """
+    args = ctx.actions.args()
+    for config_file in config_files:
+        args.add_all(["--config_file", config_file])
+    if module_type:
+        args.add_all(["--module_type", module_type])
+    args.add_all(["--output", output])
+
+    ctx.actions.run(
+        inputs = config_files,
+        outputs = [output],
+        executable = config_merger,
+        arguments = [args],
+        mnemonic = "ClangTidyMergeConfigs",
+        progress_message = "Merging clang-tidy configs for %{output}",
+    )
@@ -20,11 +20,15 @@ ClangTidyConfigInfo = provider(
     fields = {
         "additional_flags": "List of additional compiler flags to be added.",
         "autodetermine_builtin_include_directories": "Automatically determine the builtin include directories from the underlying toolchain.",
+        "changed_files": "Label to bazel `string_list_flag` containing the paths of the changed files. If not empty, actions are only created for changed sources and for sources of targets whose own or direct dependencies' headers have changed. Analyzes all sources if None or empty.",
+        "changed_lines": "Unified diff or JSON file mapping files to lists of `[first, last]` line ranges. Only findings on changed lines are reported, translation units without any changed line in themselves or a header are skipped. Analyzes all lines if None.",
+        "batch_jobs": "Maximum number of concurrent clang-tidy processes of an action of the `batch_clang_tidy` feature. Bazel schedules the action with as many CPUs.",
         "clang_tidy_binary": "Label to a clang-tidy binary. If not provided, the aspect will attempt to auto-detect the clang-tidy binary from the toolchain.",
         "clang_tidy_enable_features": "List of additional bazel features to be enabled when invoking clang-tidy.",
         "clang_tidy_files": "Label to a clang-tidy files. If not provided, the aspect will attempt to auto-detect the clang-tidy files from the toolchain.",
         "clang_tidy_forced_includes": "Provider that maps supported bazel ACTION_NAMES to lists of files which shall be forcibly included into every artifact checked by clang-tidy. cf. https://clang.llvm.org/docs/ClangCommandLineReference.html#cmdoption-clang-include-file.",
         "clang_tidy_priority_includes": "Provider that maps supported bazel ACTION_NAMES to lists of files whose directories shall be added as first ones to the set of include directories where clang-tidy (i.e. clang) starts to look for include files.",
+        "config_merger": "FilesToRunProvider of the tool merging clang-tidy config files, used by the `merged_config_clang_tidy` feature.",
         "default_feature": "The default feature, mnust be one from the feature_mappings.",
         "dependency_attributes": "List of dependency attributes to traverse when in recursive mode. If not provided, all attributes of a rule will get traversed.",
         "deps": "List of build targets that have to succeed to be built for the target platform prior to clang-tidy performing its checks.",
@@ -36,9 +40,14 @@ ClangTidyConfigInfo = provider(
         "feature_mapping_c": "Optional value, similar to feature_mapping but only applied to c targets. If specified, it overwrites the mapping defined with feature_mapping.",
         "feature_mapping_cpp": "Optional value, similar to feature_mapping but only applied to c++ targets. If specified, it overwrites the mapping defined with feature_mapping.",
         "header_filter": "Label to bazel `string_flag` containing a regex pattern used to restrict clang-tidy findings from header files to specific ones only. Overrides 'HeaderFilterRegex' option from clang-tidy config file, if any.",
+        "memory_limit_mb": "Address space limit of clang-tidy per translation unit in MiB, the analysis is aborted beyond it. Unlimited if 0.",
+        "merged_configs": "Dictionary mapping the key of a single config file and module type to its merged config file, shared by all targets when the `merged_config_clang_tidy` feature is active.",
+        "result_cache_dir": "Absolute path of a local result cache keyed on the preprocessed translation unit. Disabled if empty.",
+        "result_cache_max_size_mb": "Size of the result cache in MiB beyond which the least recently used entries are evicted.",
         "suppress_patterns": "List of regex patterns used to suppress clang-tidy findings.",
         "system_headers": "Display the errors from system headers.",
         "target_types": "List of rule types clang-tidy should consider, i.e. `cc_library`. If not provided, it will run on all targets which implement the CCInfo Provider.",
+        "timeout_seconds": "Wall clock limit of clang-tidy per translation unit in seconds, the analysis is aborted beyond it. Unlimited if 0.",
         "unsupported_flags": "List of unsupported compiler flags to be excluded.",
     },
 )
@@ -69,5 +78,5 @@ ClangTidyIncludeDirectoryInfo = provider(
 
 ClangTidyAspectOutputInfo = provider(
     doc = "The aspect output provider.",
-    fields = ["outputs", "srcs", "hdrs"],
+    fields = ["outputs", "srcs", "hdrs", "reported_headers"],
 )
@@ -27,36 +27,26 @@ load(
 
 def _tidy_suite_rule_action(ctx, transitive_outputs, outputs):
     """Collects all intermediate results and aggregates"""
-    commands = []
 
     # Only aggregate all transitive rule outputs if the actual rule requests an output file
     if outputs:
-        summary = outputs[0]
-        commands.append("touch " + summary.path)
-        commands.append("echo 'Aggregated clang-tidy output' >" + summary.path)
+        summary, structured_summary = outputs
 
-        all_files = ",".join([file_name.basename for file_name in transitive_outputs])
-        commands.append("echo 'Aggregating " +
-                        str(len(transitive_outputs)) +
-                        " result file(s): '" +
-                        all_files +
-                        " >>" + summary.path)
-
-        commands.append("echo '' >>" + summary.path)
-        for transitive_output in transitive_outputs:
-            commands.append("cat " + transitive_output.path + " >>" + summary.path)
-
-        if not transitive_outputs:
-            commands.append("echo 'No outputs have been generated for any target' >>" + summary.path)
+        # The inputs are passed via a params file, there may be thousands of them
+        args = ctx.actions.args()
+        args.use_param_file("@%s", use_always = True)
+        args.set_param_file_format("multiline")
+        args.add_all(["--output", summary])
+        args.add_all(["--structured_output", structured_summary])
+        args.add_all(transitive_outputs)
 
         # This runs after all aspects have been finished for all targets
         # Build a summary for the invoked rule
-        ctx.actions.run_shell(
-            command = "; ".join(commands),
-            tools = [],
+        ctx.actions.run(
+            executable = ctx.executable._summary_tool,
             inputs = transitive_outputs,
             outputs = outputs,
-            arguments = [],
+            arguments = [args],
             mnemonic = "ClangTidySuite",
         )
 
@@ -66,7 +56,7 @@ def tidy_suite_rule_impl(ctx):
     Args:
         ctx: Context
     Returns:
-        DefaultInfo containing the output files
+        DefaultInfo containing the output files and OutputGroupInfo containing the structured summary
     """
     outputs = []
 
@@ -76,14 +66,20 @@ def tidy_suite_rule_impl(ctx):
         fail("You are not allowed to instantiate a tidy_suite rule")
 
     # Create a summary for the entire rule, if active
+    structured_outputs = []
     if ctx.attr.summary:
         summary = ctx.actions.declare_file(ctx.attr.name + ".clang_tidy.summary.out")
         outputs.append(summary)
+        structured_outputs.append(ctx.actions.declare_file(ctx.attr.name + ".clang_tidy.summary.json"))
 
-    transitive_outputs = depset(transitive = [target[OutputGroupInfo].clang_tidy_output for target in ctx.attr.deps]).to_list()
-    _tidy_suite_rule_action(ctx, transitive_outputs, outputs)
+    transitive_outputs = depset(transitive = [target[OutputGroupInfo].clang_tidy_output for target in ctx.attr.deps])
+    _tidy_suite_rule_action(ctx, transitive_outputs, outputs + structured_outputs)
 
-    return [DefaultInfo(files = depset(outputs + transitive_outputs))]
+    # The structured summary is produced along with the text summary, but only provided on request
+    return [
+        DefaultInfo(files = depset(outputs, transitive = [transitive_outputs])),
+        OutputGroupInfo(clang_tidy_structured_summary = depset(structured_outputs)),
+    ]
 
 # The rule definition, main entry point
 tidy_suite_rule = rule(
@@ -94,6 +90,11 @@ tidy_suite_rule = rule(
             aspects = [tidy_suite_aspect],
         ),
         "summary": attr.bool(default = True),
+        "_summary_tool": attr.label(
+            default = Label("@score_bazel_tools_cc//quality/private/clang_tidy/tools:clang_tidy_summary"),
+            executable = True,
+            cfg = "exec",
+        ),
     },
     implementation = tidy_suite_rule_impl,
 )
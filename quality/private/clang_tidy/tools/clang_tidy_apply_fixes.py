@@ -0,0 +1,202 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Applies the replacements of the exported fixes files to the workspace.
+
+Translation units which share a header export the same replacements for it. These are deduplicated per
+file, such that each edit is applied exactly once. Files with overlapping edits, i.e. conflicting fixes,
+are left untouched and reported. The fixes files are loaded and the edited files written by worker pools.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from quality.private.clang_tidy.tools import clang_tidy_fixes, common
+
+FIXES_SUFFIX = ".fixes.yaml"
+
+Replacement = namedtuple("Replacement", "offset length text")
+
+ApplyResult = namedtuple("ApplyResult", "file_path replacements conflicts")
+
+
+def find_fixes_files(paths):
+    """Expands the given files and directories into fixes files."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in files:
+                    if file.endswith(FIXES_SUFFIX):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+
+def load_replacements(fixes_file):
+    """Returns the replacements of a fixes file as tuples of the file path and the replacement."""
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    # Fixes files without findings only contain a note, e.g. `No fix(es) required or possible`, hence no diagnostics
+    replacements = []
+    try:
+        for diagnostic in clang_tidy_fixes.iter_diagnostics(fixes_file, {}):
+            for replacement in diagnostic.get("DiagnosticMessage", {}).get("Replacements") or []:
+                replacements.append(
+                    (
+                        replacement["FilePath"],
+                        Replacement(replacement["Offset"], replacement["Length"], replacement["ReplacementText"]),
+                    )
+                )
+    except (OSError, yaml.YAMLError) as error:
+        logging.warning(f"Skipping the fixes file {fixes_file}: {error}")
+        return []
+    return replacements
+
+
+def collect(fixes_files, workspace, jobs):
+    """Returns the deduplicated replacements per file within the workspace, along with the number of duplicates."""
+    replacements_per_file = defaultdict(set)
+    loaded = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for replacements in executor.map(load_replacements, fixes_files, chunksize=16):
+            for file_path, replacement in replacements:
+                real_path = os.path.realpath(file_path)
+                if not real_path.startswith(workspace + os.sep):
+                    logging.debug(f"Skipping the replacement of {file_path}, it is not located in the workspace")
+                    continue
+                loaded += 1
+                replacements_per_file[real_path].add(replacement)
+
+    unique = sum(len(replacements) for replacements in replacements_per_file.values())
+    return dict(replacements_per_file), loaded - unique
+
+
+def get_conflicts(replacements):
+    """Returns the pairs of sorted replacements which overlap, including different insertions at one offset."""
+    conflicts = []
+    for previous, current in zip(replacements, replacements[1:]):
+        if previous.offset + previous.length > current.offset:
+            conflicts.append((previous, current))
+        elif previous.offset == current.offset and previous.length == current.length == 0:
+            conflicts.append((previous, current))
+    return conflicts
+
+
+def apply_replacements(file_path, replacements, dry_run=False):
+    """Applies the replacements of a file at once, unless any of them conflict."""
+    sorted_replacements = sorted(replacements)
+    conflicts = get_conflicts(sorted_replacements)
+    if conflicts or dry_run:
+        return ApplyResult(file_path, len(sorted_replacements), conflicts)
+
+    with open(file_path, mode="rb") as source:
+        content = source.read()
+
+    # Offsets refer to the original content, hence the replacements are applied from the end
+    for replacement in reversed(sorted_replacements):
+        content = (
+            content[: replacement.offset]
+            + replacement.text.encode("utf-8")
+            + content[replacement.offset + replacement.length :]
+        )
+
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temporary_path, mode="wb") as target:
+        target.write(content)
+    os.replace(temporary_path, file_path)
+    return ApplyResult(file_path, len(sorted_replacements), conflicts)
+
+
+def apply_all(replacements_per_file, jobs, dry_run=False):
+    """Applies the replacements of all files in a worker pool."""
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(apply_replacements, file_path, replacements, dry_run)
+            for file_path, replacements in sorted(replacements_per_file.items())
+        ]
+        return [future.result() for future in futures]
+
+
+def format_summary(fixes_files, results, duplicates, dry_run):
+    """Formats the summary of the applied fixes."""
+    applied = [result for result in results if not result.conflicts]
+    conflicting = [result for result in results if result.conflicts]
+    verb = "Would apply" if dry_run else "Applied"
+    lines = [
+        f"{verb} {sum(result.replacements for result in applied)} replacement(s) to {len(applied)} file(s) "
+        f"from {fixes_files} fixes file(s), {duplicates} duplicate replacement(s) were dropped."
+    ]
+    if conflicting:
+        lines.append(f"Skipped {len(conflicting)} file(s) with overlapping replacements:")
+        for result in conflicting:
+            offsets = ", ".join(str(current.offset) for _, current in result.conflicts)
+            lines.append(f"  {result.file_path}: {len(result.conflicts)} conflict(s) at offset(s) {offsets}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv=None):
+    """Parses arguments."""
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help=f"Fixes files or directories which are searched for `*{FIXES_SUFFIX}` files.",
+    )
+    parser.add_argument(
+        "--workspace",
+        type=str,
+        default=os.environ.get("BUILD_WORKSPACE_DIRECTORY", os.getcwd()),
+        help="Only files within this directory are edited, the workspace of `bazel run` by default.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of workers loading the fixes files and applying the replacements.",
+    )
+    parser.add_argument(
+        "--dry_run",
+        action="store_true",
+        help="Only reports the replacements and conflicts without editing any file.",
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=common.DEFAULT_LOG_LEVEL,
+        format=common.LOG_FORMAT,
+    )
+
+    fixes_files = sorted(set(find_fixes_files(args.paths)))
+    if not fixes_files:
+        logging.error(f"No fixes files found in {args.paths}.")
+        return 1
+
+    replacements_per_file, duplicates = collect(fixes_files, os.path.realpath(args.workspace), args.jobs)
+    results = apply_all(replacements_per_file, args.jobs, args.dry_run)
+
+    sys.stdout.write(format_summary(len(fixes_files), results, duplicates, args.dry_run))
+    return 1 if any(result.conflicts for result in results) else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
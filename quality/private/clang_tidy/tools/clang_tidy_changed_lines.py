@@ -0,0 +1,171 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Restricts clang-tidy to the lines changed by a pull request.
+
+The changed lines are read from a manifest, either a unified diff or a JSON object mapping files to lists of
+inclusive `[first, last]` line ranges. They are handed to clang-tidy via `--line-filter` and are used to
+filter the findings again in the runner, e.g. when the result is replayed from the result cache.
+"""
+
+import bisect
+import functools
+import json
+import os
+import re
+
+# The new file and the added line range of a unified diff, e.g. `+++ b/foo.cpp` and `@@ -1,2 +1,3 @@`
+NEW_FILE_REGEX = re.compile(r"^\+\+\+ (?:b/)?(?P<path>[^\t\n]+)")
+HUNK_REGEX = re.compile(r"^@@ -\d+(?:,\d+)? \+(?P<start>\d+)(?:,(?P<count>\d+))? @@")
+
+# A changed file with any other extension may be included by every translation unit
+SOURCE_EXTENSIONS = (".c", ".cc", ".cpp", ".cxx", ".c++", ".C")
+
+
+def merge_ranges(ranges):
+    """Returns the sorted ranges with overlapping and adjacent ones merged."""
+    merged_ranges = []
+    for first, last in sorted(ranges):
+        if merged_ranges and first <= merged_ranges[-1][1] + 1:
+            merged_ranges[-1][1] = max(merged_ranges[-1][1], last)
+        else:
+            merged_ranges.append([first, last])
+    return merged_ranges
+
+
+def parse_unified_diff(content):
+    """Returns the added lines per file of a unified diff, deleted files are skipped."""
+    changed_lines = {}
+    ranges = None
+    line_number = 0
+    remaining = 0
+    for line in content.splitlines():
+        if remaining == 0:
+            new_file = NEW_FILE_REGEX.match(line)
+            if new_file:
+                path = new_file.group("path").strip()
+                ranges = None if path == "/dev/null" else changed_lines.setdefault(os.path.normpath(path), [])
+                continue
+            hunk = HUNK_REGEX.match(line)
+            if hunk:
+                line_number = int(hunk.group("start"))
+                remaining = int(hunk.group("count") or 1)
+            continue
+
+        if line.startswith("+"):
+            if ranges is not None:
+                ranges.append([line_number, line_number])
+            line_number += 1
+            remaining -= 1
+        elif line.startswith(" ") or not line:
+            line_number += 1
+            remaining -= 1
+        # Removed lines and `\ No newline at end of file` do not exist in the new file
+
+    return {path: merge_ranges(ranges) for path, ranges in changed_lines.items() if ranges}
+
+
+def parse_json(content):
+    """Returns the changed lines per file of a JSON manifest."""
+    return {
+        os.path.normpath(path): merge_ranges([first, last] for first, last in ranges)
+        for path, ranges in json.loads(content).items()
+        if ranges
+    }
+
+
+class ChangedLines:
+    """The changed line ranges per file, keyed on paths relative to the workspace."""
+
+    def __init__(self, ranges):
+        self.ranges = ranges
+        self.changed_headers = sorted(path for path in ranges if not path.endswith(SOURCE_EXTENSIONS))
+
+    def is_affected(self, src_file):
+        """
+        Returns true if the translation unit may see a changed line. As the included headers are not known up
+        front, every changed header is assumed to be included.
+        """
+        return os.path.normpath(src_file) in self.ranges or bool(self.changed_headers)
+
+    def contains(self, file_path, line):
+        """Returns true if the line of the file has been changed."""
+        ranges = self.ranges.get(os.path.normpath(file_path))
+        if not ranges:
+            return False
+        index = bisect.bisect_right(ranges, [line, float("inf")]) - 1
+        return index >= 0 and ranges[index][0] <= line <= ranges[index][1]
+
+    def get_line_filter(self, src_file):
+        """Returns the `--line-filter` of clang-tidy for a translation unit, covering itself and all headers."""
+        paths = self.changed_headers
+        src_path = os.path.normpath(src_file)
+        if src_path in self.ranges:
+            paths = [src_path] + paths
+        return json.dumps([{"name": path, "lines": self.ranges[path]} for path in paths], separators=(",", ":"))
+
+
+def get_file_key(path):
+    """
+    Returns the path along with its modification time and size. Caches are keyed on it, as the persistent worker
+    sees the same paths with a different content in the next build.
+    """
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+@functools.lru_cache(maxsize=16)
+def load_file(manifest_key):
+    """Loads the changed lines of a manifest once per manifest key, shared by all translation units."""
+    manifest, _, _ = manifest_key
+    with open(manifest, encoding="utf-8") as manifest_file:
+        content = manifest_file.read()
+    if manifest.endswith(".json"):
+        return ChangedLines(parse_json(content))
+    return ChangedLines(parse_unified_diff(content))
+
+
+def load(manifest):
+    """Loads the changed lines of a manifest, it is only parsed again once it has been changed."""
+    return load_file(get_file_key(manifest))
+
+
+@functools.lru_cache(maxsize=256)
+def read_line_offsets(file_key):
+    """Returns the byte offsets at which the lines of a file start, once per file key."""
+    file_path, _, _ = file_key
+    with open(file_path, mode="rb") as file:
+        content = file.read()
+    return [0] + [match.end() for match in re.finditer(rb"\n", content)]
+
+
+def get_line_offsets(file_path):
+    """Returns the byte offsets at which the lines of a file start."""
+    return read_line_offsets(get_file_key(file_path))
+
+
+def get_location(file_path, offset):
+    """Returns the one based line and column of a byte offset within a file, None if the file cannot be read."""
+    try:
+        line_offsets = get_line_offsets(file_path)
+    except OSError:
+        return None
+    line = bisect.bisect_right(line_offsets, offset)
+    return line, offset - line_offsets[line - 1] + 1
+
+
+def get_line(file_path, offset):
+    """Returns the one based line number of a byte offset within a file, None if the file cannot be read."""
+    location = get_location(file_path, offset)
+    return location[0] if location else None
@@ -0,0 +1,254 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Collects the per check execution profile of clang-tidy runs and aggregates them across targets.
+
+The runner stores the profile of each translation unit, as written by `--store-check-profile`, under a
+declared path. This tool merges any number of those profiles into a per check and a per target timing
+table, sorted by wall time.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+from collections import defaultdict, namedtuple
+
+from quality.private.clang_tidy.tools import common
+
+CHECK_PROFILE_SUFFIX = ".check_profile.json"
+
+# Timings are stored as `time.clang-tidy.<check>.<wall|user|sys>`, check names may contain dots
+TIMING_PREFIX = "time.clang-tidy."
+
+# Share of the total wall time used to sort out the most expensive checks
+DEFAULT_WALL_TIME_SHARE = 0.8
+
+CheckTiming = namedtuple("CheckTiming", "wall user sys")
+
+
+def get_flags(profile_dir):
+    """Returns the clang-tidy flags storing the check profile in the given directory."""
+    return ["--enable-check-profile", f"--store-check-profile={profile_dir}"]
+
+
+def collect(profile_dir, check_profile, src_file):
+    """
+    Moves the profile clang-tidy stored in the profile directory to the declared check profile. An empty
+    profile is written if there is none, e.g. when the result has been replayed from the result cache.
+    """
+    content = {"file": src_file, "profile": {}}
+    try:
+        for entry in sorted(os.scandir(profile_dir), key=lambda entry: entry.name):
+            if entry.name.endswith(".json"):
+                with open(entry.path, encoding="utf-8") as profile_file:
+                    content["profile"] = json.load(profile_file).get("profile", {})
+                break
+    except (OSError, ValueError) as error:
+        logging.debug(f"Reading the check profile of {src_file} failed: {error}")
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    with open(check_profile, mode="w", encoding="utf-8") as check_profile_file:
+        json.dump(content, check_profile_file, indent=4)
+
+
+def parse_profile(profile):
+    """Returns the timings of each check of a clang-tidy profile."""
+    timings = defaultdict(lambda: {"wall": 0.0, "user": 0.0, "sys": 0.0})
+    for key, value in profile.items():
+        if not key.startswith(TIMING_PREFIX):
+            continue
+        check, _, kind = key[len(TIMING_PREFIX) :].rpartition(".")
+        if check and kind in ("wall", "user", "sys"):
+            timings[check][kind] += value
+    return {check: CheckTiming(**timing) for check, timing in timings.items()}
+
+
+def get_target_label(check_profile):
+    """Derives the label of the analyzed target from the output path of its check profile."""
+    parts = os.path.normpath(check_profile).split(os.sep)
+    if "_tidy" not in parts:
+        return "<unknown>"
+    tidy_index = len(parts) - 1 - parts[::-1].index("_tidy")
+    package_parts = parts[:tidy_index]
+
+    # Strips the output tree prefix, i.e. `bazel-out/<configuration>/bin` or `bazel-bin`
+    for index, part in enumerate(package_parts):
+        if part == "bin" or part == "bazel-bin":
+            package_parts = package_parts[index + 1 :]
+            break
+
+    repository = ""
+    if len(package_parts) >= 2 and package_parts[0] == "external":
+        repository = f"@{package_parts[1]}"
+        package_parts = package_parts[2:]
+
+    target_name = parts[tidy_index + 1] if tidy_index + 1 < len(parts) - 1 else "<unknown>"
+    return f"{repository}//{'/'.join(package_parts)}:{target_name}"
+
+
+def find_check_profiles(paths):
+    """Expands the given files and directories into check profiles."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in files:
+                    if file.endswith(CHECK_PROFILE_SUFFIX):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+
+def add_timing(timings, check_timing):
+    """Returns the sum of two timings."""
+    return CheckTiming(*(total + value for total, value in zip(timings, check_timing)))
+
+
+def aggregate(check_profiles):
+    """Returns the accumulated timings per check, the wall time per target and the number of profiles."""
+    check_timings = defaultdict(lambda: CheckTiming(0.0, 0.0, 0.0))
+    target_timings = defaultdict(lambda: defaultdict(float))
+    count = 0
+
+    for check_profile in check_profiles:
+        try:
+            with open(check_profile, encoding="utf-8") as check_profile_file:
+                profile = json.load(check_profile_file).get("profile", {})
+        except (OSError, ValueError) as error:
+            logging.warning(f"Skipping the check profile {check_profile}: {error}")
+            continue
+
+        count += 1
+        target_label = get_target_label(check_profile)
+        for check, check_timing in parse_profile(profile).items():
+            check_timings[check] = add_timing(check_timings[check], check_timing)
+            target_timings[target_label][check] += check_timing.wall
+
+    return dict(check_timings), {target: dict(timings) for target, timings in target_timings.items()}, count
+
+
+def get_expensive_checks(check_timings, wall_time_share):
+    """Returns the most expensive checks which together account for the given share of the total wall time."""
+    total_wall_time = sum(check_timing.wall for check_timing in check_timings.values())
+    expensive_checks = []
+    accumulated_wall_time = 0.0
+    for check, check_timing in sorted(check_timings.items(), key=lambda item: item[1].wall, reverse=True):
+        if total_wall_time == 0 or accumulated_wall_time >= wall_time_share * total_wall_time:
+            break
+        expensive_checks.append(check)
+        accumulated_wall_time += check_timing.wall
+    return expensive_checks
+
+
+def format_check_table(check_timings, top):
+    """Formats the timings per check, sorted by wall time."""
+    total_wall_time = sum(check_timing.wall for check_timing in check_timings.values()) or 1.0
+    lines = [f"{'Wall [s]':>10} {'User [s]':>10} {'Sys [s]':>10} {'Share':>7} {'Cumul.':>7}  Check"]
+    accumulated_wall_time = 0.0
+    ranked_checks = sorted(check_timings.items(), key=lambda item: item[1].wall, reverse=True)
+    for check, check_timing in ranked_checks[:top]:
+        accumulated_wall_time += check_timing.wall
+        lines.append(
+            f"{check_timing.wall:10.3f} {check_timing.user:10.3f} {check_timing.sys:10.3f} "
+            f"{check_timing.wall / total_wall_time:7.1%} {accumulated_wall_time / total_wall_time:7.1%}  {check}"
+        )
+    return "\n".join(lines)
+
+
+def format_target_table(target_timings, top):
+    """Formats the wall time per target along with its most expensive check, sorted by wall time."""
+    lines = [f"{'Wall [s]':>10}  {'Target':<60} Most expensive check"]
+    ranked_targets = sorted(target_timings.items(), key=lambda item: sum(item[1].values()), reverse=True)
+    for target, timings in ranked_targets[:top]:
+        most_expensive_check = max(timings, key=timings.get) if timings else "-"
+        lines.append(f"{sum(timings.values()):10.3f}  {target:<60} {most_expensive_check}")
+    return "\n".join(lines)
+
+
+def format_report(check_timings, target_timings, count, top, wall_time_share):
+    """Formats the complete report of the aggregated check profiles."""
+    expensive_checks = get_expensive_checks(check_timings, wall_time_share)
+    return "\n".join(
+        [
+            f"Aggregated {count} check profile(s) of {len(target_timings)} target(s).",
+            f"{len(expensive_checks)} of {len(check_timings)} check(s) account for {wall_time_share:.0%} "
+            f"of the wall time: {', '.join(expensive_checks) or '-'}",
+            "",
+            "Timings per check:",
+            format_check_table(check_timings, top),
+            "",
+            "Timings per target:",
+            format_target_table(target_timings, top),
+            "",
+        ]
+    )
+
+
+def parse_args(argv=None):
+    """Parses arguments."""
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help=f"Check profiles or directories which are searched for `*{CHECK_PROFILE_SUFFIX}` files.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=50,
+        help="Maximum number of rows per table.",
+    )
+    parser.add_argument(
+        "--wall_time_share",
+        type=float,
+        default=DEFAULT_WALL_TIME_SHARE,
+        help="Share of the total wall time for which the most expensive checks are listed.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Path of the report, printed to stdout if not given.",
+        required=False,
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=common.DEFAULT_LOG_LEVEL,
+        format=common.LOG_FORMAT,
+    )
+
+    check_timings, target_timings, count = aggregate(find_check_profiles(args.paths))
+    if not count:
+        logging.error(f"No check profiles found in {args.paths}.")
+        return 1
+
+    report = format_report(check_timings, target_timings, count, args.top, args.wall_time_share)
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as output_file:
+            output_file.write(report)
+    else:
+        sys.stdout.write(report)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+A set of clang-tidy check globs, e.g. the activated or deactivated checks of a config.
+
+The checks are stored as a prefix trie of their names. A check ending with `*` is a wildcard which covers
+every other check starting with the text before the `*`. Whether a check is covered, the reduction to the
+checks which are not covered and the sorted iteration are determined by a single walk of the trie.
+"""
+
+import typing as t
+
+WILDCARD = "*"
+
+
+class CheckNode:  # pylint: disable=too-few-public-methods
+    """A node of the trie, i.e. a prefix of the names of one or more checks."""
+
+    __slots__ = ("children", "is_check", "is_wildcard")
+
+    def __init__(self) -> None:
+        self.children: t.Dict[str, "CheckNode"] = {}
+        # The prefix is a check itself
+        self.is_check = False
+        # The prefix followed by a `*` is a check, i.e. a wildcard covering all checks starting with the prefix
+        self.is_wildcard = False
+
+
+class CheckTrie:
+    """A set of check globs, iterated in sorted order."""
+
+    def __init__(self, checks: t.Iterable[str] = ()) -> None:
+        self.root = CheckNode()
+        self.size = 0
+        self.update(checks)
+
+    def add(self, check: str) -> None:
+        """Adds a check, marking its prefix as wildcard if it ends with a `*`."""
+        parent = None
+        node = self.root
+        for character in check:
+            parent = node
+            child = node.children.get(character)
+            if child is None:
+                child = node.children[character] = CheckNode()
+            node = child
+        if not node.is_check:
+            node.is_check = True
+            self.size += 1
+        if parent is not None and check.endswith(WILDCARD):
+            parent.is_wildcard = True
+
+    def update(self, checks: t.Iterable[str]) -> None:
+        """Adds all checks."""
+        for check in checks:
+            self.add(check)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, check: str) -> bool:
+        node = self.root
+        for character in check:
+            node = node.children.get(character)
+            if node is None:
+                return False
+        return node.is_check
+
+    def __iter__(self) -> t.Iterator[str]:
+        for check, _ in self.walk():
+            yield check
+
+    def is_covered(self, check: str) -> bool:
+        """Returns true if a wildcard of the set other than the check itself covers the check."""
+        node = self.root
+        for depth in range(len(check) + 1):
+            is_own_wildcard = depth == len(check) - 1 and check.endswith(WILDCARD)
+            if node.is_wildcard and not is_own_wildcard:
+                return True
+            if depth == len(check):
+                break
+            node = node.children.get(check[depth])
+            if node is None:
+                return False
+        return False
+
+    def walk(self) -> t.Iterator[t.Tuple[str, bool]]:
+        """Yields all checks in sorted order, along with whether another wildcard of the set covers them."""
+        # The number of wildcards along the path of a prefix, including the prefix itself
+        stack = [("", self.root, int(self.root.is_wildcard))]
+        while stack:
+            prefix, node, wildcards = stack.pop()
+            if node.is_check:
+                # The wildcard of a check ending with `*` is marked on its parent, but does not cover itself
+                own_wildcards = 1 if prefix.endswith(WILDCARD) else 0
+                yield prefix, wildcards - own_wildcards > 0
+            for character in sorted(node.children, reverse=True):
+                child = node.children[character]
+                stack.append((prefix + character, child, wildcards + int(child.is_wildcard)))
+
+    def covered(self) -> t.List[str]:
+        """Returns the sorted checks which are covered by another wildcard of the set."""
+        return [check for check, is_covered in self.walk() if is_covered]
+
+    def reduced(self) -> "CheckTrie":
+        """Returns the set without the checks which are covered by another wildcard of the set."""
+        return CheckTrie(check for check, is_covered in self.walk() if not is_covered)
@@ -0,0 +1,133 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Merges the compile commands of all clang-tidy actions into a single workspace compilation database.
+
+Each clang-tidy action writes a one entry `compile_commands.json` per translation unit, whose directory is
+the (sandboxed) working directory of the action. The merged database is deduplicated per source file and
+all its paths are relative to the execution root, which becomes the directory of every entry.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+from quality.private.clang_tidy.tools import clang_tidy_result_cache, common
+
+COMPILE_COMMANDS_FILE_NAME = "compile_commands.json"
+
+# Separates the execution root from the output tree in the resolved path of `bazel-bin`
+OUTPUT_TREE_MARKER = f"{os.sep}bazel-out{os.sep}"
+
+
+def find_compile_commands(paths):
+    """Expands the given files and directories into the compile commands of the clang-tidy actions."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                if COMPILE_COMMANDS_FILE_NAME in files and f"{os.sep}_tidy{os.sep}" in f"{root}{os.sep}":
+                    yield os.path.join(root, COMPILE_COMMANDS_FILE_NAME)
+        else:
+            yield path
+
+
+def get_execution_root(compile_commands_file):
+    """Derives the execution root from the location of a compile commands file in the output tree, if possible."""
+    real_path = os.path.realpath(compile_commands_file)
+    execution_root, marker, _ = real_path.partition(OUTPUT_TREE_MARKER)
+    return execution_root if marker else None
+
+
+def make_relative(entry):
+    """Strips the working directory of the action from all paths of an entry."""
+    directory = entry["directory"]
+    return {
+        "file": clang_tidy_result_cache.normalize(entry["file"], directory),
+        "arguments": [clang_tidy_result_cache.normalize(argument, directory) for argument in entry["arguments"]],
+    }
+
+
+def merge(compile_commands_files, execution_root):
+    """Returns the merged database, the first entry of each source file wins."""
+    entries = {}
+    for compile_commands_file in compile_commands_files:
+        try:
+            with open(compile_commands_file, encoding="utf-8") as compile_commands:
+                content = json.load(compile_commands)
+        except (OSError, ValueError) as error:
+            logging.warning(f"Skipping the compile commands {compile_commands_file}: {error}")
+            continue
+
+        for entry in content:
+            relative_entry = make_relative(entry)
+            entries.setdefault(relative_entry["file"], relative_entry)
+
+    return [{"directory": execution_root, **entries[file]} for file in sorted(entries)]
+
+
+def parse_args(argv=None):
+    """Parses arguments."""
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help=f"Compile commands or directories which are searched for `_tidy/**/{COMPILE_COMMANDS_FILE_NAME}`.",
+    )
+    parser.add_argument(
+        "--execution_root",
+        type=str,
+        help="Directory of all entries, derived from the location of the compile commands if not given.",
+        required=False,
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Path of the merged database, printed to stdout if not given.",
+        required=False,
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=common.DEFAULT_LOG_LEVEL,
+        format=common.LOG_FORMAT,
+    )
+
+    compile_commands_files = list(find_compile_commands(args.paths))
+    if not compile_commands_files:
+        logging.error(f"No compile commands found in {args.paths}.")
+        return 1
+
+    execution_root = args.execution_root or get_execution_root(compile_commands_files[0])
+    if not execution_root:
+        logging.error("The execution root cannot be derived, please provide --execution_root.")
+        return 1
+
+    database = json.dumps(merge(compile_commands_files, execution_root), indent=4)
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as output_file:
+            output_file.write(database)
+    else:
+        sys.stdout.write(database)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
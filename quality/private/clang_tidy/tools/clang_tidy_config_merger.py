@@ -0,0 +1,79 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Merges a set of clang-tidy config files into a single config file, once per module type.
+"""
+
+import argparse
+import logging
+import sys
+
+from quality.private.clang_tidy.tools import clang_tidy_configs, clang_tidy_runner, common
+
+
+def merge_config_files(config_files, module_type):
+    """Reads the config files, adds the module type and merges them into one config."""
+    custom_option_dict = clang_tidy_runner.get_custom_option_dict(module_type)
+    configs = [clang_tidy_runner.read_configuration(config_file, custom_option_dict) for config_file in config_files]
+    return clang_tidy_configs.merge_configs(configs)
+
+
+def parse_args(argv=None):
+    """Parses arguments."""
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser.add_argument(
+        "--config_file",
+        type=str,
+        help="Path to a clang-tidy config file, may be given multiple times.",
+        required=True,
+        action="append",
+        dest="config_files",
+    )
+    parser.add_argument(
+        "--module_type",
+        type=str,
+        help="The module type which is added as `ModuleType` check option.",
+        choices=["executable", "dynamic_library", "static_library"],
+        required=False,
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Path of the merged clang-tidy config file.",
+        required=True,
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=common.DEFAULT_LOG_LEVEL,
+        format=common.LOG_FORMAT,
+    )
+
+    try:
+        merged_config = merge_config_files(args.config_files, args.module_type)
+    except common.ConfigException:
+        logging.error(f"Merging the clang-tidy configs {args.config_files} failed.")
+        return 1
+
+    clang_tidy_runner.write_configuration(merged_config, args.output)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
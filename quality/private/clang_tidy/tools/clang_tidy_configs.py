@@ -21,7 +21,7 @@ from collections import defaultdict
 
 import termcolor
 
-from quality.private.clang_tidy.tools import common
+from quality.private.clang_tidy.tools import clang_tidy_checks, common
 
 
 def assert_keys(merged_dict: dict, input_dict: dict) -> None:
@@ -96,30 +96,23 @@ def assert_options(merged_config: dict, options: dict) -> None:
     merged_config["CheckOptions"] = [{"key": k, "value": v} for k, v in merged_options.items()]
 
 
-def reduce_checks(checks: set) -> set:
+def reduce_checks(checks: t.Iterable[str]) -> clang_tidy_checks.CheckTrie:
     """Merges two equal checks, i.e. if one check is contained in the other one via wildcards."""
-    remove_checks = set()
-    for wildcard_check in checks:
-        if wildcard_check.endswith("*"):
-            for check in checks:
-                if check.startswith(wildcard_check[:-1]) and check != wildcard_check:
-                    remove_checks.add(check)
-    return checks - remove_checks
+    return clang_tidy_checks.CheckTrie(checks).reduced()
 
 
 def assert_checks(merged_config: dict, activated_checks: set, deactivated_checks: set) -> None:
     """Asserts checks are not activated and deactivated at the same time."""
-    activated_checks = reduce_checks(activated_checks)
+    reduced_activated_checks = reduce_checks(activated_checks)
 
-    assert_check_conflict(activated_checks, deactivated_checks)
-    assert_check_wildcard_conflict(activated_checks, deactivated_checks)
+    assert_check_conflict(set(reduced_activated_checks), deactivated_checks)
+    assert_check_wildcard_conflict(reduced_activated_checks, deactivated_checks)
 
-    deactivated_checks = reduce_checks(deactivated_checks)
+    reduced_deactivated_checks = reduce_checks(deactivated_checks)
 
-    activated_checks_list = sorted(list(activated_checks))
-    deactivated_checks_list = [f"-{check}" for check in sorted(list(deactivated_checks))]
-
-    merged_config["Checks"] = ",".join(deactivated_checks_list + activated_checks_list)
+    # The tries are iterated in sorted order
+    deactivated_checks_list = [f"-{check}" for check in reduced_deactivated_checks]
+    merged_config["Checks"] = ",".join(deactivated_checks_list + list(reduced_activated_checks))
 
 
 def assert_check_conflict(activated_checks: set, deactivated_checks: set) -> None:
@@ -136,7 +129,7 @@ def assert_check_conflict(activated_checks: set, deactivated_checks: set) -> Non
         raise common.ConfigException(message="CheckConflict")
 
 
-def assert_check_wildcard_conflict(activated_checks: set, deactivated_checks: set) -> None:
+def assert_check_wildcard_conflict(activated_checks: t.Iterable[str], deactivated_checks: set) -> None:
     """
     Special case when "-*" is been used (and the CheckOrderConflict has already checked
     that this comes before the activated checks). This is "ok" to be in conflict as the
@@ -147,15 +140,16 @@ def assert_check_wildcard_conflict(activated_checks: set, deactivated_checks: se
     if "*" in deactivated_checks_without_star:
         deactivated_checks_without_star.remove("*")
 
-    before = activated_checks | reduce_checks(deactivated_checks_without_star)
-    after = reduce_checks(before)
+    before = clang_tidy_checks.CheckTrie(activated_checks)
+    before.update(reduce_checks(deactivated_checks_without_star))
+    conflicting_checks = set(before.covered())
 
-    if len(before) - len(after) != 0:
+    if conflicting_checks:
         logging.error(
             termcolor.colored(
                 "Conflict: A check cannot be activated and deactivated at the same time."
                 " Note: A wildcard `*` has been resolved and leads to this conflict."
-                f"\nConflicting checks are: {before - after}",
+                f"\nConflicting checks are: {conflicting_checks}",
                 "red",
             )
         )
@@ -0,0 +1,71 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Machine readable findings of a translation unit, one JSON object per line.
+
+The records are built from the filtered diagnostics of the fixes file, hence they contain exactly the
+findings which are reported in the (colored) output. Each record holds the file relative to the working
+directory, the one based line and column, the check, the level and the message. An aborted analysis is
+recorded as a single error of the `clang-tidy-analysis-aborted` check, such that it does not look clean.
+"""
+
+import json
+
+from quality.private.clang_tidy.tools import clang_tidy_changed_lines
+
+FINDINGS_SUFFIX = ".findings.jsonl"
+ANALYSIS_ABORTED_CHECK = "clang-tidy-analysis-aborted"
+
+
+def to_record(diagnostic, file_path):
+    """Returns the record of a diagnostic, its file given relative to the working directory."""
+    message = diagnostic["DiagnosticMessage"]
+    location = None
+    if message["FilePath"]:
+        location = clang_tidy_changed_lines.get_location(message["FilePath"], message["FileOffset"])
+    line, column = location or (None, None)
+    return {
+        "file": file_path,
+        "line": line,
+        "column": column,
+        "check": diagnostic["DiagnosticName"],
+        "level": diagnostic["Level"].lower(),
+        "message": message["Message"],
+    }
+
+
+def to_aborted_record(file_path, reason):
+    """Returns the record of an aborted analysis, it only depends on the translation unit and the reason."""
+    return {
+        "file": file_path,
+        "line": None,
+        "column": None,
+        "check": ANALYSIS_ABORTED_CHECK,
+        "level": "error",
+        "message": reason,
+    }
+
+
+def write(findings_path, records):
+    """Writes the records as JSON lines, an empty file if there are none."""
+    with open(findings_path, mode="w", encoding="utf-8") as findings_file:
+        findings_file.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+
+
+def read(findings_path):
+    """Reads the records of a findings file line by line."""
+    with open(findings_path, encoding="utf-8") as findings_file:
+        for line in findings_file:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,248 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Reads and writes the fixes files exported by clang-tidy.
+
+The `Diagnostics` sequence is streamed in chunks of diagnostics, such that neither the whole document nor its
+complete node graph is held at once. Each chunk is parsed and emitted by the libyaml based safe loader and
+dumper, the pure python ones are used if libyaml is not available. If the layout of a file cannot be split,
+e.g. as a chunk fails to parse, the whole document is loaded at once.
+
+Quoted scalars are loaded as strings which remember their quotes and are dumped with the same quotes again,
+like the round-trip loader and dumper do. Hence a rewritten fixes file keeps the style written by clang-tidy.
+"""
+
+import functools
+import logging
+
+# Number of diagnostics which are loaded or dumped at once
+DIAGNOSTICS_PER_CHUNK = 256
+
+DIAGNOSTICS_KEY = "Diagnostics:"
+DOCUMENT_START = "---"
+DOCUMENT_END = "..."
+
+DUMP_OPTIONS = {"default_flow_style": False, "sort_keys": False, "allow_unicode": True, "width": 500}
+
+STR_TAG = "tag:yaml.org,2002:str"
+
+
+class SingleQuoted(str):
+    """A scalar which has been single quoted."""
+
+    __slots__ = ()
+    style = "'"
+
+
+class DoubleQuoted(str):
+    """A scalar which has been double quoted."""
+
+    __slots__ = ()
+    style = '"'
+
+
+QUOTED_SCALARS = {quoted.style: quoted for quoted in (SingleQuoted, DoubleQuoted)}
+
+
+def keep_quotes(previous, value):
+    """Returns the value with the quotes of the previous scalar, like the round-trip loader does on assignment."""
+    if isinstance(previous, (SingleQuoted, DoubleQuoted)):
+        return type(previous)(value)
+    return value
+
+
+def construct_str(loader, node):
+    """Constructs a string which remembers its quotes."""
+    value = loader.construct_scalar(node)
+    quoted = QUOTED_SCALARS.get(node.style)
+    return quoted(value) if quoted else value
+
+
+def represent_quoted(dumper, data):
+    """Represents a string with the quotes it has been loaded with."""
+    return dumper.represent_scalar(STR_TAG, str(data), style=data.style)
+
+
+@functools.lru_cache(maxsize=None)
+def get_loader():
+    """Returns the fastest available safe loader, which keeps the quotes of the scalars."""
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    loader = type("FixesLoader", (getattr(yaml, "CSafeLoader", yaml.SafeLoader),), {})
+    loader.add_constructor(STR_TAG, construct_str)
+    return loader
+
+
+@functools.lru_cache(maxsize=None)
+def get_dumper():
+    """Returns the fastest available safe dumper, which writes the kept quotes of the scalars."""
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    dumper = type("FixesDumper", (getattr(yaml, "CSafeDumper", yaml.SafeDumper),), {})
+    for quoted in QUOTED_SCALARS.values():
+        dumper.add_representer(quoted, represent_quoted)
+    return dumper
+
+
+def get_open_quote(line, quote=None):
+    """
+    Returns the quote of a quoted scalar which is still open at the end of the line, None if there is none. A
+    quoted scalar may span multiple lines, its continuation lines can start at any column.
+    """
+    previous = None
+    index = 0
+    while index < len(line):
+        character = line[index]
+        if quote == "'":
+            if line.startswith("''", index):
+                # An escaped single quote
+                index += 1
+            elif character == "'":
+                quote = None
+                previous = character
+        elif quote == '"':
+            if character == "\\":
+                index += 1
+            elif character == '"':
+                quote = None
+                previous = character
+        elif character in "'\"":
+            # Quotes only start a scalar at the start of a value, not within a plain scalar
+            if previous in (None, "[", "{", ",") or (previous in ":-?" and line[index - 1].isspace()):
+                quote = character
+            else:
+                previous = character
+        elif character == "#" and (index == 0 or line[index - 1].isspace()):
+            break
+        elif not character.isspace():
+            previous = character
+        index += 1
+    return quote
+
+
+def split_document(lines, header):
+    """
+    Yields the chunks of the `Diagnostics` sequence of a fixes file, all other lines of the top level mapping are
+    appended to the header. The sequence is only split if it is written in block style.
+    """
+    chunk = []
+    diagnostics_in_chunk = 0
+    item_indent = None
+    in_diagnostics = False
+    quote = None
+    for line in lines:
+        if quote:
+            # Continuation lines of a quoted scalar belong to the current diagnostic or the header
+            quote = get_open_quote(line, quote)
+            (chunk if in_diagnostics else header).append(line)
+            continue
+        quote = get_open_quote(line)
+
+        if in_diagnostics:
+            stripped = line.lstrip(" ")
+            indent = len(line) - len(stripped)
+            if stripped.startswith("- ") and item_indent in (None, indent):
+                item_indent = indent
+                if diagnostics_in_chunk == DIAGNOSTICS_PER_CHUNK:
+                    yield chunk
+                    chunk = []
+                    diagnostics_in_chunk = 0
+                diagnostics_in_chunk += 1
+                chunk.append(line)
+                continue
+            # Nested lines and empty lines within multi-line scalars belong to the current diagnostic
+            if indent > 0 or not stripped.strip():
+                chunk.append(line)
+                continue
+            in_diagnostics = False
+
+        if line.rstrip() in (DOCUMENT_START, DOCUMENT_END):
+            continue
+        if line.rstrip() == DIAGNOSTICS_KEY:
+            in_diagnostics = True
+        header.append(line)
+    if chunk:
+        yield chunk
+
+
+def get_mapping(content):
+    """Returns the content if it is a mapping, None otherwise."""
+    return content if isinstance(content, dict) else None
+
+
+def iter_diagnostics(fixes_path, header):
+    """
+    Yields the diagnostics of a fixes file, only a chunk of them is held at once. Once they are exhausted, the top
+    level mapping is stored into the header, its `Diagnostics` set to None. Neither yields nor stores anything if
+    the file does not contain a mapping, e.g. if no fixes are required. A file whose layout cannot be split is
+    loaded as a whole, the diagnostics which have not been yielded yet are yielded from it.
+    """
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    loader = get_loader()
+    header_lines = []
+    yielded = 0
+    with open(fixes_path, encoding="utf-8") as fixes_file:
+        try:
+            for chunk in split_document(fixes_file, header_lines):
+                for diagnostic in yaml.load("".join(chunk), Loader=loader) or []:
+                    yield diagnostic
+                    yielded += 1
+            content = yaml.load("".join(header_lines), Loader=loader)
+        except yaml.YAMLError as error:
+            logging.debug(f"Loading the fixes file {fixes_path} as a whole, it cannot be split: {error}")
+            fixes_file.seek(0)
+            content = yaml.load(fixes_file, Loader=loader)
+        else:
+            # The diagnostics of a sequence in flow style are not split, they are part of the header
+            yielded = 0
+
+    content = get_mapping(content)
+    if content is None:
+        return
+    if "Diagnostics" in content:
+        yield from (content["Diagnostics"] or [])[yielded:]
+        content["Diagnostics"] = None
+    header.update(content)
+
+
+def load(fixes_path):
+    """Loads a fixes file, returns None if it does not contain a mapping, e.g. if no fixes are required."""
+    header = {}
+    diagnostics = list(iter_diagnostics(fixes_path, header))
+    if not header:
+        return None
+    if "Diagnostics" in header:
+        header["Diagnostics"] = diagnostics
+    return header
+
+
+def dump(content, fixes_file):
+    """Writes the content of a fixes file into the given stream, the diagnostics are emitted chunk by chunk."""
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    dumper = get_dumper()
+    header = {key: value for key, value in content.items() if key != "Diagnostics"}
+    diagnostics = content.get("Diagnostics") or []
+
+    fixes_file.write(f"{DOCUMENT_START}\n")
+    if header:
+        yaml.dump(header, fixes_file, Dumper=dumper, **DUMP_OPTIONS)
+    if diagnostics:
+        fixes_file.write(f"{DIAGNOSTICS_KEY}\n")
+        for start in range(0, len(diagnostics), DIAGNOSTICS_PER_CHUNK):
+            yaml.dump(diagnostics[start : start + DIAGNOSTICS_PER_CHUNK], fixes_file, Dumper=dumper, **DUMP_OPTIONS)
+    else:
+        fixes_file.write(f"{DIAGNOSTICS_KEY} []\n")
+    fixes_file.write(f"{DOCUMENT_END}\n")
@@ -0,0 +1,102 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Matches the `expanded from macro` notes of clang-tidy findings against the `IgnoredMacros` of a config.
+
+An ignored macro suppresses a note if it is contained in its message, e.g. `TEST` also covers `TEST_F`. The
+macro name of a note is looked up in a hashed set first. Otherwise, all ignored macros are searched at once
+by an Aho-Corasick automaton in a single pass over the message. The verdict is memoized per message, as the
+notes of a translation unit mostly refer to the same few macros. The memo is bounded, as the compiled macros
+are shared by all translation units of a persistent worker.
+"""
+
+import functools
+import re
+from collections import deque
+
+MACRO_NOTE_REGEX = re.compile(r"expanded from macro '(?P<name>[^']*)'")
+
+# Number of memoized verdicts, the memo is cleared once it is full
+MAX_VERDICTS = 4096
+
+
+class IgnoredMacros:
+    """The compiled ignored macros of a config."""
+
+    def __init__(self, macros):
+        self.macros = frozenset(macros)
+        # An empty entry disables the suppression by macros
+        self.disabled = "" in self.macros
+        self.verdicts = {}
+
+        # The trie of all macros, each state records whether any macro ends in it
+        self.transitions = [{}]
+        self.fail = [0]
+        self.accepting = [False]
+        for macro in self.macros:
+            self.add(macro)
+        self.link()
+
+    def add(self, macro):
+        """Adds a macro to the trie."""
+        state = 0
+        for character in macro:
+            if character not in self.transitions[state]:
+                self.transitions.append({})
+                self.fail.append(0)
+                self.accepting.append(False)
+                self.transitions[state][character] = len(self.transitions) - 1
+            state = self.transitions[state][character]
+        self.accepting[state] = True
+
+    def link(self):
+        """Links each state to the longest proper suffix within the trie, in breadth-first order."""
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and character not in self.transitions[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_state] = self.transitions[fail].get(character, 0)
+                self.accepting[next_state] = self.accepting[next_state] or self.accepting[self.fail[next_state]]
+
+    def search(self, text):
+        """Returns true if any macro is contained in the text."""
+        state = 0
+        for character in text:
+            while state and character not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(character, 0)
+            if self.accepting[state]:
+                return True
+        return False
+
+    def is_ignored(self, message):
+        """Returns true if the message of an `expanded from macro` note contains any ignored macro."""
+        verdict = self.verdicts.get(message)
+        if verdict is None:
+            note = MACRO_NOTE_REGEX.search(message)
+            verdict = bool(note and note.group("name") in self.macros) or self.search(message)
+            if len(self.verdicts) >= MAX_VERDICTS:
+                self.verdicts.clear()
+            self.verdicts[message] = verdict
+        return verdict
+
+
+@functools.lru_cache(maxsize=16)
+def compile_ignored_macros(macros):
+    """Compiles the tuple of ignored macros once per process, shared by all translation units."""
+    return IgnoredMacros(macros)
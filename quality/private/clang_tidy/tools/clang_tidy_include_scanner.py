@@ -0,0 +1,108 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Include scanning of translation units, used to report the unused inputs of a clang-tidy action.
+
+Bazel stages every source and header of a target for each clang-tidy action. The inputs listed in the
+`unused_inputs_list` of an action are not part of its cache key anymore, hence edits of headers which are
+not included by a translation unit do not invalidate its result.
+"""
+
+import logging
+import os
+import subprocess
+
+from quality.private.clang_tidy.tools import clang_tidy_result_cache
+from quality.private.common.tools import tracing
+
+# Prints the make style dependencies of the translation unit to stdout
+INCLUDE_SCAN_FLAGS = ["-M", "-w"]
+
+
+def parse_dependencies(make_rule):
+    """Returns the prerequisites of a make style dependency rule, e.g. `foo.o: foo.cpp foo.h`."""
+    _, _, prerequisites = make_rule.replace("\\\n", " ").partition(": ")
+
+    dependencies = []
+    dependency = ""
+    escaped = False
+    for character in prerequisites:
+        if escaped:
+            dependency += character
+            escaped = False
+        elif character == "\\":
+            escaped = True
+        elif character.isspace():
+            if dependency:
+                dependencies.append(dependency)
+            dependency = ""
+        else:
+            dependency += character
+    if dependency:
+        dependencies.append(dependency)
+    return dependencies
+
+
+def normalize_path(file_path, working_directory):
+    """Makes paths comparable to the exec paths of bazel."""
+    if os.path.isabs(file_path) and file_path.startswith(working_directory + os.sep):
+        file_path = os.path.relpath(file_path, working_directory)
+    return os.path.normpath(file_path)
+
+
+def scan_includes(preprocessor, compile_arguments, src_file):
+    """Returns the files the translation unit depends on, None if the scan failed."""
+    command = clang_tidy_result_cache.get_preprocessor_command(
+        preprocessor, compile_arguments, src_file, INCLUDE_SCAN_FLAGS
+    )
+    try:
+        result = tracing.run(
+            command,
+            shell=False,
+            check=False,
+            universal_newlines=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as error:
+        logging.debug(f"Scanning the includes of {src_file} failed: {error}")
+        return None
+
+    if result.returncode != 0:
+        logging.debug(f"Scanning the includes of {src_file} failed:\n{result.stderr}")
+        return None
+
+    working_directory = os.getcwd()
+    return {normalize_path(dependency, working_directory) for dependency in parse_dependencies(result.stdout)}
+
+
+def get_unused_inputs(preprocessor, translation_units, prunable_inputs):
+    """
+    Returns the prunable inputs which are not used by any of the translation units. If any scan fails,
+    no input is reported as unused, which is always safe.
+    """
+    used_inputs = set()
+    for src_file, compile_arguments in translation_units:
+        dependencies = scan_includes(preprocessor, compile_arguments, src_file)
+        if dependencies is None:
+            return []
+        used_inputs.update(dependencies)
+
+    return [prunable_input for prunable_input in prunable_inputs if os.path.normpath(prunable_input) not in used_inputs]
+
+
+def write_unused_inputs(unused_inputs_list, unused_inputs):
+    """Writes the unused inputs list of the action, one exec path per line."""
+    with open(unused_inputs_list, mode="w", encoding="utf-8") as unused_inputs_file:
+        unused_inputs_file.writelines(f"{unused_input}\n" for unused_input in unused_inputs)
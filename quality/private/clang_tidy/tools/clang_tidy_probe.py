@@ -0,0 +1,111 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Probes a clang-tidy binary for its version and its available checks.
+
+Each probe spawns the binary only once. Results are cached in-process and on disk, keyed by the
+path, size and modification time of the binary.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+# Overrides the directory of the on-disk probe cache
+CACHE_DIR_ENV = "CLANG_TIDY_PROBE_CACHE_DIR"
+
+_PROBE_CACHE = {}
+_PROBE_CACHE_LOCK = threading.Lock()
+
+
+def get_binary_key(clang_tidy_bin_path):
+    """Returns a key which changes whenever the binary at the given path changes, None if it does not exist."""
+    try:
+        stat = os.stat(clang_tidy_bin_path)
+    except OSError:
+        return None
+    return f"{os.path.realpath(clang_tidy_bin_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def get_cache_dir():
+    """Returns the directory of the on-disk probe cache."""
+    return Path(os.environ.get(CACHE_DIR_ENV) or Path(tempfile.gettempdir()) / "clang_tidy_probe")
+
+
+def run_probe(clang_tidy_bin_path, probe_args):
+    """Runs the binary with the given arguments and returns its stdout."""
+    result = subprocess.run(
+        [clang_tidy_bin_path, *probe_args],
+        shell=False,
+        check=False,
+        universal_newlines=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    return result.stdout
+
+
+def read_cached_probe(cache_file):
+    """Returns the cached probe output, None if there is none."""
+    try:
+        with open(cache_file, encoding="utf-8") as file:
+            return json.load(file)["stdout"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_cached_probe(cache_file, stdout):
+    """Stores the probe output, a failure to do so only costs another probe later on."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}")
+        with open(temporary_file, mode="w", encoding="utf-8") as file:
+            json.dump({"stdout": stdout}, file)
+        os.replace(temporary_file, cache_file)
+    except OSError as error:
+        logging.debug(f"Could not cache clang-tidy probe in {cache_file}: {error}")
+
+
+def probe(clang_tidy_bin_path, probe_args):
+    """Returns the stdout of the binary for the given arguments, spawning the binary only if not cached yet."""
+    binary_key = get_binary_key(clang_tidy_bin_path)
+    if binary_key is None:
+        return run_probe(clang_tidy_bin_path, probe_args)
+
+    key = json.dumps([binary_key, probe_args])
+    with _PROBE_CACHE_LOCK:
+        if key not in _PROBE_CACHE:
+            cache_file = get_cache_dir() / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+            stdout = read_cached_probe(cache_file)
+            if stdout is None:
+                stdout = run_probe(clang_tidy_bin_path, probe_args)
+                write_cached_probe(cache_file, stdout)
+            _PROBE_CACHE[key] = stdout
+        return _PROBE_CACHE[key]
+
+
+def get_version(clang_tidy_bin_path):
+    """Returns the version info of the binary, as printed by `--version`."""
+    return probe(clang_tidy_bin_path, ["--version"])
+
+
+def get_available_checks(clang_tidy_bin_path):
+    """Returns the names of all checks the binary provides, as listed by `--list-checks`."""
+    stdout = probe(clang_tidy_bin_path, ["--list-checks", "--checks=*"])
+    return [line.strip() for line in stdout.splitlines()[1:] if line.strip()]
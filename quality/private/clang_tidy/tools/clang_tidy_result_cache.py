@@ -0,0 +1,306 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Local result cache of clang-tidy runs, keyed on the preprocessed translation unit.
+
+Bazel re-runs clang-tidy on every source file of a target as soon as any header of the target changes.
+The preprocessed translation unit only changes if the source file actually sees different content, hence
+a cache hit replays the stored (filtered) output and fixes file without launching clang-tidy.
+
+Entries are written atomically, so the cache directory can be shared by concurrent actions of one host.
+Eviction is least recently used and serialized via a lock file. The total size of the entries is tracked in a
+counter file under the lock, such that the cache directory is only scanned once the maximum size is exceeded.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+from collections import namedtuple
+
+from quality.private.clang_tidy.tools import clang_tidy_probe, common
+from quality.private.common.tools import tracing
+
+ResultCacheConfig = namedtuple("ResultCacheConfig", "directory preprocessor max_size")
+
+CacheEntry = namedtuple(
+    "CacheEntry",
+    "returncode stdout stderr fixes tidy_findings no_tidy_findings findings suppression_stats",
+    defaults=(None, None),
+)
+
+# Bumped whenever the key or the layout of an entry changes
+CACHE_FORMAT_VERSION = "2"
+
+LOCK_FILE_NAME = ".lock"
+SIZE_FILE_NAME = ".size"
+
+# Eviction frees some headroom below the maximum size, such that it is not repeated on every following store
+EVICTED_SIZE_RATIO = 0.9
+
+# Keeps comments (i.e. NOLINT) and macro definitions, both affect the findings of clang-tidy
+PREPROCESSOR_FLAGS = ["-E", "-C", "-dD", "-w"]
+
+# Flags of the compile command which contradict preprocessing to stdout
+IGNORED_COMPILE_FLAGS = ["-c", "-MD", "-MMD"]
+IGNORED_COMPILE_FLAGS_WITH_VALUE = ["-o", "-MF", "-MT", "-MQ"]
+
+
+class CachedResult:  # pylint: disable=too-few-public-methods
+    """A replayed clang-tidy result, offering the same attributes as a completed subprocess."""
+
+    def __init__(self, returncode, stdout, stderr):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+def get_preprocessor_command(preprocessor, compile_arguments, src_file, preprocessor_flags=None):
+    """Derives the preprocessor command from the compile arguments, whose first item is the tool itself."""
+    command = [preprocessor]
+    arguments = iter(compile_arguments[1:])
+    for argument in arguments:
+        if argument in IGNORED_COMPILE_FLAGS:
+            continue
+        if argument in IGNORED_COMPILE_FLAGS_WITH_VALUE:
+            next(arguments, None)
+            continue
+        if argument == src_file:
+            continue
+        command.append(argument)
+    return command + (preprocessor_flags or PREPROCESSOR_FLAGS) + [src_file]
+
+
+def normalize(value, working_directory):
+    """Strips the (sandbox dependent) working directory, such that keys are stable across actions."""
+    return value.replace(working_directory + os.sep, "").replace(working_directory, ".")
+
+
+def hash_preprocessed_source(hasher, preprocessor, compile_arguments, src_file):
+    """Feeds the preprocessed translation unit into the hasher, returns false if preprocessing failed."""
+    working_directory = os.getcwd()
+    command = get_preprocessor_command(preprocessor, compile_arguments, src_file)
+
+    try:
+        with tracing.Popen(
+            command,
+            shell=False,
+            universal_newlines=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ) as process:
+            # Hashed line by line, the preprocessed translation unit may become large
+            for line in process.stdout:
+                hasher.update(normalize(line, working_directory).encode("utf-8"))
+            returncode = process.wait()
+    except OSError as error:
+        logging.debug(f"Preprocessing {src_file} for the result cache failed: {error}")
+        return False
+
+    if returncode != 0:
+        logging.debug(f"Preprocessing {src_file} for the result cache failed with exit code {returncode}")
+        return False
+    return True
+
+
+def get_cache_key(  # pylint: disable=too-many-arguments
+    preprocessor,
+    compile_arguments,
+    src_file,
+    command,
+    config_file,
+    clang_tidy_bin_path,
+    foreign_headers=None,
+    suppress_patterns=None,
+):
+    """
+    Returns the cache key of a clang-tidy run, None if it cannot be determined. It covers the preprocessed
+    translation unit, the normalized flags, the merged config, the version of clang-tidy, the foreign
+    headers, whose findings are dropped from the stored output, and the suppress patterns filtering it.
+    """
+    working_directory = os.getcwd()
+    hasher = hashlib.sha256()
+
+    with open(config_file, mode="rb") as config:
+        config_digest = hashlib.sha256(config.read()).hexdigest()
+
+    metadata = {
+        "format": CACHE_FORMAT_VERSION,
+        "command": [normalize(argument, working_directory) for argument in command[1:]],
+        "compile_arguments": [normalize(argument, working_directory) for argument in compile_arguments[1:]],
+        "config": config_digest,
+        "version": clang_tidy_probe.get_version(clang_tidy_bin_path),
+        "foreign_headers": sorted(foreign_headers or []),
+        "suppress_patterns": list(suppress_patterns or []),
+    }
+    hasher.update(json.dumps(metadata, sort_keys=True).encode("utf-8"))
+
+    if not hash_preprocessed_source(hasher, preprocessor, compile_arguments, src_file):
+        return None
+    return hasher.hexdigest()
+
+
+def get_entry_path(cache_dir, key):
+    """Returns the location of an entry, fanned out over subdirectories to keep directories small."""
+    return os.path.join(cache_dir, key[:2], f"{key}.json")
+
+
+def load(cache_dir, key):
+    """Returns the cached entry for the key, None on a miss. A hit marks the entry as recently used."""
+    entry_path = get_entry_path(cache_dir, key)
+    try:
+        with open(entry_path, encoding="utf-8") as entry_file:
+            content = json.load(entry_file)
+        os.utime(entry_path)
+    except (OSError, ValueError):
+        return None
+
+    content["tidy_findings"] = common.TidyFindings(**content["tidy_findings"])
+    return CacheEntry(**content)
+
+
+def replay(entry, fixes, findings=None, suppression_stats=None):
+    """
+    Restores the fixes, findings and suppression stats files of a cached entry, returns the result along with
+    its findings.
+    """
+    if fixes and entry.fixes is not None:
+        with open(fixes, mode="w", encoding="utf-8") as fixes_file:
+            fixes_file.write(entry.fixes)
+    if findings and entry.findings is not None:
+        with open(findings, mode="w", encoding="utf-8") as findings_file:
+            findings_file.write(entry.findings)
+    if suppression_stats and entry.suppression_stats is not None:
+        with open(suppression_stats, mode="w", encoding="utf-8") as suppression_stats_file:
+            suppression_stats_file.write(entry.suppression_stats)
+    return CachedResult(entry.returncode, entry.stdout, entry.stderr), entry.tidy_findings, entry.no_tidy_findings
+
+
+def make_entry(  # pylint: disable=too-many-arguments
+    result, fixes, tidy_findings, no_tidy_findings, findings=None, suppression_stats=None
+):
+    """
+    Creates a cache entry from a finished clang-tidy run and its (filtered) fixes, findings and suppression
+    stats files.
+    """
+    fixes_content = None
+    if fixes:
+        with open(fixes, encoding="utf-8") as fixes_file:
+            fixes_content = fixes_file.read()
+    findings_content = None
+    if findings:
+        with open(findings, encoding="utf-8") as findings_file:
+            findings_content = findings_file.read()
+    suppression_stats_content = None
+    if suppression_stats:
+        with open(suppression_stats, encoding="utf-8") as suppression_stats_file:
+            suppression_stats_content = suppression_stats_file.read()
+    return CacheEntry(
+        result.returncode,
+        result.stdout,
+        result.stderr,
+        fixes_content,
+        tidy_findings,
+        no_tidy_findings,
+        findings_content,
+        suppression_stats_content,
+    )
+
+
+def store(cache_dir, key, entry, max_size):
+    """Atomically stores an entry and evicts the least recently used entries beyond the maximum size in bytes."""
+    entry_path = get_entry_path(cache_dir, key)
+    temporary_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    content = entry._asdict()
+    content["tidy_findings"] = entry.tidy_findings._asdict()
+
+    try:
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        with open(temporary_path, mode="w", encoding="utf-8") as entry_file:
+            json.dump(content, entry_file)
+        added_size = os.path.getsize(temporary_path)
+        with locked(cache_dir):
+            with contextlib.suppress(FileNotFoundError):
+                added_size -= os.path.getsize(entry_path)
+            os.replace(temporary_path, entry_path)
+
+            total_size = read_size(cache_dir)
+            if total_size is None or total_size + added_size > max_size:
+                total_size = evict(cache_dir, int(max_size * EVICTED_SIZE_RATIO))
+            else:
+                total_size += added_size
+            write_size(cache_dir, total_size)
+    except OSError as error:
+        logging.debug(f"Storing the clang-tidy result in the cache {cache_dir} failed: {error}")
+
+
+@contextlib.contextmanager
+def locked(cache_dir):
+    """Exclusively locks the cache directory across processes, where supported by the platform."""
+    try:
+        import fcntl  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        yield
+        return
+
+    with open(os.path.join(cache_dir, LOCK_FILE_NAME), mode="a", encoding="utf-8") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_size(cache_dir):
+    """Returns the tracked total size of the entries in bytes, None if it is unknown."""
+    try:
+        with open(os.path.join(cache_dir, SIZE_FILE_NAME), encoding="utf-8") as size_file:
+            return int(size_file.read())
+    except (OSError, ValueError):
+        return None
+
+
+def write_size(cache_dir, total_size):
+    """Tracks the total size of the entries in bytes, must be called with the cache directory locked."""
+    with open(os.path.join(cache_dir, SIZE_FILE_NAME), mode="w", encoding="utf-8") as size_file:
+        size_file.write(str(total_size))
+
+
+def evict(cache_dir, max_size):
+    """
+    Removes the least recently used entries until the cache does not exceed the maximum size in bytes, returns the
+    remaining size.
+    """
+    entries = []
+    total_size = 0
+    for bucket in os.scandir(cache_dir):
+        if not bucket.is_dir():
+            continue
+        for entry in os.scandir(bucket.path):
+            if not entry.name.endswith(".json"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        total_size -= size
+    return total_size
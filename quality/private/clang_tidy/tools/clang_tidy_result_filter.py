@@ -17,35 +17,55 @@ Module to filter clang-tidy results.
 
 import logging
 import re
-from collections import namedtuple
-from os import path
-from pathlib import Path
+from collections import Counter, namedtuple
+from itertools import chain, zip_longest
+from os import getcwd, path
 
-import ruamel.yaml
 from termcolor import colored
 
-from quality.private.clang_tidy.tools import common
+from quality.private.clang_tidy.tools import (
+    clang_tidy_changed_lines,
+    clang_tidy_findings,
+    clang_tidy_fixes,
+    clang_tidy_ignored_macros,
+    clang_tidy_suppressions,
+    common,
+)
+from quality.private.common.tools import tracing
 
 FindingOutput = namedtuple("FindingOutput", "diagnostic finding")
 
+# This pattern exploits the fact that "warning" and "error" is printed using term colors, which end with an "m"
+COLORED_WARNING_REGEX = re.compile(r"((?:m)warning|(?:m)error)\:", re.MULTILINE)
+# This is supposed to be the right pattern but it fails in edge cases
+WARNING_REGEX = re.compile(r"(\:\d+\:\d+\:(?:.*|\s*|\S*)(?:warning|error)\:)", re.MULTILINE)
 
-def filter_findings(patterns, diagnostics, findings):
-    """Filter out findings which match any pattern in the pattern list."""
+
+def filter_findings(patterns, diagnostics, findings, hits=None, resolver=None):
+    """
+    Filter out findings which match any pattern in the pattern list. The suppressed findings are counted per
+    pattern into the hits, if given.
+    """
+    resolver = resolver or PathResolver()
     filtered_warnings = []
     filtered_errors = []
+    suppression_patterns = clang_tidy_suppressions.compile_patterns(tuple(patterns))
 
-    for index, diagnostic in enumerate(diagnostics):
+    for diagnostic, finding in pair_findings(diagnostics, findings):
         is_counting_finding = True
         msg = diagnostic["DiagnosticMessage"]["Message"]
-        if any(re.match(pattern, msg) for pattern in patterns):
+        pattern_index = suppression_patterns.match(msg)
+        if pattern_index is not None:
             is_counting_finding = False
+            if hits is not None:
+                hits[patterns[pattern_index]] += 1
 
-        file_path = Path(diagnostic["DiagnosticMessage"]["FilePath"])
+        file_path = diagnostic["DiagnosticMessage"]["FilePath"]
 
         if is_counting_finding:
-            finding_string = findings[index].replace(
-                findings[index].split(":")[0],
-                "\n" + colored(path.realpath(file_path), "white", attrs=["bold"]),
+            finding_string = finding.replace(
+                finding.split(":")[0],
+                "\n" + colored(resolver.resolve(file_path), "white", attrs=["bold"]),
             )
             # Assuming diagnostic level could be either error or warning
             if diagnostic["Level"] == "Error":
@@ -59,34 +79,181 @@ def filter_findings(patterns, diagnostics, findings):
     return filtered_warnings, filtered_errors
 
 
-def filter_stdout(stdout, config_path_or_pattens, fixes_path, uses_color):
-    """Applies a filter on the clang-tidy output. Currently only macros are filtered."""
-    fixes_content = read_fixes_file(fixes_path)
-    diagnostics = parse_fixes_file(fixes_content)
+def pair_findings(diagnostics, findings):
+    """
+    Pairs each diagnostic with its finding in the output, the findings may be produced one at a time. It is
+    crucial that both do match one by one, everything else would be an internal error.
+    """
+    for diagnostic, finding in zip_longest(diagnostics, findings):
+        assert (
+            diagnostic is not None and finding is not None
+        ), "Number of diagnostic items do not match number of findings"
+        yield diagnostic, finding
+
+
+class CountingIterator:
+    """Iterates over the items of an iterable, counting the ones produced so far."""
+
+    def __init__(self, iterable):
+        self.iterator = iter(iterable)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self.iterator)
+        self.count += 1
+        return item
+
+
+class PathResolver:
+    """
+    Resolves the paths of the diagnostics of a single `filter_stdout` call. The diagnostics of a translation unit
+    are located in few files, hence the symlink chains of the sandbox are only resolved once per file. Each call
+    has its own memo, such that concurrently filtered translation units do not share stale paths.
+    """
+
+    def __init__(self):
+        self.real_paths = {}
+        self.files = {}
+        self.exec_paths = {}
+        self.working_directory = getcwd()
+
+    def resolve(self, file_path):
+        """Returns the real path of a file."""
+        real_path = self.real_paths.get(file_path)
+        if real_path is None:
+            real_path = self.real_paths[file_path] = path.realpath(file_path)
+        return real_path
+
+    def is_file(self, file_path):
+        """Returns true if the path exists and is a file, following symlinks."""
+        is_file = self.files.get(file_path)
+        if is_file is None:
+            is_file = self.files[file_path] = path.isfile(file_path)
+        return is_file
+
+    def get_exec_path(self, file_path):
+        """Returns the path of a diagnostic relative to the working directory, if located within it."""
+        exec_path = self.exec_paths.get(file_path)
+        if exec_path is None:
+            exec_path = self.exec_paths[file_path] = get_exec_path(file_path, self.working_directory)
+        return exec_path
+
+
+def get_exec_path(file_path, working_directory=None):
+    """Returns the path of a diagnostic relative to the working directory, if located within it."""
+    working_directory = working_directory or getcwd()
+    if path.isabs(file_path) and file_path.startswith(working_directory + path.sep):
+        file_path = path.relpath(file_path, working_directory)
+    return path.normpath(file_path)
+
+
+def is_foreign_finding(diagnostic, foreign_headers, resolver):
+    """Returns true if the finding is located in a header whose findings are reported by another translation unit."""
+    file_path = diagnostic["DiagnosticMessage"]["FilePath"]
+    if not file_path:
+        return False
+    return resolver.get_exec_path(file_path) in foreign_headers
+
+
+def drop_foreign_findings(filtered_findings, foreign_headers, resolver=None):
+    """Drops the findings located in foreign headers, they are reported by their owning translation unit."""
+    if not foreign_headers:
+        return filtered_findings
+    resolver = resolver or PathResolver()
+    normalized_foreign_headers = {path.normpath(foreign_header) for foreign_header in foreign_headers}
+    owned_findings = [
+        finding
+        for finding in filtered_findings
+        if not is_foreign_finding(finding.diagnostic, normalized_foreign_headers, resolver)
+    ]
+    logging.debug(f"Dropped {len(filtered_findings) - len(owned_findings)} finding(s) in foreign headers")
+    return owned_findings
+
+
+def is_changed_finding(diagnostic, changed_lines, resolver):
+    """Returns true if the finding is located on a changed line, findings without a location are kept."""
+    file_path = diagnostic["DiagnosticMessage"]["FilePath"]
+    if not file_path:
+        return True
+    line = clang_tidy_changed_lines.get_line(file_path, diagnostic["DiagnosticMessage"]["FileOffset"])
+    return line is None or changed_lines.contains(resolver.get_exec_path(file_path), line)
+
+
+def drop_unchanged_findings(filtered_findings, changed_lines, resolver=None):
+    """Drops the findings located on lines which have not been changed."""
+    if changed_lines is None:
+        return filtered_findings
+    resolver = resolver or PathResolver()
+    changed_findings = [
+        finding for finding in filtered_findings if is_changed_finding(finding.diagnostic, changed_lines, resolver)
+    ]
+    logging.debug(f"Dropped {len(filtered_findings) - len(changed_findings)} finding(s) on unchanged lines")
+    return changed_findings
+
+
+def filter_stdout(  # pylint: disable=too-many-arguments
+    stdout,
+    config_path_or_pattens,
+    fixes_path,
+    uses_color,
+    foreign_headers=None,
+    changed_lines=None,
+    findings_path=None,
+    suppression_stats_path=None,
+):
+    """
+    Applies a filter on the clang-tidy output. Macros or patterns are filtered, as well as findings in foreign
+    headers, which are owned by another translation unit, and findings on unchanged lines if given. The
+    remaining findings are written as machine readable records to the findings path, if given. The hits per
+    suppression pattern are written to the suppression stats path, if given. The output is either a string or
+    an iterable of its lines, e.g. a spooled file, which is split into findings while it is read. The diagnostics
+    are read one at a time as well, only the remaining ones are kept.
+    """
+    resolver = PathResolver()
+    fixes_content = {}
+    diagnostics = read_fixes_file(fixes_path, fixes_content)
+    first_diagnostic = next(diagnostics, None)
 
     # Defense programming: In case there are no valid diagnostics, fall back to the original output
-    if not diagnostics:
+    if first_diagnostic is None:
         logging.debug("No valid diagnostics found, falling back to original output")
-        return stdout, None
+        return stdout if isinstance(stdout, str) else "".join(stdout), None
+    diagnostics = CountingIterator(chain([first_diagnostic], diagnostics))
 
     # From the stdout we parse the actual warning output which can later be presented to the user
-    findings = parse_warnings(stdout, uses_color)
-
-    # It is crucial that both length do match, everything else would be a internal error
-    logging.debug(f"Number of diagnostic entries: {len(diagnostics)}")
-    logging.debug(f"Number of parsed findings: {len(findings)}")
-    assert len(diagnostics) == len(findings), "Number of diagnostic items do not match number of findings"
+    if isinstance(stdout, str):
+        findings = parse_warnings(stdout, uses_color)
+    else:
+        findings = split_warnings(stdout, uses_color)
 
     if isinstance(config_path_or_pattens, list):
-        filtered_warnings, filtered_errors = filter_findings(config_path_or_pattens, diagnostics, findings)
+        hits = Counter()
+        filtered_warnings, filtered_errors = filter_findings(
+            config_path_or_pattens, diagnostics, findings, hits, resolver
+        )
+        if suppression_stats_path:
+            clang_tidy_suppressions.write_stats(suppression_stats_path, config_path_or_pattens, hits, diagnostics.count)
     else:
         config_content = config_path_or_pattens
         ignored_macros = get_ignored_macros(config_content)
 
-        filtered_warnings, filtered_errors = filter_warnings(ignored_macros, diagnostics, findings)
+        filtered_warnings, filtered_errors = filter_warnings(ignored_macros, diagnostics, findings, resolver)
+    logging.debug(f"Number of diagnostic entries: {diagnostics.count}")
+
+    filtered_warnings = drop_foreign_findings(filtered_warnings, foreign_headers, resolver)
+    filtered_errors = drop_foreign_findings(filtered_errors, foreign_headers, resolver)
+    filtered_warnings = drop_unchanged_findings(filtered_warnings, changed_lines, resolver)
+    filtered_errors = drop_unchanged_findings(filtered_errors, changed_lines, resolver)
 
     filtered_findings = filtered_warnings + filtered_errors
-    write_filtered_warnings_to_fixes_file(fixes_content, filtered_findings, fixes_path)
+    # The records are built before the fixes rewrite resolves the paths of the diagnostics to their real paths
+    if findings_path:
+        write_findings(filtered_findings, findings_path, resolver)
+    with tracing.phase("fixes rewrite", findings=len(filtered_findings)):
+        write_filtered_warnings_to_fixes_file(fixes_content, filtered_findings, fixes_path, resolver)
     filtered_stdout = "".join([finding.finding for finding in filtered_findings])
 
     # Some fields are irrelevant and we use the tidy_findings only as the "diff"
@@ -94,7 +261,7 @@ def filter_stdout(stdout, config_path_or_pattens, fixes_path, uses_color):
     tidy_findings = common.TidyFindings(
         errors=len(filtered_errors),
         warnings=len(filtered_warnings),
-        suppressions=len(findings) - len(filtered_findings),
+        suppressions=diagnostics.count - len(filtered_findings),
         nolints=0,  # irrelevant
         counting=len(filtered_findings),
     )
@@ -105,63 +272,61 @@ def filter_stdout(stdout, config_path_or_pattens, fixes_path, uses_color):
     return filtered_stdout, tidy_findings
 
 
-def write_filtered_warnings_to_fixes_file(file_content, filtered_warnings, fixes_path):
+def write_findings(filtered_findings, findings_path, resolver=None):
+    """Writes the records of the filtered findings, built from their diagnostics."""
+    resolver = resolver or PathResolver()
+    records = []
+    for finding in filtered_findings:
+        file_path = finding.diagnostic["DiagnosticMessage"]["FilePath"]
+        records.append(
+            clang_tidy_findings.to_record(finding.diagnostic, resolver.get_exec_path(file_path) if file_path else None)
+        )
+    clang_tidy_findings.write(findings_path, records)
+
+
+def write_filtered_warnings_to_fixes_file(file_content, filtered_warnings, fixes_path, resolver=None):
     """Writes filtered warnings to fixes file."""
     logging.debug(f"Writing filtered warnings to {fixes_path}")
-    if filtered_warnings:
-        filtered_diagnostics = [warning.diagnostic for warning in filtered_warnings]
-        for diag in filtered_diagnostics:
-            if "BuildDirectory" in diag:
-                diag["BuildDirectory"] = "Omitted"
-        file_content["Diagnostics"] = filtered_diagnostics
-        remove_symlinks(file_content)
-        yaml = ruamel.yaml.YAML(typ="rt")
-        yaml.explicit_start = True
-        yaml.explicit_end = True
-        yaml.width = 500
-        stream = ruamel.yaml.compat.StringIO()
-        yaml.dump(file_content, stream)
-        yaml_content = stream.getvalue()
-    else:
-        yaml_content = common.NO_FIXES_REQUIRED
     with open(fixes_path, mode="w", encoding="utf-8") as fixes_file:
-        fixes_file.write(yaml_content)
-
-
-def remove_symlinks(content):
+        if filtered_warnings:
+            filtered_diagnostics = [warning.diagnostic for warning in filtered_warnings]
+            for diag in filtered_diagnostics:
+                if "BuildDirectory" in diag:
+                    diag["BuildDirectory"] = clang_tidy_fixes.keep_quotes(diag["BuildDirectory"], "Omitted")
+            file_content["Diagnostics"] = filtered_diagnostics
+            remove_symlinks(file_content, resolver or PathResolver())
+            clang_tidy_fixes.dump(file_content, fixes_file)
+        else:
+            fixes_file.write(common.NO_FIXES_REQUIRED)
+
+
+def remove_symlinks(content, resolver=None):
     """Remove symlinks from path if real path can be determined."""
     keys = ["FilePath", "MainSourceFile"]
+    resolver = resolver or PathResolver()
 
     def remove_symlinks_from_keys() -> None:
         for key in keys:
             if key in content:
-                content[key] = path.realpath(content[key])
+                content[key] = clang_tidy_fixes.keep_quotes(content[key], resolver.resolve(content[key]))
 
     if isinstance(content, dict):
         remove_symlinks_from_keys()
         for _, value in content.items():
-            remove_symlinks(value)
+            remove_symlinks(value, resolver)
 
     if isinstance(content, list):
         for value in content:
-            remove_symlinks(value)
+            remove_symlinks(value, resolver)
 
 
-def read_fixes_file(fixes_path):
-    """Parses fixes yaml."""
+def read_fixes_file(fixes_path, fixes_content):
+    """
+    Reads the diagnostics of the fixes yaml one at a time. The remaining content is stored into the given mapping
+    once they are exhausted.
+    """
     logging.debug(f"Reading fixes file from {fixes_path}")
-    with open(fixes_path, encoding="utf-8") as the_file:
-        yaml = ruamel.yaml.YAML(typ="rt")
-        yaml.preserve_quotes = True
-        fixes = yaml.load(the_file)
-    return fixes
-
-
-def parse_fixes_file(fixes_content):
-    """Finds the root tree of the fixes file yaml."""
-    if "Diagnostics" in fixes_content:
-        return fixes_content["Diagnostics"]
-    return None
+    return clang_tidy_fixes.iter_diagnostics(fixes_path, fixes_content)
 
 
 def is_diagnostic_message(message):
@@ -169,19 +334,21 @@ def is_diagnostic_message(message):
     return message.startswith("clang-diagnostic-")
 
 
-def filter_warnings(ignored_macros, diagnostics, warnings):
+def filter_warnings(ignored_macros, diagnostics, warnings, resolver=None):
     """Browses the fixes files content and matches ignored macros."""
+    resolver = resolver or PathResolver()
     filtered_warnings = []
     filtered_errors = []
-    for index, diagnostic in enumerate(diagnostics):
-        is_counting_warning = counting_warning(diagnostic, ignored_macros)
+    compiled_ignored_macros = clang_tidy_ignored_macros.compile_ignored_macros(tuple(ignored_macros))
+    for diagnostic, warning in pair_findings(diagnostics, warnings):
+        is_counting_warning = counting_warning(diagnostic, compiled_ignored_macros)
 
-        file_path = Path(diagnostic["DiagnosticMessage"]["FilePath"])
+        file_path = diagnostic["DiagnosticMessage"]["FilePath"]
         message = diagnostic["DiagnosticName"]
 
         # Every diagnostic message should have a valid file path, except for the special category
         # of "clang-diagnostic-" checks, which are basically compiler errors.
-        if not file_path.is_file() and not is_diagnostic_message(message):
+        if not resolver.is_file(file_path) and not is_diagnostic_message(message):
             logging.warning(
                 (
                     "No valid file path found in fixes.yaml reported by a clang-tidy checker.\n"
@@ -190,9 +357,9 @@ def filter_warnings(ignored_macros, diagnostics, warnings):
             )
             is_counting_warning = False
         if is_counting_warning or is_diagnostic_message(message):
-            warning_string = warnings[index].replace(
-                warnings[index].split(":")[0],
-                "\n" + colored(path.realpath(file_path), "white", attrs=["bold"]),
+            warning_string = warning.replace(
+                warning.split(":")[0],
+                "\n" + colored(resolver.resolve(file_path), "white", attrs=["bold"]),
             )
             if diagnostic.get("Level") == "Error":
                 filtered_errors.append(FindingOutput(diagnostic, warning_string))
@@ -204,81 +371,73 @@ def filter_warnings(ignored_macros, diagnostics, warnings):
 
 
 def counting_warning(diagnostic, ignored_macros):
-    """Decides whether to count a warning or not."""
-    is_counting_warning = True
-    if "Notes" in diagnostic and "" not in ignored_macros:
-        notes = diagnostic["Notes"]
-        for note in notes:
+    """Decides whether to count a warning or not, based on the compiled ignored macros."""
+    if "Notes" in diagnostic and not ignored_macros.disabled:
+        for note in diagnostic["Notes"]:
             message = note["Message"]
-            if "expanded from macro" in message:
-                for ignored_macro in ignored_macros:
-                    if ignored_macro in message:
-                        is_counting_warning = False
-    return is_counting_warning
-
-
-def build_indices(clang_tidy_output_lines, matches):
-    """Returns a list of line-number-indices in which warning have been found."""
-    start_line_of_warning_indices = []
-    for i, line in enumerate(clang_tidy_output_lines):
-        for match in matches:
-            if match in line:
-                start_line_of_warning_indices.append(i)
-                break
-    logging.debug(f"Warnings start at indices {start_line_of_warning_indices}")
-    return start_line_of_warning_indices
-
-
-def build_warning_output(extracted_warning, index):
-    """Apply some colors and escapes to each warning output."""
-    # Unused, it would add a unique ID per translation unit
-    _ = [colored("ID: " + f"{(index + 1):04d}", attrs=["dark"])]
-
+            if "expanded from macro" in message and ignored_macros.is_ignored(message):
+                return False
+    return True
+
+
+def find_warning_offsets(clang_tidy_output, regex):
+    """
+    Returns the offsets at which the lines of the warnings start, found in a single pass over the output. Each
+    warning reaches up to the line of the next one.
+    """
+    offsets = []
+    for match in regex.finditer(clang_tidy_output):
+        offset = clang_tidy_output.rfind("\n", 0, match.start()) + 1
+        assert not offsets or offsets[-1] < offset, "Multiple warnings start in a single line"
+        offsets.append(offset)
+    logging.debug(f"Warnings start at offsets {offsets}")
+    return offsets
+
+
+def build_warning_output(extracted_warning):
+    """Apply some escapes to each warning output."""
     # You need this as we possibly are ignoring warnings messing up the termcolor escapes
-    escape_color = ["\x1b[0m"]
-    built_warning = "\n".join(escape_color + extracted_warning)
-    return built_warning
-
+    return "\x1b[0m\n" + extracted_warning
 
-def build_warning_list(indices, input_lines):
-    """Prepares the output the user will see in the end."""
-    warnings = []
-    for index, _ in enumerate(indices[0:-1]):
-        extracted_warning = input_lines[indices[index] : indices[index + 1]]
-        warning = build_warning_output(extracted_warning, index)
-        warnings.append(warning)
-
-    extracted_warning = input_lines[indices[-1] :]
-    warning = build_warning_output(extracted_warning, len(indices) - 1)
-    warnings.append(warning)
 
+def build_warning_list(offsets, clang_tidy_output):
+    """Prepares the output the user will see in the end, each warning is sliced from the output once."""
+    ends = [offset - 1 for offset in offsets[1:]] + [len(clang_tidy_output)]
+    warnings = [build_warning_output(clang_tidy_output[start:end]) for start, end in zip(offsets, ends)]
     logging.debug(f"Warning list has {len(warnings)} item(s)")
     return warnings
 
 
+def split_warnings(lines, uses_color):
+    """
+    Yields the warnings of the clang-tidy output given as an iterable of its lines, one at a time. They are
+    sliced like by `parse_warnings`, except that the warning pattern is matched within a single line.
+    """
+    regex = COLORED_WARNING_REGEX if uses_color else WARNING_REGEX
+    warning_lines = None
+    for line in lines:
+        if regex.search(line):
+            if warning_lines is not None:
+                # The previous warning reaches up to the line break before the current one
+                yield build_warning_output("".join(warning_lines)[:-1])
+            warning_lines = [line]
+        elif warning_lines is not None:
+            warning_lines.append(line)
+    if warning_lines is not None:
+        yield build_warning_output("".join(warning_lines))
+
+
 def parse_warnings(clang_tidy_output, uses_color):
     """Takes the vanilla clang-tidy output and returns a list of found warnings."""
     warnings = []
 
-    if uses_color:
-        # This pattern exploits the fact that "warning" and "error" is printed using term colors, which end with an "m"
-        regex_string = r"((?:m)warning|(?:m)error)\:"
-    else:
-        # This is supposed to be the right pattern but it fails in edge cases
-        regex_string = r"(\:\d+\:\d+\:(?:.*|\s*|\S*)(?:warning|error)\:)"
-
-    regex = re.compile(regex_string, re.MULTILINE)
-    matches = regex.findall(clang_tidy_output)
+    regex = COLORED_WARNING_REGEX if uses_color else WARNING_REGEX
+    offsets = find_warning_offsets(clang_tidy_output, regex)
+    logging.debug(f"Clang-tidy output has {len(clang_tidy_output)} character(s)")
 
-    clang_tidy_output_lines = clang_tidy_output.split("\n")
-    logging.debug(f"Clang-tidy output has {len(clang_tidy_output_lines)} line(s)")
-
-    if matches:
-        logging.debug(f"Regex matched {len(matches)} item(s)")
-        indices = build_indices(clang_tidy_output_lines, matches)
-        assert len(indices) == len(matches), "Number of indices do not match number of regex matches"
-        warnings = build_warning_list(indices, clang_tidy_output_lines)
-        assert len(warnings) == len(indices), "Number of warnings do not match number of indices"
+    if offsets:
+        logging.debug(f"Regex matched {len(offsets)} item(s)")
+        warnings = build_warning_list(offsets, clang_tidy_output)
     else:
         logging.debug("No matches in clang-tidy output")
     return warnings
@@ -286,6 +445,8 @@ def parse_warnings(clang_tidy_output, uses_color):
 
 def read_config_file(config_file):
     """Parses the .clang-tidy config yaml."""
+    import ruamel.yaml  # pylint: disable=import-outside-toplevel
+
     logging.debug(f"Reading .clang-tidy config file from {config_file}")
     with open(config_file, encoding="utf-8") as file:
         config = ruamel.yaml.YAML(typ="safe", pure=True).load(file)
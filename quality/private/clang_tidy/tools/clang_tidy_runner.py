@@ -16,26 +16,56 @@ Main clang-tidy runner module.
 """
 
 import argparse
-import glob
+import contextlib
 import json
 import logging
 import os
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os import name as os_name
 from pathlib import Path
 
-import ruamel.yaml
 from termcolor import colored
 
 from quality.private.clang_tidy.tools import (
+    clang_tidy_changed_lines,
+    clang_tidy_check_profile,
     clang_tidy_configs,
+    clang_tidy_findings,
+    clang_tidy_include_scanner,
+    clang_tidy_probe,
+    clang_tidy_result_cache,
     clang_tidy_result_filter,
+    clang_tidy_suppressions,
     common,
+    persistent_worker,
 )
+from quality.private.common.tools import tracing
 from quality.private.common.tools.utils import escape_quotes
 
+# Output of a streamed clang-tidy run beyond this size is spooled to disk instead of being kept in memory
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Printed by clang-tidy (i.e. LLVM) when an allocation fails, e.g. due to the address space limit
+OUT_OF_MEMORY_MARKERS = ["out of memory", "std::bad_alloc", "Allocation failed"]
+
+# The wall clock limit in seconds and the address space limit in bytes of a clang-tidy run, None if unlimited
+ResourceLimits = namedtuple("ResourceLimits", "timeout memory_limit")
+
+
+class AnalysisAborted(Exception):
+    """Raised when clang-tidy exceeds a resource limit, the reason is part of the aborted result."""
+
+    def __init__(self, reason):
+        self.reason = reason
+        super().__init__(reason)
+
 
 def get_result_count(regex, output):
     """Helper to apply regex in clang-tidy result stdout."""
@@ -46,15 +76,206 @@ def get_result_count(regex, output):
     return count
 
 
+class TidyFindingsCounter:
+    """Determines the findings from the clang-tidy stderr in a single pass, line by line."""
+
+    # Cheap preselection of the few summary lines, only these are matched against the individual patterns
+    SUMMARY_LINE_PATTERN = re.compile(r"\d+ (?:error|warning|NOLINT)")
+    COUNT_PATTERNS = {
+        "errors": re.compile(r"(\d+) error(?:s)*"),
+        "warnings": re.compile(r"(\d+) warning(?:s)* (generated|and)"),
+        "suppressions": re.compile(r"Suppressed (\d+) warnings"),
+        "nolints": re.compile(r"(\d+) NOLINT"),
+    }
+
+    def __init__(self):
+        self.counts = {}
+
+    def feed(self, line):
+        """Processes the next line, only the first match of each pattern counts."""
+        if len(self.counts) == len(self.COUNT_PATTERNS) or not self.SUMMARY_LINE_PATTERN.search(line):
+            return
+        for name, pattern in self.COUNT_PATTERNS.items():
+            if name not in self.counts:
+                results = pattern.search(line)
+                if results:
+                    self.counts[name] = int(results.groups()[0])
+
+    @property
+    def tidy_findings(self):
+        """The findings of all lines fed so far."""
+        errors_count = self.counts.get("errors", 0)
+        warnings_count = self.counts.get("warnings", 0)
+        suppressions_count = self.counts.get("suppressions", 0)
+        nolint_count = self.counts.get("nolints", 0)
+        counting = errors_count + warnings_count - suppressions_count + nolint_count
+
+        return common.TidyFindings(errors_count, warnings_count, suppressions_count, nolint_count, counting)
+
+
 def check_output(output):
     """Parse outpout from clang-tidy for judgment of pass/fail."""
-    errors_count = get_result_count(r"(\d+) error(?:s)*", output)
-    warnings_count = get_result_count(r"(\d+) warning(?:s)* (generated|and)", output)
-    suppressions_count = get_result_count(r"Suppressed (\d+) warnings", output)
-    nolint_count = get_result_count(r"(\d+) NOLINT", output)
-    counting = errors_count + warnings_count - suppressions_count + nolint_count
+    counter = TidyFindingsCounter()
+    for line in output.splitlines():
+        counter.feed(line)
+    return counter.tidy_findings
+
+
+class StreamedResult:
+    """
+    The result of a streamed clang-tidy run. Its output has been spooled while it was produced and is only read
+    back when it is actually needed. The filter reads the stdout line by line, the filtered stdout replaces it.
+    The spools are owned by the result until it is released.
+    """
+
+    def __init__(self, returncode, stdout_spool, stderr_spool, tidy_findings):
+        self.returncode = returncode
+        self.tidy_findings = tidy_findings
+        self._spools = {"stdout": stdout_spool, "stderr": stderr_spool}
+        self._outputs = {}
+
+    def _read(self, name):
+        if name not in self._outputs:
+            self._spools[name].seek(0)
+            self._outputs[name] = self._spools[name].read()
+        return self._outputs[name]
+
+    def stdout_lines(self):
+        """Iterates over the lines of the spooled stdout without reading it back completely."""
+        spool = self._spools["stdout"]
+        spool.seek(0)
+        return iter(spool)
+
+    def release(self):
+        """Reads back the outputs which have not been replaced and closes the spools."""
+        for name, spool in self._spools.items():
+            if not spool.closed:
+                self._read(name)
+                spool.close()
+
+    @property
+    def stdout(self):
+        """The complete stdout, read back from its spool on first access."""
+        return self._read("stdout")
+
+    @stdout.setter
+    def stdout(self, value):
+        self._outputs["stdout"] = value
+
+    @property
+    def stderr(self):
+        """The complete stderr, read back from its spool on first access."""
+        return self._read("stderr")
+
+
+def run_streamed(command, env, timeout=None, memory_limit=None):
+    """
+    Runs clang-tidy while incrementally reading its output. Both pipes are spooled with bounded memory while
+    clang-tidy runs and the findings are counted on the fly from stderr. Raises TimeoutExpired like
+    `subprocess.run`.
+    """
+    counter = TidyFindingsCounter()
+
+    # The spools are closed if the run fails, otherwise they are handed over to the result
+    with contextlib.ExitStack() as spools:
+        stdout_spool = spools.enter_context(
+            tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+", encoding="utf-8")
+        )
+        stderr_spool = spools.enter_context(
+            tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+", encoding="utf-8")
+        )
+
+        with tracing.Popen(
+            command,
+            shell=False,
+            universal_newlines=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        ) as process:
+            limit_memory(process, memory_limit)
+            # The output is read until clang-tidy exits, hence the timeout is enforced by killing it
+            timed_out = threading.Event()
+
+            def kill():
+                timed_out.set()
+                process.kill()
+
+            timer = threading.Timer(timeout, kill) if timeout else None
+            if timer:
+                timer.start()
+            try:
+                # Both pipes are drained concurrently, otherwise a full pipe buffer would block clang-tidy
+                stdout_reader = threading.Thread(target=shutil.copyfileobj, args=(process.stdout, stdout_spool))
+                stdout_reader.start()
+                for line in process.stderr:
+                    stderr_spool.write(line)
+                    counter.feed(line)
+                stdout_reader.join()
+                returncode = process.wait()
+            finally:
+                if timer:
+                    timer.cancel()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(command, timeout)
+
+        spools.pop_all()
+
+    return StreamedResult(returncode, stdout_spool, stderr_spool, counter.tidy_findings)
+
+
+def limit_memory(process, memory_limit):
+    """
+    Limits the address space of a started child process, a no-op if unlimited or unsupported. The limit is set
+    from the parent via `prlimit`, as a `preexec_fn` is not safe while other threads of the runner are running.
+    """
+    if not memory_limit:
+        return
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        resource.prlimit(process.pid, resource.RLIMIT_AS, (memory_limit, memory_limit))
+    except (ImportError, AttributeError):
+        logging.warning("The memory limit of clang-tidy is not supported on this platform")
+    except ProcessLookupError:
+        # The process has already exited
+        pass
+
+
+def run_buffered(command, env, timeout=None, memory_limit=None):
+    """Runs clang-tidy and returns its complete output like `subprocess.run`, raises TimeoutExpired likewise."""
+    with tracing.Popen(
+        command,
+        shell=False,
+        universal_newlines=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    ) as process:
+        limit_memory(process, memory_limit)
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def is_out_of_memory(result):
+    """Returns true if clang-tidy failed since an allocation failed."""
+    return result.returncode != 0 and any(marker in result.stderr for marker in OUT_OF_MEMORY_MARKERS)
 
-    return common.TidyFindings(errors_count, warnings_count, suppressions_count, nolint_count, counting)
+
+def log_unfiltered_output(result):
+    """Logs the unfiltered output for debugging, only called in verbose mode since this is costly for large outputs."""
+    stderr_lines = result.stderr.split(os.linesep)
+    stdout_lines = result.stdout.split(os.linesep)
+    logging.debug(f"Unfiltered stderr has {len(stderr_lines)} line(s)")
+    logging.debug(f"Unfiltered stdout has {len(stdout_lines)} line(s)")
+    logging.debug(f"Unfiltered stderr:\n{stderr_lines}")
+    logging.debug(f"Unfiltered stdout:\n{stdout_lines}")
 
 
 def patch_protobuf_include(arguments):
@@ -67,14 +288,20 @@ def patch_protobuf_include(arguments):
     return filtered_arguments
 
 
-def prepare_compile_commands_args(arguments, src_file, compile_commands_file):
-    """Prepare arguments for compile_commands.json"""
+def get_compile_arguments(arguments):
+    """Splits the arguments passed by the aspect into the compile command of the translation unit."""
     filtered_arguments = patch_protobuf_include(arguments)
     processed_arguments = escape_quotes(filtered_arguments)
 
     compile_commands_args = []
     for splitted_arg in processed_arguments.split(";"):
         compile_commands_args.append(splitted_arg)
+    return compile_commands_args
+
+
+def prepare_compile_commands_args(arguments, src_file, compile_commands_file):
+    """Prepare arguments for compile_commands.json"""
+    compile_commands_args = get_compile_arguments(arguments)
 
     compile_commands_file_path = os.path.dirname(os.path.abspath(compile_commands_file))
 
@@ -84,7 +311,9 @@ def prepare_compile_commands_args(arguments, src_file, compile_commands_file):
         "arguments": compile_commands_args,
     }
 
-    with open(compile_commands_file, "w", encoding="utf-8") as compile_commands_file_handle:
+    with tracing.phase("compile_commands write"), open(
+        compile_commands_file, "w", encoding="utf-8"
+    ) as compile_commands_file_handle:
         json.dump([content], compile_commands_file_handle, indent=4)
 
     logging.debug(f"Compile Commands file content:\n{colored(content, 'magenta')}")
@@ -104,6 +333,8 @@ def build_command(  # pylint: disable=too-many-arguments,too-many-locals
     system_headers,
     treat_clang_tidy_warnings_as_errors,
     allow_enabling_analyzer_alpha_checkers,
+    check_profile_dir=None,
+    line_filter=None,
 ):
     """Prepare a valid call to the clang-tidy binary."""
     commands = []
@@ -123,6 +354,10 @@ def build_command(  # pylint: disable=too-many-arguments,too-many-locals
     if system_headers:
         commands.append("--system-headers")
 
+    # Restricts the findings to the changed lines, clang-tidy still analyzes the whole translation unit
+    if line_filter:
+        commands.extend(["--line-filter", line_filter])
+
     # Exports a fixes file when this attribute (via rule only) is active
     if fixes:
         commands.extend(["--export-fixes", fixes])
@@ -146,6 +381,10 @@ def build_command(  # pylint: disable=too-many-arguments,too-many-locals
             ]
         )
 
+    # Stores the time spent per check, the runner moves it to the declared check profile afterwards
+    if check_profile_dir:
+        commands.extend(clang_tidy_check_profile.get_flags(check_profile_dir))
+
     commands.append("--use-color")
     commands.append(src_file)
 
@@ -178,15 +417,7 @@ def write_results(findings, src_file, arguments, checks, command, result):  # py
 
 def print_version_info(clang_tidy_bin_path):
     """Prints version info of the used clang tidy binary."""
-    result = subprocess.run(
-        [clang_tidy_bin_path, "--version"],
-        shell=False,
-        check=False,
-        universal_newlines=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-    logging.debug(f"LLVM Version:\n{colored(result.stdout, 'blue')}")
+    logging.debug(f"LLVM Version:\n{colored(clang_tidy_probe.get_version(clang_tidy_bin_path), 'blue')}")
 
 
 def run_clang_tidy(  # pylint: disable=too-many-arguments,too-many-locals
@@ -204,26 +435,41 @@ def run_clang_tidy(  # pylint: disable=too-many-arguments,too-many-locals
     suppress_patterns,
     verbose,
     allow_enabling_analyzer_alpha_checkers,
+    merged_config_file=None,
+    stream_output=False,
+    result_cache=None,
+    foreign_headers=None,
+    check_profile=None,
+    resource_limits=None,
+    changed_lines=None,
+    findings=None,
+    suppression_stats=None,
 ):
     """Build the clang-tidy command, execute via subprocess and present results."""
 
-    custom_option_dict = {"key": "ModuleType", "value": module_type} if module_type else {}
+    if changed_lines is not None and not changed_lines.is_affected(src_file):
+        return report_unchanged(src_file, fixes, check_profile, findings, suppression_stats, suppress_patterns)
 
-    configs = []
-    for config_name in config_files:
-        _, config = load_configuration(config_name, custom_option_dict)
-        configs.append(config)
+    if merged_config_file:
+        # The configs have already been merged by a dedicated action, only load it on demand for filtering
+        config_file = Path(merged_config_file)
+        merged_config = None
+    else:
+        custom_option_dict = get_custom_option_dict(module_type)
 
-    try:
-        merged_config = clang_tidy_configs.merge_configs(configs)
-    except common.ConfigException:
-        sys.exit(1)
+        configs = []
+        for config_name in config_files:
+            _, config = load_configuration(config_name, custom_option_dict)
+            configs.append(config)
 
-    yaml = ruamel.yaml.YAML(typ="rt")
+        with tracing.phase("merge_configs", configs=len(configs)):
+            try:
+                merged_config = clang_tidy_configs.merge_configs(configs)
+            except common.ConfigException:
+                sys.exit(1)
 
-    config_file = Path(".clang-tidy-merged")
-    with open(config_file, mode="w", encoding="utf-8") as config_file_handle:
-        yaml.dump(merged_config, config_file_handle)
+            config_file = get_merged_config_path(compile_commands_file)
+            write_configuration(merged_config, config_file)
 
     logging.debug(f"Config file located in {colored(config_file.resolve(), 'yellow')}")
 
@@ -238,7 +484,8 @@ def run_clang_tidy(  # pylint: disable=too-many-arguments,too-many-locals
     if os_name == "nt":
         env.update({"PROGRAMDATA": "C:\\ProgramData", "SYSTEMROOT": "C:\\WINDOWS", "WINDIR": "C:\\WINDOWS"})
 
-    print_version_info(clang_tidy_bin_path)
+    if verbose:
+        print_version_info(clang_tidy_bin_path)
 
     # The config file is present as a runfile data attribute, read it
     command = build_command(
@@ -253,6 +500,8 @@ def run_clang_tidy(  # pylint: disable=too-many-arguments,too-many-locals
         system_headers,
         treat_clang_tidy_warnings_as_errors,
         allow_enabling_analyzer_alpha_checkers,
+        get_check_profile_dir(check_profile),
+        changed_lines.get_line_filter(src_file) if changed_lines is not None else None,
     )
 
     if verbose:
@@ -263,35 +512,79 @@ def run_clang_tidy(  # pylint: disable=too-many-arguments,too-many-locals
     if fixes:
         with open(fixes, mode="w", encoding="utf-8") as the_output:
             the_output.write(common.NO_FIXES_REQUIRED)
-
-    # The actual clang-tidy invocation returning information via stdout and stderr
-    result = subprocess.run(
-        command,
-        shell=False,
-        check=False,
-        universal_newlines=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env=env,
-    )
-
-    logging.debug(f"Unfiltered stderr has {len(result.stderr.split(os.linesep))} line(s)")
-    logging.debug(f"Unfiltered stdout has {len(result.stdout.split(os.linesep))} line(s)")
-    logging.debug(f"Unfiltered stderr:\n{result.stderr.split(os.linesep)}")
-    logging.debug(f"Unfiltered stdout:\n{result.stdout.split(os.linesep)}")
-
-    # Parse the clang-tidy stderr to obtain meta info
-    tidy_findings = check_output(result.stderr)
-    logging.debug(f"Unfiltered result: {tidy_findings}")
-
-    # Filter result and assign it to the "normal" stdout, only if active and a fixes file is provided
-    # It is still possible to use the vanilla clang-tidy results
-    if common.SHALL_USE_FILTER and fixes:
-        logging.debug("Using warnings filter")
-        tidy_findings = filter_results(result, fixes, tidy_findings, merged_config, suppress_patterns)
-        no_tidy_findings = tidy_findings.counting == 0
+    if findings:
+        clang_tidy_findings.write(findings, [])
+    if suppression_stats:
+        clang_tidy_suppressions.write_stats(suppression_stats, suppress_patterns, {}, 0)
+
+    cache_key = None
+    cache_entry = None
+    if result_cache:
+        with tracing.phase("result cache lookup"):
+            cache_key = clang_tidy_result_cache.get_cache_key(
+                result_cache.preprocessor,
+                get_compile_arguments(clang_tidy_args),
+                src_file,
+                command,
+                config_file,
+                clang_tidy_bin_path,
+                foreign_headers,
+                suppress_patterns,
+            )
+            if cache_key:
+                cache_entry = clang_tidy_result_cache.load(result_cache.directory, cache_key)
+            # Entries stored without findings or suppression stats cannot restore them
+            if cache_entry and findings and cache_entry.findings is None:
+                cache_entry = None
+            if cache_entry and suppression_stats and cache_entry.suppression_stats is None:
+                cache_entry = None
+
+    if cache_entry:
+        logging.debug(f"Replaying the cached clang-tidy result {cache_key}")
+        result, tidy_findings, no_tidy_findings = clang_tidy_result_cache.replay(
+            cache_entry, fixes, findings, suppression_stats
+        )
     else:
-        no_tidy_findings = has_no_problem(tidy_findings, result.returncode)
+        try:
+            result, tidy_findings, no_tidy_findings = analyze(
+                command,
+                env,
+                fixes,
+                config_file,
+                merged_config,
+                suppress_patterns,
+                verbose,
+                stream_output,
+                foreign_headers,
+                resource_limits,
+                changed_lines,
+                findings,
+                suppression_stats,
+            )
+        except AnalysisAborted as aborted:
+            if check_profile:
+                clang_tidy_check_profile.collect(get_check_profile_dir(check_profile), check_profile, src_file)
+            return report_aborted(
+                src_file,
+                fixes,
+                aborted.reason,
+                treat_clang_tidy_warnings_as_errors,
+                findings,
+                suppression_stats,
+                suppress_patterns,
+            )
+        if cache_key and not has_internal_problem(result):
+            clang_tidy_result_cache.store(
+                result_cache.directory,
+                cache_key,
+                clang_tidy_result_cache.make_entry(
+                    result, fixes, tidy_findings, no_tidy_findings, findings, suppression_stats
+                ),
+                result_cache.max_size,
+            )
+
+    if check_profile:
+        clang_tidy_check_profile.collect(get_check_profile_dir(check_profile), check_profile, src_file)
 
     no_tidy_errors = tidy_findings.errors == 0
 
@@ -305,21 +598,164 @@ def run_clang_tidy(  # pylint: disable=too-many-arguments,too-many-locals
         # Report the clang-tidy checker output to the caller if there's any finding
         present_output(tidy_findings, result)
 
-    # Clang-Tidy returns a non-zero exit code when there has been an internal problem, or when there was
-    # at least one clang-tidy error. The filtering of clang-tidy findings in
-    # a post-processing step would allow for a succeeding check even though clang-tidy exits with non-zero.
-    # Therefore, we exclude the error matching pattern `(\d+) (warning|error)(?:s)*` from clang-tidy's internal
-    # problem
-    if result.returncode != 0:
-        if re.match(r"(\d+) (warning|error)(?:s)*", result.stderr):
-            return is_success
+    if has_internal_problem(result):
         logging.error(result.stderr)
         return False
 
     return is_success
 
 
-def filter_results(result, fixes, tidy_findings, merged_config, suppress_patterns):
+def report_unchanged(  # pylint: disable=too-many-arguments
+    src_file, fixes, check_profile, findings, suppression_stats=None, suppress_patterns=None
+):
+    """Skips a translation unit which cannot see any changed line, its outputs are written as if there was no finding."""
+    logging.debug(f"Skipping {src_file}, neither it nor any header has changed lines")
+    if fixes:
+        with open(fixes, mode="w", encoding="utf-8") as fixes_file:
+            fixes_file.write(common.NO_FIXES_REQUIRED)
+    if findings:
+        clang_tidy_findings.write(findings, [])
+    if suppression_stats:
+        clang_tidy_suppressions.write_stats(suppression_stats, suppress_patterns, {}, 0)
+    if check_profile:
+        clang_tidy_check_profile.collect(get_check_profile_dir(check_profile), check_profile, src_file)
+    return True
+
+
+def report_aborted(  # pylint: disable=too-many-arguments
+    src_file,
+    fixes,
+    reason,
+    treat_clang_tidy_warnings_as_errors,
+    findings=None,
+    suppression_stats=None,
+    suppress_patterns=None,
+):
+    """
+    Marks the translation unit as aborted in its fixes file, its findings and its suppression statistics. The
+    contents only depend on the reason, such that bazel caches the verdict instead of re-running the analysis.
+    Fails only if warnings are errors.
+    """
+    message = common.ANALYSIS_ABORTED.format(reason=reason)
+    if fixes:
+        with open(fixes, mode="w", encoding="utf-8") as fixes_file:
+            fixes_file.write(message)
+    if findings:
+        clang_tidy_findings.write(findings, [clang_tidy_findings.to_aborted_record(src_file, reason)])
+    if suppression_stats:
+        clang_tidy_suppressions.write_stats(suppression_stats, suppress_patterns, {}, 0, aborted=reason)
+
+    logging.warning(colored(f"The analysis of {src_file} was aborted: {reason}", "yellow"))
+    return not treat_clang_tidy_warnings_as_errors
+
+
+def get_check_profile_dir(check_profile):
+    """
+    Returns the directory clang-tidy stores the check profile in, None if not profiling. It is derived from
+    the declared check profile to keep the command, and thus the result cache key, stable.
+    """
+    if not check_profile:
+        return None
+    return f"{check_profile}.d"
+
+
+def has_internal_problem(result):
+    """
+    Clang-Tidy returns a non-zero exit code when there has been an internal problem, or when there was
+    at least one clang-tidy error. The filtering of clang-tidy findings in
+    a post-processing step would allow for a succeeding check even though clang-tidy exits with non-zero.
+    Therefore, we exclude a stderr starting with the number of warnings or errors from clang-tidy's internal
+    problem
+    """
+    return result.returncode != 0 and not re.match(r"(\d+) (warning|error)(?:s)*", result.stderr)
+
+
+def analyze(  # pylint: disable=too-many-arguments,too-many-locals
+    command,
+    env,
+    fixes,
+    config_file,
+    merged_config,
+    suppress_patterns,
+    verbose,
+    stream_output,
+    foreign_headers=None,
+    resource_limits=None,
+    changed_lines=None,
+    findings=None,
+    suppression_stats=None,
+):
+    """
+    Runs clang-tidy and filters its findings, returns the result, its findings and whether there are none.
+    Raises AnalysisAborted if clang-tidy exceeds one of the resource limits.
+    """
+    resource_limits = resource_limits or ResourceLimits(timeout=None, memory_limit=None)
+
+    # The actual clang-tidy invocation returning information via stdout and stderr
+    with tracing.phase("clang-tidy"):
+        try:
+            if stream_output:
+                result = run_streamed(command, env, resource_limits.timeout, resource_limits.memory_limit)
+                tidy_findings = result.tidy_findings
+            else:
+                result = run_buffered(command, env, resource_limits.timeout, resource_limits.memory_limit)
+                # Parse the clang-tidy stderr to obtain meta info
+                tidy_findings = check_output(result.stderr)
+        except subprocess.TimeoutExpired as timeout_expired:
+            raise AnalysisAborted(
+                f"clang-tidy exceeded the time limit of {resource_limits.timeout} second(s)"
+            ) from timeout_expired
+
+    # The spools of a streamed run are closed once the findings have been filtered
+    try:
+        if resource_limits.memory_limit and is_out_of_memory(result):
+            raise AnalysisAborted(
+                f"clang-tidy exceeded the memory limit of {resource_limits.memory_limit // (1024 * 1024)} MiB"
+            )
+
+        if verbose:
+            log_unfiltered_output(result)
+        logging.debug(f"Unfiltered result: {tidy_findings}")
+
+        # Filter result and assign it to the "normal" stdout, only if active and a fixes file is provided
+        # It is still possible to use the vanilla clang-tidy results
+        if common.SHALL_USE_FILTER and fixes:
+            logging.debug("Using warnings filter")
+            if merged_config is None and not suppress_patterns:
+                merged_config = clang_tidy_result_filter.read_config_file(config_file)
+            with tracing.phase("filter_stdout"):
+                tidy_findings = filter_results(
+                    result,
+                    fixes,
+                    tidy_findings,
+                    merged_config,
+                    suppress_patterns,
+                    foreign_headers,
+                    changed_lines,
+                    findings,
+                    suppression_stats,
+                )
+            no_tidy_findings = tidy_findings.counting == 0
+        else:
+            no_tidy_findings = has_no_problem(tidy_findings, result.returncode)
+    finally:
+        if isinstance(result, StreamedResult):
+            result.release()
+
+    return result, tidy_findings, no_tidy_findings
+
+
+def filter_results(  # pylint: disable=too-many-arguments
+    result,
+    fixes,
+    tidy_findings,
+    merged_config,
+    suppress_patterns,
+    foreign_headers=None,
+    changed_lines=None,
+    findings=None,
+    suppression_stats=None,
+):
     """Calls the filter module and returns a updated result set."""
     if suppress_patterns:
         logging.info("filtering findings by pattern")
@@ -327,8 +763,17 @@ def filter_results(result, fixes, tidy_findings, merged_config, suppress_pattern
     else:
         config_path_or_pattens = merged_config
 
+    # A streamed stdout is split into findings while it is read from its spool
+    stdout = result.stdout_lines() if isinstance(result, StreamedResult) else result.stdout
     filtered_results, tidy_filtered_findings = clang_tidy_result_filter.filter_stdout(
-        result.stdout, config_path_or_pattens, fixes, uses_color=True
+        stdout,
+        config_path_or_pattens,
+        fixes,
+        uses_color=True,
+        foreign_headers=foreign_headers,
+        changed_lines=changed_lines,
+        findings_path=findings,
+        suppression_stats_path=suppression_stats,
     )
     if not tidy_filtered_findings:
         tidy_filtered_findings = tidy_findings
@@ -415,9 +860,52 @@ def present_summary(src_file, tidy_findings, findings):
     logging.info(f"For detailed logs see {colored(f'$(bazel info workspace)/{findings}', attrs=['underline'])}")
 
 
+def get_merged_config_path(compile_commands_file):
+    """
+    Returns the location of the merged config. It lives next to the compile commands file so that
+    concurrent runs within one (persistent worker) process do not overwrite each other's config.
+    """
+    if compile_commands_file:
+        return Path(compile_commands_file).parent / ".clang-tidy-merged"
+    return Path(".clang-tidy-merged")
+
+
+# Basename index of the files below a root directory, kept for the lifetime of the (worker) process
+_RUNFILES_INDEX_CACHE = {}
+
+
+def get_runfiles_index(root):
+    """
+    Returns an index of all files below the given root by their basename. Prefers the runfiles manifest
+    over walking the tree. The index is built once per process, so any further lookup is O(1).
+    """
+    if root not in _RUNFILES_INDEX_CACHE:
+        index = {}
+        manifest_file = os.environ.get("RUNFILES_MANIFEST_FILE")
+        if manifest_file and os.path.isfile(manifest_file):
+            with open(manifest_file, encoding="utf-8") as manifest:
+                for line in manifest:
+                    rlocation, _, path = line.rstrip("\n").partition(" ")
+                    if path:
+                        index.setdefault(os.path.basename(rlocation), []).append(path)
+        else:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    index.setdefault(filename, []).append(os.path.relpath(os.path.join(dirpath, filename), root))
+        _RUNFILES_INDEX_CACHE[root] = index
+    return _RUNFILES_INDEX_CACHE[root]
+
+
 def find_clang_tidy_config(config_name):
-    """Searches .clang-tidy file assuming it is part of the runfiles directory."""
-    config_files = glob.glob(f"**/{config_name}", recursive=True)
+    """
+    Locates a .clang-tidy file. The aspect passes the path of the config file, a bare file name is
+    looked up in the index of the runfiles directory.
+    """
+    if os.path.isfile(config_name):
+        return config_name
+
+    config_files = get_runfiles_index(os.getcwd()).get(os.path.basename(config_name), [])
     logging.debug(f"Found these config files {config_files}")
 
     if len(config_files) == 0:
@@ -439,28 +927,57 @@ def add_custom_config_values(yaml_config, custom_option_dict):
             yaml_config["CheckOptions"] = [custom_option_dict]
 
 
-def load_configuration(config_name, custom_option_dict):
-    """
-    Reads and pre-processes the config file used as a command line
-    "--config" argument for clang-tidy.
-    """
-    # Find the .clang-tidy file in the current runfiles directory
-    config_file_location = find_clang_tidy_config(config_name)
+def get_custom_option_dict(module_type):
+    """Returns the custom ModuleType option which is added to every config, if any."""
+    return {"key": "ModuleType", "value": module_type} if module_type else {}
+
+
+def read_configuration(config_file_location, custom_option_dict):
+    """Reads a config file from the given location and patches it with custom values."""
+    import ruamel.yaml  # pylint: disable=import-outside-toplevel
 
     with open(config_file_location, encoding="utf-8") as config_file:
         config = config_file.read()
         yaml = ruamel.yaml.YAML(typ="rt")
         yaml_config = yaml.load(config)
         add_custom_config_values(yaml_config, custom_option_dict)
+    return yaml_config
+
+
+def write_configuration(config, config_file_location):
+    """Writes a (merged) config to the given location."""
+    import ruamel.yaml  # pylint: disable=import-outside-toplevel
 
     yaml = ruamel.yaml.YAML(typ="rt")
-    stream = ruamel.yaml.compat.StringIO()
-    yaml.dump(yaml_config, stream)
+    with open(config_file_location, mode="w", encoding="utf-8") as config_file_handle:
+        yaml.dump(config, config_file_handle)
+
+
+def load_configuration(config_name, custom_option_dict):
+    """
+    Reads and pre-processes the config file used as a command line
+    "--config" argument for clang-tidy.
+    """
+    import ruamel.yaml  # pylint: disable=import-outside-toplevel
+
+    # Find the .clang-tidy file in the current runfiles directory
+    with tracing.phase("config lookup", config=config_name):
+        config_file_location = find_clang_tidy_config(config_name)
+
+    with tracing.phase("yaml load", config=config_name):
+        yaml_config = read_configuration(config_file_location, custom_option_dict)
+
+        yaml = ruamel.yaml.YAML(typ="rt")
+        stream = ruamel.yaml.compat.StringIO()
+        yaml.dump(yaml_config, stream)
     return stream.getvalue(), yaml_config
 
 
-def parse_args():
-    """Parses arguments."""
+def parse_args(argv=None, parser_class=argparse.ArgumentParser):
+    """
+    Parses arguments, either from the command line or from a persistent worker request. The parser class of a
+    work request raises its errors instead of exiting.
+    """
 
     class ExtendAction(argparse.Action):  # pylint: disable=too-few-public-methods
         """Adds action "extend" for backwards compatibility with python 3.7"""
@@ -470,25 +987,68 @@ def parse_args():
             items.extend(values)
             setattr(namespace, self.dest, items)
 
-    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser = parser_class(fromfile_prefix_chars="@")
     parser.register("action", "extend", ExtendAction)
 
     parser.add_argument(
         "--src_file",
         type=str,
-        help="A comma separated list of src files.",
+        action="append",
+        help="The src file to analyze, may be given multiple times.",
         required=True,
     )
     parser.add_argument(
         "--arguments",
         type=str,
-        help="A comma separated list of compiler arguments per file.",
+        action="append",
+        help="A semicolon separated list of compiler arguments, once per src file.",
         required=False,
     )
     parser.add_argument(
         "--compile_commands_file",
         type=str,
-        help="A compile_commands.json file to pack compile command per file.",
+        action="append",
+        help="A compile_commands.json file to pack compile command, once per src file.",
+        required=False,
+    )
+    parser.add_argument(
+        "--foreign_headers",
+        type=str,
+        action="append",
+        help=(
+            "A semicolon separated list of headers owned by other translation units or targets, once per src file. "
+            "Their findings are dropped, the owner reports them."
+        ),
+        required=False,
+    )
+    parser.add_argument(
+        "--dependency_headers_file",
+        type=str,
+        help=(
+            "A file listing the headers reported by the dependencies, one per line. They are foreign headers of "
+            "every src file."
+        ),
+        required=False,
+    )
+    parser.add_argument(
+        "--check_profile",
+        type=str,
+        action="append",
+        help="Path where the time spent per check is stored as JSON, once per src file.",
+        required=False,
+    )
+    parser.add_argument(
+        "--findings",
+        type=str,
+        action="append",
+        help="Path where the filtered findings are written as JSON lines, once per src file.",
+        required=False,
+    )
+    parser.add_argument(
+        "--suppression_stats",
+        type=str,
+        action="append",
+        help="Path where the hits per suppress pattern are written as JSON, once per src file.",
         required=False,
     )
     parser.add_argument(
@@ -500,7 +1060,8 @@ def parse_args():
     parser.add_argument(
         "--fixes",
         type=str,
-        help="Absolute file path where the fixes.yaml is created.",
+        action="append",
+        help="Absolute file path where the fixes.yaml is created, once per src file.",
         required=True,
     )
     parser.add_argument(
@@ -525,11 +1086,17 @@ def parse_args():
     parser.add_argument(
         "--config_file",
         help="The name of the clang-tidy config file.",
-        required=True,
+        required=False,
         action="extend",
         dest="config_files",
         nargs="+",
     )
+    parser.add_argument(
+        "--merged_config_file",
+        type=str,
+        help="Path to an already merged clang-tidy config file, replaces any --config_file.",
+        required=False,
+    )
     parser.add_argument(
         "--header_filter",
         type=str,
@@ -570,14 +1137,110 @@ def parse_args():
         default=False,
         help="If true, the tool will be able to enable clang analyzer alpha checkers.",
     )
-    args = parser.parse_args()
-    return args
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Maximum number of concurrent clang-tidy processes when analyzing multiple src files.",
+        required=False,
+    )
+    parser.add_argument(
+        "--stream_output",
+        action="store_true",
+        default=False,
+        help=(
+            "If true, the clang-tidy output is read incrementally and spooled instead of being held in memory "
+            "while clang-tidy runs. Filtering still reads the complete stdout back into memory."
+        ),
+    )
+    parser.add_argument(
+        "--result_cache_dir",
+        type=str,
+        help="Directory of a local result cache keyed on the preprocessed translation unit, may be shared.",
+        required=False,
+    )
+    parser.add_argument(
+        "--result_cache_max_size_mb",
+        type=int,
+        default=1024,
+        help="Size of the result cache in MiB beyond which the least recently used entries are evicted.",
+    )
+    parser.add_argument(
+        "--trace_file",
+        type=str,
+        help="Path of a Chrome trace recording the phases of the runner and the resource usage of clang-tidy.",
+        required=False,
+    )
+    parser.add_argument(
+        "--changed_lines",
+        type=str,
+        help=(
+            "A unified diff or a JSON file mapping files to line ranges. Only findings on changed lines are "
+            "reported, src files without any changed line are skipped."
+        ),
+        required=False,
+    )
+    parser.add_argument(
+        "--timeout_seconds",
+        type=int,
+        help="Wall clock limit of clang-tidy per src file, the analysis is aborted beyond it.",
+        required=False,
+    )
+    parser.add_argument(
+        "--memory_limit_mb",
+        type=int,
+        help="Address space limit of clang-tidy per src file in MiB, the analysis is aborted beyond it.",
+        required=False,
+    )
+    parser.add_argument(
+        "--unused_inputs_list",
+        type=str,
+        help="Path of the list of inputs which are not included by any of the translation units.",
+        required=False,
+    )
+    parser.add_argument(
+        "--prunable_inputs",
+        type=str,
+        action="extend",
+        nargs="+",
+        default=[],
+        help="Inputs which are reported in the unused inputs list unless a translation unit includes them.",
+        required=False,
+    )
+    parser.add_argument(
+        "--preprocessor",
+        type=str,
+        help="Compiler used to preprocess the translation unit for the result cache and the include scanning.",
+        required=False,
+    )
+    args = parser.parse_args(argv)
+
+    if not args.config_files and not args.merged_config_file:
+        parser.error("Either --config_file or --merged_config_file is required")
+
+    if args.result_cache_dir and not args.preprocessor:
+        parser.error("--result_cache_dir requires --preprocessor")
+
+    if args.unused_inputs_list and not args.preprocessor:
+        parser.error("--unused_inputs_list requires --preprocessor")
+
+    for per_file_argument in [
+        "arguments",
+        "compile_commands_file",
+        "fixes",
+        "foreign_headers",
+        "check_profile",
+        "findings",
+        "suppression_stats",
+    ]:
+        values = getattr(args, per_file_argument)
+        if values and len(values) != len(args.src_file):
+            parser.error(f"--{per_file_argument} must be given exactly once per --src_file")
 
+    return args
 
-def main():
-    """Main entry point."""
-    args = parse_args()
 
+def get_log_level(args):
+    """Determines the log level from the parsed arguments."""
     log_level = common.DEFAULT_LOG_LEVEL
 
     if args.silent:
@@ -585,28 +1248,152 @@ def main():
     if args.verbose:
         log_level = common.VERBOSE_LOG_LEVEL
 
-    logging.basicConfig(
-        level=log_level,
-        format="%(levelname)s: %(message)s",
-    )
-
-    success = run_clang_tidy(
-        args.src_file,
-        args.arguments,
-        args.compile_commands_file,
-        args.checks,
-        args.fixes,
-        args.tool_bin,
-        args.treat_clang_tidy_warnings_as_errors,
-        args.module_type,
-        args.config_files,
-        args.header_filter,
-        args.system_headers,
-        args.suppress_patterns,
-        args.verbose,
-        args.allow_enabling_analyzer_alpha_checkers,
+    return log_level
+
+
+def get_translation_units(args):
+    """Combines the per src file arguments into translation units."""
+    translation_units = []
+    dependency_headers = get_dependency_headers(args)
+    for index, src_file in enumerate(args.src_file):
+        translation_units.append(
+            common.TranslationUnit(
+                src_file=src_file,
+                arguments=args.arguments[index] if args.arguments else None,
+                compile_commands_file=args.compile_commands_file[index] if args.compile_commands_file else None,
+                fixes=args.fixes[index],
+                foreign_headers=get_foreign_headers(args, index, dependency_headers),
+                check_profile=args.check_profile[index] if args.check_profile else None,
+                findings=args.findings[index] if args.findings else None,
+                suppression_stats=args.suppression_stats[index] if args.suppression_stats else None,
+            )
+        )
+    return translation_units
+
+
+def get_dependency_headers(args):
+    """Reads the headers reported by the dependencies, shared by all src files."""
+    if not args.dependency_headers_file:
+        return []
+    with open(args.dependency_headers_file, encoding="utf-8") as dependency_headers_file:
+        return [line.rstrip("\n") for line in dependency_headers_file if line.strip()]
+
+
+def get_foreign_headers(args, index, dependency_headers=()):
+    """Returns the foreign headers of the src file at the given index, None if header ownership is not used."""
+    if not args.foreign_headers and not dependency_headers:
+        return None
+    sibling_headers = args.foreign_headers[index].split(";") if args.foreign_headers else []
+    return [foreign_header for foreign_header in sibling_headers if foreign_header] + list(dependency_headers)
+
+
+def run_translation_unit(args, translation_unit, tracer=None):
+    """Runs clang-tidy on a single translation unit, its phases are recorded by the tracer if given."""
+    with tracing.activated(tracer), tracing.phase("run_clang_tidy", src_file=translation_unit.src_file):
+        return run_clang_tidy(
+            translation_unit.src_file,
+            translation_unit.arguments,
+            translation_unit.compile_commands_file,
+            args.checks,
+            translation_unit.fixes,
+            args.tool_bin,
+            args.treat_clang_tidy_warnings_as_errors,
+            args.module_type,
+            args.config_files,
+            args.header_filter,
+            args.system_headers,
+            args.suppress_patterns,
+            args.verbose,
+            args.allow_enabling_analyzer_alpha_checkers,
+            args.merged_config_file,
+            args.stream_output,
+            get_result_cache(args),
+            translation_unit.foreign_headers,
+            translation_unit.check_profile,
+            get_resource_limits(args),
+            get_changed_lines(args),
+            translation_unit.findings,
+            translation_unit.suppression_stats,
+        )
+
+
+def get_resource_limits(args):
+    """Returns the resource limits of each clang-tidy run, None if unlimited."""
+    if not args.timeout_seconds and not args.memory_limit_mb:
+        return None
+    return ResourceLimits(
+        timeout=args.timeout_seconds or None,
+        memory_limit=args.memory_limit_mb * 1024 * 1024 if args.memory_limit_mb else None,
+    )
+
+
+def get_changed_lines(args):
+    """Returns the changed lines of the manifest, None if all lines are analyzed."""
+    if not args.changed_lines:
+        return None
+    return clang_tidy_changed_lines.load(args.changed_lines)
+
+
+def get_result_cache(args):
+    """Returns the result cache configuration, None if the result cache is not used."""
+    if not args.result_cache_dir:
+        return None
+    return clang_tidy_result_cache.ResultCacheConfig(
+        directory=args.result_cache_dir,
+        preprocessor=args.preprocessor,
+        max_size=args.result_cache_max_size_mb * 1024 * 1024,
     )
 
+
+def run_translation_units(args, translation_units, tracer=None):
+    """
+    Runs clang-tidy on multiple translation units using a bounded pool. The output of each translation unit is
+    presented en bloc as soon as it is finished, instead of being interleaved with the others.
+    """
+    jobs = min(args.jobs or os.cpu_count() or 1, len(translation_units))
+    log_diverter = common.ThreadLogDiverter()
+
+    root_logger = logging.getLogger()
+    root_logger.addFilter(log_diverter)
+
+    def run_diverted(translation_unit, records):
+        with log_diverter.diverted(records):
+            return run_translation_unit(args, translation_unit, tracer)
+
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {}
+            for translation_unit in translation_units:
+                records = []
+                futures[executor.submit(run_diverted, translation_unit, records)] = records
+
+            for future in as_completed(futures):
+                log_diverter.replay(futures[future])
+                results.append(future.result())
+    finally:
+        root_logger.removeFilter(log_diverter)
+
+    return all(results)
+
+
+def execute(args):
+    """Runs clang-tidy for the parsed arguments and returns the exit code."""
+    translation_units = get_translation_units(args)
+    tracer = tracing.Tracer("clang-tidy runner") if args.trace_file else None
+
+    if len(translation_units) == 1:
+        success = run_translation_unit(args, translation_units[0], tracer)
+    else:
+        success = run_translation_units(args, translation_units, tracer)
+
+    if args.unused_inputs_list:
+        with tracing.activated(tracer), tracing.phase("include scan"):
+            write_unused_inputs(args, translation_units)
+
+    if tracer:
+        tracer.write(args.trace_file)
+
     if success:
         return 0
 
@@ -618,5 +1405,49 @@ def main():
     return 1
 
 
+def write_unused_inputs(args, translation_units):
+    """Reports the prunable inputs which none of the translation units includes to bazel."""
+    unused_inputs = []
+    if all(translation_unit.arguments for translation_unit in translation_units):
+        unused_inputs = clang_tidy_include_scanner.get_unused_inputs(
+            args.preprocessor,
+            [
+                (translation_unit.src_file, get_compile_arguments(translation_unit.arguments))
+                for translation_unit in translation_units
+            ],
+            args.prunable_inputs,
+        )
+    logging.debug(f"{len(unused_inputs)} of {len(args.prunable_inputs)} prunable input(s) are unused")
+    clang_tidy_include_scanner.write_unused_inputs(args.unused_inputs_list, unused_inputs)
+
+
+def process_work_request(arguments):
+    """Executes a single persistent worker request and returns its exit code along with its log output."""
+    args = parse_args(arguments, persistent_worker.ArgumentParser)
+
+    with persistent_worker.captured_logs(get_log_level(args), common.LOG_FORMAT) as log_stream:
+        try:
+            exit_code = execute(args)
+        except SystemExit as system_exit:
+            exit_code = persistent_worker.get_exit_code(system_exit)
+
+    return exit_code, log_stream.getvalue()
+
+
+def main():
+    """Main entry point."""
+    if persistent_worker.is_persistent_worker(sys.argv[1:]):
+        return persistent_worker.run(process_work_request)
+
+    args = parse_args()
+
+    logging.basicConfig(
+        level=get_log_level(args),
+        format=common.LOG_FORMAT,
+    )
+
+    return execute(args)
+
+
 if __name__ == "__main__":  # pragma: no cover
     sys.exit(main())
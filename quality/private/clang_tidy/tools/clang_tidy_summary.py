@@ -0,0 +1,190 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Aggregates the fixes files of a tidy_suite into a text and a structured summary.
+
+The inputs are read from a params file and streamed line by line in a single pass. A diagnostic which has
+already been reported by another fixes file, e.g. one located in a header shared by several translation
+units, is only written once. The structured summary holds the number of findings per check and per file.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from collections import Counter
+
+from quality.private.clang_tidy.tools import common
+
+SUMMARY_HEADER = "Aggregated clang-tidy output\n"
+NO_OUTPUTS = "No outputs have been generated for any target\n"
+ANALYSIS_ABORTED_PREFIX = common.ANALYSIS_ABORTED.partition("{")[0]
+
+# The start of a diagnostic and the fields identifying it, in both the clang-tidy and the filtered layout
+DIAGNOSTIC_START_REGEX = re.compile(r"^\s*- DiagnosticName:\s*(?P<value>.*)$")
+DIAGNOSTIC_FIELD_REGEX = re.compile(r"^\s*(?P<field>Message|FilePath|FileOffset):\s*(?P<value>.*)$")
+DOCUMENT_END = "...\n"
+
+
+def unquote(value):
+    """Returns the plain value of a single line YAML scalar."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+class Diagnostic:
+    """A diagnostic block of a fixes file, identified by its check, message and location."""
+
+    def __init__(self, first_line, check):
+        self.lines = [first_line]
+        self.check = check
+        self.fields = {}
+
+    def add(self, line):
+        """Adds a line of the block, the first occurrence of each field belongs to the diagnostic message."""
+        self.lines.append(line)
+        field = DIAGNOSTIC_FIELD_REGEX.match(line)
+        if field and field.group("field") not in self.fields:
+            self.fields[field.group("field")] = unquote(field.group("value"))
+
+    @property
+    def key(self):
+        """Returns the identity of the diagnostic."""
+        return (self.check, self.file_path, self.fields.get("FileOffset"), self.fields.get("Message"))
+
+    @property
+    def file_path(self):
+        """Returns the file of the diagnostic, None if it has no location."""
+        return self.fields.get("FilePath") or None
+
+
+class Summary:
+    """Aggregates fixes files, writing the text summary while reading."""
+
+    def __init__(self, text_output):
+        self.text_output = text_output
+        self.seen = set()
+        self.duplicates = 0
+        self.per_check = Counter()
+        self.per_file = Counter()
+        self.aborted = []
+
+    def add_fixes_file(self, fixes_path):
+        """Streams a fixes file into the text summary, dropping diagnostics which have already been written."""
+        diagnostic = None
+        with open(fixes_path, encoding="utf-8", errors="replace") as fixes_file:
+            for line in fixes_file:
+                start = DIAGNOSTIC_START_REGEX.match(line)
+                if start:
+                    self.add_diagnostic(diagnostic)
+                    diagnostic = Diagnostic(line, unquote(start.group("value")))
+                elif diagnostic and line != DOCUMENT_END:
+                    diagnostic.add(line)
+                else:
+                    self.add_diagnostic(diagnostic)
+                    diagnostic = None
+                    if line.startswith(ANALYSIS_ABORTED_PREFIX):
+                        self.aborted.append(fixes_path)
+                    self.text_output.write(line)
+        self.add_diagnostic(diagnostic)
+
+    def add_diagnostic(self, diagnostic):
+        """Writes and counts a diagnostic, unless it has been seen before."""
+        if diagnostic is None:
+            return
+        if diagnostic.key in self.seen:
+            self.duplicates += 1
+            return
+        self.seen.add(diagnostic.key)
+        self.per_check[diagnostic.check] += 1
+        self.per_file[diagnostic.file_path or "<unknown>"] += 1
+        self.text_output.writelines(diagnostic.lines)
+
+    def to_dict(self, fixes_files):
+        """Returns the structured summary."""
+        return {
+            "fixes_files": fixes_files,
+            "findings": len(self.seen),
+            "duplicates": self.duplicates,
+            "aborted": self.aborted,
+            "per_check": dict(self.per_check.most_common()),
+            "per_file": dict(sorted(self.per_file.items())),
+        }
+
+
+def aggregate(fixes_paths, text_output):
+    """Writes the text summary of the fixes files and returns the structured summary."""
+    fixes_paths = sorted(set(fixes_paths))
+    text_output.write(SUMMARY_HEADER)
+    text_output.write(
+        f"Aggregating {len(fixes_paths)} result file(s): "
+        f"{','.join(os.path.basename(fixes_path) for fixes_path in fixes_paths)}\n\n"
+    )
+
+    summary = Summary(text_output)
+    for fixes_path in fixes_paths:
+        summary.add_fixes_file(fixes_path)
+
+    if not fixes_paths:
+        text_output.write(NO_OUTPUTS)
+    return summary.to_dict(len(fixes_paths))
+
+
+def parse_args(argv=None):
+    """Parses arguments."""
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser.add_argument(
+        "fixes_files",
+        nargs="*",
+        help="The fixes files of all analyzed translation units.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Path of the text summary.",
+        required=True,
+    )
+    parser.add_argument(
+        "--structured_output",
+        type=str,
+        help="Path of the structured summary, i.e. the number of findings per check and per file as JSON.",
+        required=False,
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=common.DEFAULT_LOG_LEVEL,
+        format=common.LOG_FORMAT,
+    )
+
+    with open(args.output, mode="w", encoding="utf-8") as text_output:
+        structured_summary = aggregate(args.fixes_files, text_output)
+
+    if args.structured_output:
+        with open(args.structured_output, mode="w", encoding="utf-8") as structured_output:
+            json.dump(structured_summary, structured_output, indent=4)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Matches the messages of clang-tidy findings against the `suppress_patterns` and aggregates their hit statistics.
+
+The patterns are compiled once per process. Patterns starting with a literal prefix are looked up in a prefix
+index, such that they are only evaluated for messages starting with their prefix, purely literal patterns are
+not evaluated at all. All other patterns are combined into a single alternation. The runner stores the hits
+per pattern of each translation unit, this tool aggregates them across targets to find dead patterns.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+
+from quality.private.clang_tidy.tools import common
+
+SUPPRESSION_STATS_SUFFIX = ".suppression_stats.json"
+
+# Characters which end the literal prefix of a pattern, quantifiers make the preceding character optional
+SPECIAL_CHARACTERS = frozenset(".^$*+?{}[]\\|()")
+OPTIONAL_QUANTIFIERS = frozenset("*?{")
+
+
+def get_literal_prefix(pattern):
+    """
+    Returns the literal text every match of the pattern starts with, along with whether the pattern consists of
+    this text only. Patterns with an alternation have no prefix.
+    """
+    if "|" in pattern:
+        return "", False
+
+    prefix = []
+    index = 0
+    while index < len(pattern):
+        character = pattern[index]
+        length = 1
+        if character == "\\":
+            # Only escaped punctuation is literal, e.g. `\.`, while `\d` or `\1` are not
+            if index + 1 >= len(pattern) or pattern[index + 1].isalnum():
+                return "".join(prefix), False
+            character = pattern[index + 1]
+            length = 2
+        elif character in SPECIAL_CHARACTERS:
+            if character in OPTIONAL_QUANTIFIERS and prefix:
+                prefix.pop()
+            return "".join(prefix), False
+        prefix.append(character)
+        index += length
+    return "".join(prefix), True
+
+
+class SuppressionPatterns:
+    """The compiled suppression patterns, matching a message against all of them at once."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.prefix_index = defaultdict(list)
+        self.compiled = {}
+        combined = []
+        for index, pattern in enumerate(self.patterns):
+            compiled = re.compile(pattern)
+            prefix, is_literal = get_literal_prefix(pattern)
+            if prefix:
+                self.prefix_index[prefix[0]].append((index, prefix, None if is_literal else compiled))
+            elif compiled.groups == 0:
+                combined.append(index)
+            else:
+                # Groups would be renumbered within an alternation and break backreferences
+                self.compiled[index] = compiled
+
+        self.combined = None
+        if combined:
+            alternation = "|".join(f"(?P<pattern{index}>{self.patterns[index]})" for index in combined)
+            try:
+                self.combined = re.compile(alternation)
+            except re.error:
+                # E.g. global flags within a pattern cannot be combined
+                self.compiled.update({index: re.compile(self.patterns[index]) for index in combined})
+                self.compiled = dict(sorted(self.compiled.items()))
+
+    def match(self, message):
+        """
+        Returns the index of the first pattern matching the start of the message, None if no pattern matches.
+        Like `re.match` applied to each pattern in order, i.e. a message is attributed to a single pattern.
+        """
+        first_match = None
+        if self.combined:
+            match = self.combined.match(message)
+            if match:
+                first_match = int(match.lastgroup[len("pattern") :])
+        for index, compiled in self.compiled.items():
+            if first_match is not None and index > first_match:
+                break
+            if compiled.match(message):
+                first_match = index
+                break
+        for index, prefix, compiled in self.prefix_index.get(message[:1], []):
+            if first_match is not None and index > first_match:
+                break
+            if message.startswith(prefix) and (compiled is None or compiled.match(message)):
+                first_match = index
+                break
+        return first_match
+
+
+@functools.lru_cache(maxsize=None)
+def compile_patterns(patterns):
+    """Compiles the tuple of patterns once per process, shared by all translation units."""
+    return SuppressionPatterns(patterns)
+
+
+def write_stats(suppression_stats, patterns, hits, diagnostics, aborted=None):
+    """
+    Writes the hits per pattern of a translation unit, patterns without hits are listed as well. The reason of
+    an aborted analysis is recorded, as its hits are incomplete.
+    """
+    content = {
+        "diagnostics": diagnostics,
+        "hits": {pattern: hits.get(pattern, 0) for pattern in patterns or []},
+    }
+    if aborted:
+        content["aborted"] = aborted
+    with open(suppression_stats, mode="w", encoding="utf-8") as suppression_stats_file:
+        json.dump(content, suppression_stats_file, indent=4)
+
+
+def find_suppression_stats(paths):
+    """Expands the given files and directories into suppression statistics."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file in files:
+                    if file.endswith(SUPPRESSION_STATS_SUFFIX):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+
+def aggregate(suppression_stats):
+    """Returns the accumulated hits per pattern, the number of diagnostics and the number of statistics."""
+    hits = Counter()
+    diagnostics = 0
+    count = 0
+    for suppression_stats_path in suppression_stats:
+        try:
+            with open(suppression_stats_path, encoding="utf-8") as suppression_stats_file:
+                content = json.load(suppression_stats_file)
+        except (OSError, ValueError) as error:
+            logging.warning(f"Skipping the suppression statistics {suppression_stats_path}: {error}")
+            continue
+
+        if content.get("aborted"):
+            logging.warning(
+                f"The suppression statistics {suppression_stats_path} are incomplete, "
+                f"the analysis was aborted: {content['aborted']}"
+            )
+        count += 1
+        diagnostics += content.get("diagnostics", 0)
+        for pattern, pattern_hits in content.get("hits", {}).items():
+            hits[pattern] += pattern_hits
+    return hits, diagnostics, count
+
+
+def format_report(hits, diagnostics, count):
+    """Formats the hits per pattern, sorted by hits, followed by the patterns without any hit."""
+    dead_patterns = sorted(pattern for pattern, pattern_hits in hits.items() if pattern_hits == 0)
+    lines = [
+        f"Aggregated {count} suppression statistic(s) with {diagnostics} diagnostic(s).",
+        f"{sum(hits.values())} diagnostic(s) suppressed by {len(hits) - len(dead_patterns)} of {len(hits)} "
+        "pattern(s).",
+        "",
+        f"{'Hits':>10}  Pattern",
+    ]
+    for pattern, pattern_hits in sorted(hits.items(), key=lambda item: (-item[1], item[0])):
+        if pattern_hits:
+            lines.append(f"{pattern_hits:10}  {pattern}")
+    lines.extend(["", "Patterns without any hit:"])
+    lines.extend(f"  {pattern}" for pattern in dead_patterns)
+    if not dead_patterns:
+        lines.append("  -")
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv=None):
+    """Parses arguments."""
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help=f"Suppression statistics or directories which are searched for `*{SUPPRESSION_STATS_SUFFIX}` files.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Writes the aggregated hits per pattern as JSON to this path.",
+        required=False,
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=common.DEFAULT_LOG_LEVEL,
+        format=common.LOG_FORMAT,
+    )
+
+    hits, diagnostics, count = aggregate(find_suppression_stats(args.paths))
+    if count == 0:
+        logging.error(f"No suppression statistics found in {args.paths}.")
+        return 1
+
+    sys.stdout.write(format_report(hits, diagnostics, count))
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as output_file:
+            json.dump({"diagnostics": diagnostics, "hits": dict(hits.most_common())}, output_file, indent=4)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
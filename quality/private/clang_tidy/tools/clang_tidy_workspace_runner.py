@@ -0,0 +1,154 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Analyzes a whole workspace compilation database with parallel clang-tidy runs outside of bazel.
+
+The entries of the database are handed to the clang-tidy runner as one batch, such that each translation
+unit is analyzed and filtered exactly like within a clang-tidy action, only without going through the
+action graph. The analysis runs in the directory of the entries, i.e. the execution root.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+
+from quality.private.clang_tidy.tools import clang_tidy_runner, common
+
+
+def select_entries(database, files_regex):
+    """Returns the entries of the database whose source file matches the regex."""
+    pattern = re.compile(files_regex)
+    return [entry for entry in database if pattern.search(entry["file"])]
+
+
+def get_runner_arguments(entries, output_dir, args):
+    """Translates the entries into the arguments of the clang-tidy runner, along with per source outputs."""
+    runner_arguments = [
+        "--tool_bin",
+        args.tool_bin,
+        "--merged_config_file",
+        args.config_file,
+        "--jobs",
+        str(args.jobs),
+    ]
+    for index, entry in enumerate(entries):
+        translation_unit_dir = os.path.join(output_dir, str(index))
+        runner_arguments.extend(
+            [
+                "--src_file",
+                entry["file"],
+                # The first argument is the tool itself, it is replaced by the clang-tidy binary
+                "--arguments",
+                ";".join([args.tool_bin] + entry["arguments"][1:]),
+                "--compile_commands_file",
+                os.path.join(translation_unit_dir, "compile_commands.json"),
+                "--fixes",
+                os.path.join(translation_unit_dir, "fixes.yaml"),
+            ]
+        )
+    if args.header_filter:
+        runner_arguments.extend(["--header_filter", args.header_filter])
+    if args.verbose:
+        runner_arguments.append("--verbose")
+    return runner_arguments
+
+
+def parse_args(argv=None):
+    """Parses arguments."""
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    parser.add_argument(
+        "database",
+        type=str,
+        help="Workspace compilation database, see `clang_tidy_compilation_database`.",
+    )
+    parser.add_argument(
+        "--config_file",
+        type=str,
+        help="The complete clang-tidy config used for all translation units.",
+        required=True,
+    )
+    parser.add_argument(
+        "--tool_bin",
+        type=str,
+        default="clang-tidy",
+        help="Path to the clang-tidy binary.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Maximum number of concurrent clang-tidy processes.",
+    )
+    parser.add_argument(
+        "--files",
+        type=str,
+        default="",
+        help="Regex selecting the analyzed source files, all if not given.",
+    )
+    parser.add_argument(
+        "--header_filter",
+        type=str,
+        help="Regex pattern used to restrict clang-tidy findings from header files.",
+        required=False,
+    )
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        help="Directory of the fixes files and compile commands per source file, a temporary one if not given.",
+        required=False,
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Verbose output.",
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    args.config_file = os.path.abspath(args.config_file)
+    if os.sep in args.tool_bin:
+        args.tool_bin = os.path.abspath(args.tool_bin)
+
+    logging.basicConfig(
+        level=common.VERBOSE_LOG_LEVEL if args.verbose else common.DEFAULT_LOG_LEVEL,
+        format=common.LOG_FORMAT,
+    )
+
+    with open(args.database, encoding="utf-8") as database_file:
+        entries = select_entries(json.load(database_file), args.files)
+    if not entries:
+        logging.error(f"No entries of {args.database} match '{args.files}'.")
+        return 1
+
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        output_dir = os.path.abspath(args.output_dir or temporary_dir)
+        for index in range(len(entries)):
+            os.makedirs(os.path.join(output_dir, str(index)), exist_ok=True)
+
+        # All entries share the execution root, relative paths are resolved against it
+        os.chdir(entries[0]["directory"])
+        logging.info(f"Analyzing {len(entries)} translation unit(s) with {args.jobs} job(s)")
+        runner_args = clang_tidy_runner.parse_args(get_runner_arguments(entries, output_dir, args))
+        return clang_tidy_runner.execute(runner_args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -15,11 +15,19 @@
 Module for common constants and utils.
 """
 
+import contextlib
 import logging
+import threading
 from collections import namedtuple
 
 TidyFindings = namedtuple("TidyFindings", "errors warnings suppressions nolints counting")
 
+TranslationUnit = namedtuple(
+    "TranslationUnit",
+    "src_file arguments compile_commands_file fixes foreign_headers check_profile findings suppression_stats",
+    defaults=(None, None, None, None),
+)
+
 # Controls whether to use a custom warning filter or use the clang-tidy output
 SHALL_USE_FILTER = True
 
@@ -28,8 +36,12 @@ SILENT_LOG_LEVEL = logging.WARNING
 DEFAULT_LOG_LEVEL = logging.INFO
 VERBOSE_LOG_LEVEL = logging.DEBUG
 
+LOG_FORMAT = "%(levelname)s: %(message)s"
+
 NO_FIXES_REQUIRED = "No fix(es) required or possible\n"
 
+ANALYSIS_ABORTED = "Analysis aborted: {reason}\n"
+
 
 class ConfigException(Exception):
     """A config exception class used for validating config merges."""
@@ -37,3 +49,40 @@ class ConfigException(Exception):
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
+
+
+class ThreadLogDiverter(logging.Filter):
+    """
+    A filter for the root logger which diverts the log records of registered threads into lists,
+    so that they can be replayed later on by another thread without being interleaved.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.diverted_records = {}
+
+    def filter(self, record):
+        records = self.diverted_records.get(record.thread)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
+    @contextlib.contextmanager
+    def diverted(self, records):
+        """Diverts all log records of the current thread into `records`."""
+        thread_id = threading.get_ident()
+        self.diverted_records[thread_id] = records
+        try:
+            yield records
+        finally:
+            del self.diverted_records[thread_id]
+
+    @staticmethod
+    def replay(records):
+        """Hands the records to the root logger again, as if they were logged by the current thread."""
+        current_thread = threading.current_thread()
+        for record in records:
+            record.thread = current_thread.ident
+            record.threadName = current_thread.name
+            logging.getLogger().handle(record)
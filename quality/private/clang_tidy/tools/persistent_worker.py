@@ -0,0 +1,205 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Module implementing the bazel persistent worker JSON protocol, including multiplex workers.
+
+See https://bazel.build/remote/persistent and https://bazel.build/remote/multiplex.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import sys
+import threading
+import traceback
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+PERSISTENT_WORKER_FLAG = "--persistent_worker"
+
+# A handler receives the arguments of one work request and returns its exit code and output
+WorkRequestHandler = t.Callable[[t.List[str]], t.Tuple[int, str]]
+
+
+def is_persistent_worker(argv: t.List[str]) -> bool:
+    """Returns true if bazel started the process as a persistent worker."""
+    return PERSISTENT_WORKER_FLAG in argv
+
+
+class WorkRequestError(Exception):
+    """Raised by a handler for an invalid work request, its message is the output of the work response."""
+
+    def __init__(self, message: str, exit_code: int = 1):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    """
+    Parses the arguments of a work request. Its errors are raised as WorkRequestError, instead of printing the
+    usage to the stderr of the worker and exiting.
+    """
+
+    def error(self, message: str) -> t.NoReturn:
+        raise WorkRequestError(f"{self.format_usage()}{self.prog}: error: {message}\n", exit_code=2)
+
+
+class RequestLogLevels:
+    """
+    Keeps the level of the root logger at the lowest level of the work requests in flight, such that records
+    below all of them are not even created. The previous level is restored once no request is in flight.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.levels: t.List[int] = []
+        self.idle_level = logging.NOTSET
+
+    @contextlib.contextmanager
+    def active(self, level: int) -> t.Iterator[None]:
+        """Adds the level of a work request while it is in flight."""
+        root_logger = logging.getLogger()
+        with self.lock:
+            if not self.levels:
+                self.idle_level = root_logger.level
+            self.levels.append(level)
+            root_logger.setLevel(min(self.levels))
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.levels.remove(level)
+                root_logger.setLevel(min(self.levels) if self.levels else self.idle_level)
+
+
+REQUEST_LOG_LEVELS = RequestLogLevels()
+
+
+class ThreadLogHandler(logging.Handler):
+    """A log handler which only records messages emitted by the thread which created it."""
+
+    def __init__(self, stream: io.StringIO, level: int):
+        super().__init__(level)
+        self.thread_id = threading.get_ident()
+        self.stream = stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread != self.thread_id:
+            return
+        self.stream.write(self.format(record) + "\n")
+
+
+@contextlib.contextmanager
+def captured_logs(level: int, log_format: str) -> t.Iterator[io.StringIO]:
+    """Captures all log messages of the current thread, e.g. for the output of a single work request."""
+    stream = io.StringIO()
+    handler = ThreadLogHandler(stream, level)
+    handler.setFormatter(logging.Formatter(log_format))
+
+    root_logger = logging.getLogger()
+    with REQUEST_LOG_LEVELS.active(level):
+        root_logger.addHandler(handler)
+        try:
+            yield stream
+        finally:
+            root_logger.removeHandler(handler)
+
+
+def get_exit_code(system_exit: SystemExit) -> int:
+    """Translates a SystemExit into a process like exit code."""
+    if system_exit.code is None:
+        return 0
+    if isinstance(system_exit.code, int):
+        return system_exit.code
+    return 1
+
+
+def process_request(request: dict, handler: WorkRequestHandler) -> dict:
+    """Runs the handler for a single work request and builds the corresponding work response."""
+    request_id = request.get("requestId", 0)
+
+    if request.get("sandboxDir"):
+        return {
+            "exitCode": 1,
+            "output": "Multiplex sandboxing is not supported by this worker.\n",
+            "requestId": request_id,
+        }
+
+    try:
+        exit_code, output = handler(request.get("arguments", []))
+    except WorkRequestError as error:
+        exit_code, output = error.exit_code, str(error)
+    except SystemExit as system_exit:
+        exit_code, output = get_exit_code(system_exit), f"{system_exit.code}\n"
+    except Exception:  # pylint: disable=broad-except
+        exit_code, output = 1, traceback.format_exc()
+
+    return {"exitCode": exit_code, "output": output, "requestId": request_id}
+
+
+def read_requests(input_stream: t.TextIO) -> t.Iterator[dict]:
+    """Yields work requests from a stream of (possibly multi-line) JSON objects."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    for line in input_stream:
+        buffer += line
+        stripped_buffer = buffer.lstrip()
+        if not stripped_buffer:
+            buffer = ""
+            continue
+        try:
+            request, end = decoder.raw_decode(stripped_buffer)
+        except json.JSONDecodeError:
+            continue
+        buffer = stripped_buffer[end:]
+        yield request
+
+
+def run(
+    handler: WorkRequestHandler,
+    input_stream: t.Optional[t.TextIO] = None,
+    output_stream: t.Optional[t.TextIO] = None,
+    max_workers: t.Optional[int] = None,
+) -> int:
+    """
+    Main loop of a persistent worker. Singleplex requests (without a request id) are processed
+    in order, multiplex requests are processed concurrently and answered as soon as they finish.
+    """
+    input_stream = input_stream or sys.stdin
+    output_lock = threading.Lock()
+
+    if output_stream is None:
+        output_stream = sys.stdout
+        # Everything else which is printed must not interfere with the protocol on stdout
+        sys.stdout = sys.stderr
+
+    # Records are filtered by the per request handlers and levels, the NullHandler avoids an implicit basicConfig
+    logging.basicConfig(handlers=[logging.NullHandler()])
+
+    def respond(request: dict) -> None:
+        response = process_request(request, handler)
+        with output_lock:
+            output_stream.write(json.dumps(response) + "\n")
+            output_stream.flush()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for request in read_requests(input_stream):
+            if request.get("requestId", 0):
+                executor.submit(respond, request)
+            else:
+                respond(request)
+
+    return 0
@@ -0,0 +1,111 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_apply_fixes module.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+import quality.private.clang_tidy.tools.clang_tidy_apply_fixes as unit
+from quality.private.clang_tidy.tools import common
+
+FIXES = """---
+MainSourceFile: '{main}'
+Diagnostics:
+- DiagnosticName: misc-const-correctness
+  DiagnosticMessage:
+    Message: 'variable ''a'' can be const'
+    FilePath: '{header}'
+    FileOffset: 0
+    Replacements:
+    - FilePath: '{header}'
+      Offset: 0
+      Length: 0
+      ReplacementText: 'const '
+  Level: Warning
+- DiagnosticName: readability-identifier-naming
+  DiagnosticMessage:
+    Message: 'invalid case style'
+    FilePath: '{main}'
+    FileOffset: 4
+    Replacements:
+    - FilePath: '{main}'
+      Offset: 4
+      Length: 1
+      ReplacementText: '{name}'
+  Level: Warning
+...
+"""
+
+
+def write_fixes(tmp_path: Path, name: str, main: Path, header: Path, new_name: str = "k_b") -> Path:
+    """Helper that writes the fixes file of a translation unit."""
+    fixes_file = tmp_path / "bazel-bin" / f"{name}{unit.FIXES_SUFFIX}"
+    fixes_file.parent.mkdir(exist_ok=True)
+    fixes_file.write_text(FIXES.format(main=main, header=header, name=new_name))
+    return fixes_file
+
+
+def test_apply_fixes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """Replacements of a shared header are applied once, every file is edited in one go."""
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    header = workspace / "foo.h"
+    header.write_text("int a;\n")
+    for name in ["a", "b"]:
+        (workspace / f"{name}.cpp").write_text("int b;\n")
+        write_fixes(tmp_path, name, workspace / f"{name}.cpp", header)
+    (tmp_path / "bazel-bin" / f"c{unit.FIXES_SUFFIX}").write_text(common.NO_FIXES_REQUIRED)
+
+    monkeypatch.setattr(sys, "argv", ["", str(tmp_path / "bazel-bin"), "--workspace", str(workspace), "--jobs", "2"])
+
+    assert unit.main() == 0
+    assert header.read_text() == "const int a;\n"
+    assert (workspace / "a.cpp").read_text() == "int k_b;\n"
+    assert "Applied 3 replacement(s) to 3 file(s) from 3 fixes file(s), 1 duplicate" in capsys.readouterr().out
+
+
+def test_conflicting_replacements_are_skipped(tmp_path: Path):
+    """A file with overlapping replacements is left untouched."""
+    src_file = tmp_path / "foo.cpp"
+    src_file.write_text("int b;\n")
+    replacements = {unit.Replacement(4, 1, "k_b"), unit.Replacement(4, 1, "kB")}
+
+    result = unit.apply_replacements(str(src_file), replacements)
+
+    assert len(result.conflicts) == 1
+    assert src_file.read_text() == "int b;\n"
+
+
+def test_get_conflicts():
+    """Adjacent replacements do not conflict, overlapping ones and insertions at one offset do."""
+    assert not unit.get_conflicts([unit.Replacement(0, 2, "a"), unit.Replacement(2, 1, "b")])
+    assert unit.get_conflicts([unit.Replacement(0, 3, "a"), unit.Replacement(2, 1, "b")])
+    assert unit.get_conflicts([unit.Replacement(2, 0, "a"), unit.Replacement(2, 0, "b")])
+
+
+def test_files_outside_of_workspace_are_not_edited(tmp_path: Path):
+    """Replacements of e.g. external repositories are dropped."""
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    external = tmp_path / "external.h"
+    fixes_file = write_fixes(tmp_path, "a", external, external)
+
+    replacements_per_file, duplicates = unit.collect([str(fixes_file)], str(workspace), jobs=1)
+
+    assert not replacements_per_file
+    assert duplicates == 0
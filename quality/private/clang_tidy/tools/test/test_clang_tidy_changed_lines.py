@@ -0,0 +1,127 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_changed_lines module.
+"""
+
+import json
+from pathlib import Path
+
+import quality.private.clang_tidy.tools.clang_tidy_changed_lines as unit
+
+UNIFIED_DIFF = """diff --git a/lib/foo.cpp b/lib/foo.cpp
+index 1111111..2222222 100644
+--- a/lib/foo.cpp
++++ b/lib/foo.cpp
+@@ -1,4 +1,5 @@
+ int a;
+-int b;
++int b = 1;
++int c;
+ int d;
+ int e;
+@@ -10 +11,2 @@ int main()
++++int f;
++int g;
+diff --git a/lib/foo.h b/lib/foo.h
+new file mode 100644
+--- /dev/null
++++ b/lib/foo.h
+@@ -0,0 +1 @@
++#pragma once
+diff --git a/lib/old.cpp b/lib/old.cpp
+deleted file mode 100644
+--- a/lib/old.cpp
++++ /dev/null
+@@ -1 +0,0 @@
+-int old;
+"""
+
+
+def test_parse_unified_diff():
+    """Added lines are collected per file, removed lines and deleted files are skipped."""
+    assert unit.parse_unified_diff(UNIFIED_DIFF) == {
+        "lib/foo.cpp": [[2, 3], [11, 12]],
+        "lib/foo.h": [[1, 1]],
+    }
+
+
+def test_parse_json():
+    """Ranges are normalized and merged, files without ranges are skipped."""
+    content = json.dumps({"./lib/foo.cpp": [[4, 7], [1, 2], [2, 3]], "lib/bar.cpp": []})
+
+    assert unit.parse_json(content) == {"lib/foo.cpp": [[1, 7]]}
+
+
+def test_changed_lines():
+    """A translation unit is affected by its own changed lines and by any changed header."""
+    changed_lines = unit.ChangedLines({"lib/foo.cpp": [[2, 3], [11, 12]]})
+
+    assert changed_lines.is_affected("lib/./foo.cpp")
+    assert not changed_lines.is_affected("lib/bar.cpp")
+    assert [changed_lines.contains("lib/foo.cpp", line) for line in [1, 2, 3, 4, 11, 13]] == [
+        False,
+        True,
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert not changed_lines.contains("lib/bar.cpp", 1)
+
+    changed_lines = unit.ChangedLines({"lib/foo.cpp": [[2, 3]], "lib/foo.h": [[1, 1]]})
+    assert changed_lines.is_affected("lib/bar.cpp")
+    assert json.loads(changed_lines.get_line_filter("lib/foo.cpp")) == [
+        {"name": "lib/foo.cpp", "lines": [[2, 3]]},
+        {"name": "lib/foo.h", "lines": [[1, 1]]},
+    ]
+    assert json.loads(changed_lines.get_line_filter("lib/bar.cpp")) == [{"name": "lib/foo.h", "lines": [[1, 1]]}]
+
+
+def test_load(tmp_path: Path):
+    """The format of the manifest is derived from its extension."""
+    diff_manifest = tmp_path / "changes.diff"
+    diff_manifest.write_text(UNIFIED_DIFF)
+    json_manifest = tmp_path / "changes.json"
+    json_manifest.write_text(json.dumps({"lib/foo.cpp": [[2, 3]]}))
+
+    assert unit.load(str(diff_manifest)).ranges["lib/foo.h"] == [[1, 1]]
+    assert unit.load(str(json_manifest)).ranges == {"lib/foo.cpp": [[2, 3]]}
+
+
+def test_get_line(tmp_path: Path):
+    """Byte offsets are mapped to one based line numbers."""
+    src_file = tmp_path / "foo.cpp"
+    src_file.write_bytes(b"int a;\nint b;\n")
+
+    assert [unit.get_line(str(src_file), offset) for offset in [0, 6, 7, 13]] == [1, 1, 2, 2]
+    assert unit.get_line(str(tmp_path / "missing.cpp"), 0) is None
+
+
+def test_load_and_get_line_after_change(tmp_path: Path):
+    """Changed files are read again, e.g. by the persistent worker in the next build."""
+    manifest = tmp_path / "changes.json"
+    manifest.write_text(json.dumps({"lib/foo.cpp": [[2, 3]]}))
+    src_file = tmp_path / "foo.cpp"
+    src_file.write_bytes(b"int a;\nint b;\n")
+
+    assert unit.load(str(manifest)).ranges == {"lib/foo.cpp": [[2, 3]]}
+    assert unit.get_line(str(src_file), 7) == 2
+
+    manifest.write_text(json.dumps({"lib/foo.cpp": [[20, 30]], "lib/bar.cpp": [[1, 1]]}))
+    src_file.write_bytes(b"int a;\n\n\nint b;\n")
+
+    assert unit.load(str(manifest)).ranges == {"lib/foo.cpp": [[20, 30]], "lib/bar.cpp": [[1, 1]]}
+    assert unit.get_line(str(src_file), 7) == 2
+    assert unit.get_line(str(src_file), 9) == 4
@@ -0,0 +1,126 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_check_profile module.
+"""
+
+import json
+import os
+import typing as t
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+import quality.private.clang_tidy.tools.clang_tidy_check_profile as unit
+
+
+def write_check_profile(path: Path, timings: t.Dict[str, float]) -> None:
+    """Helper that writes a check profile with the given wall times per check."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profile = {}
+    for check, wall in timings.items():
+        profile[f"time.clang-tidy.{check}.wall"] = wall
+        profile[f"time.clang-tidy.{check}.user"] = wall / 2
+        profile[f"time.clang-tidy.{check}.sys"] = 0.0
+    path.write_text(json.dumps({"file": "foo.cpp", "profile": profile}))
+
+
+def test_collect_without_stored_profile(tmp_path: Path):
+    """An empty profile is written if clang-tidy did not store one, e.g. on a result cache hit."""
+    check_profile = tmp_path / "foo.check_profile.json"
+
+    unit.collect(str(tmp_path / "missing"), str(check_profile), "foo.cpp")
+
+    assert json.loads(check_profile.read_text()) == {"file": "foo.cpp", "profile": {}}
+
+
+def test_parse_profile():
+    """Check names may contain dots, unrelated entries are ignored."""
+    profile = {
+        "time.clang-tidy.clang-analyzer-core.NullDereference.wall": 1.0,
+        "time.clang-tidy.clang-analyzer-core.NullDereference.user": 0.75,
+        "time.clang-tidy.misc-unused.sys": 0.25,
+        "unrelated": 2.0,
+    }
+
+    assert unit.parse_profile(profile) == {
+        "clang-analyzer-core.NullDereference": unit.CheckTiming(wall=1.0, user=0.75, sys=0.0),
+        "misc-unused": unit.CheckTiming(wall=0.0, user=0.0, sys=0.25),
+    }
+
+
+@pytest.mark.parametrize(
+    "check_profile, expected_label",
+    [
+        ("bazel-out/k8-fastbuild/bin/foo/bar/_tidy/lib/foo.cpp.check_profile.json", "//foo/bar:lib"),
+        ("bazel-bin/foo/_tidy/lib/foo.cpp.check_profile.json", "//foo:lib"),
+        ("bazel-out/k8-fastbuild/bin/external/repo/pkg/_tidy/lib/foo.cpp.check_profile.json", "@repo//pkg:lib"),
+        ("foo.cpp.check_profile.json", "<unknown>"),
+    ],
+)
+def test_get_target_label(check_profile: str, expected_label: str):
+    """Test the function get_target_label."""
+    assert unit.get_target_label(check_profile.replace("/", os.sep)) == expected_label
+
+
+def test_aggregate(tmp_path: Path):
+    """Timings are accumulated per check and per target."""
+    package = tmp_path / "bazel-out" / "k8-fastbuild" / "bin" / "foo"
+    write_check_profile(package / "_tidy" / "a" / "a.cpp.check_profile.json", {"misc-unused": 1.0, "bugprone-x": 3.0})
+    write_check_profile(package / "_tidy" / "a" / "b.cpp.check_profile.json", {"misc-unused": 1.0})
+    write_check_profile(package / "_tidy" / "c" / "c.cpp.check_profile.json", {"misc-unused": 0.5})
+
+    check_timings, target_timings, count = unit.aggregate(unit.find_check_profiles([str(tmp_path)]))
+
+    assert count == 3
+    assert check_timings == {
+        "misc-unused": unit.CheckTiming(wall=2.5, user=1.25, sys=0.0),
+        "bugprone-x": unit.CheckTiming(wall=3.0, user=1.5, sys=0.0),
+    }
+    assert target_timings == {"//foo:a": {"misc-unused": 2.0, "bugprone-x": 3.0}, "//foo:c": {"misc-unused": 0.5}}
+
+
+def test_get_expensive_checks():
+    """The most expensive checks are listed until they account for the requested share of the wall time."""
+    check_timings = {
+        "cheap": unit.CheckTiming(1.0, 0.0, 0.0),
+        "expensive": unit.CheckTiming(7.0, 0.0, 0.0),
+        "medium": unit.CheckTiming(2.0, 0.0, 0.0),
+    }
+
+    assert unit.get_expensive_checks(check_timings, 0.8) == ["expensive", "medium"]
+    assert unit.get_expensive_checks(check_timings, 0.5) == ["expensive"]
+    assert unit.get_expensive_checks({}, 0.8) == []
+
+
+def test_main(tmp_path: Path, mocker: MockerFixture):
+    """The report lists the checks sorted by wall time."""
+    write_check_profile(tmp_path / "bin" / "foo" / "_tidy" / "a" / "a.cpp.check_profile.json", {"x": 1.0, "y": 9.0})
+    report = tmp_path / "report.txt"
+    mocker.patch("sys.argv", ["clang_tidy_check_profile", str(tmp_path), "--output", str(report)])
+
+    assert unit.main() == 0
+
+    content = report.read_text()
+    assert "Aggregated 1 check profile(s) of 1 target(s)." in content
+    assert "1 of 2 check(s) account for 80% of the wall time: y" in content
+    assert content.index("  y\n") < content.index("  x\n")
+
+
+def test_main_without_profiles(tmp_path: Path, mocker: MockerFixture):
+    """Without any profile the tool fails."""
+    mocker.patch("sys.argv", ["clang_tidy_check_profile", str(tmp_path)])
+
+    assert unit.main() == 1
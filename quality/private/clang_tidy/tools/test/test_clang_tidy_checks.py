@@ -0,0 +1,129 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_checks module, including a benchmark against the pairwise reduction.
+"""
+
+import typing as t
+
+import pytest
+
+import quality.private.clang_tidy.tools.clang_tidy_checks as unit
+from quality.private.clang_tidy.tools import clang_tidy_configs
+from quality.private.common.tools.test import benchmark
+
+# Thousands of explicit checks across many groups, with a wildcard within each group
+BENCHMARK_GROUPS = 150
+BENCHMARK_CHECKS_PER_GROUP = 20
+
+
+def reduce_checks_pairwise(checks: t.Set[str]) -> t.Set[str]:
+    """The pairwise reduction of every wildcard against every check, as done by `reduce_checks` before."""
+    remove_checks = set()
+    for wildcard_check in checks:
+        if wildcard_check.endswith("*"):
+            for check in checks:
+                if check.startswith(wildcard_check[:-1]) and check != wildcard_check:
+                    remove_checks.add(check)
+    return checks - remove_checks
+
+
+def get_benchmark_checks() -> t.Tuple[t.Set[str], t.Set[str]]:
+    """Helper that provides the activated and deactivated checks of the benchmark."""
+    activated_checks = set()
+    deactivated_checks = {"*"}
+    for group in range(BENCHMARK_GROUPS):
+        checks = {f"group{group}-check-{index}" for index in range(BENCHMARK_CHECKS_PER_GROUP)}
+        checks.add(f"group{group}-check-1*")
+        if group % 3 == 0:
+            checks.add(f"group{group}-*")
+        if group % 2 == 0:
+            activated_checks.update(checks)
+        else:
+            deactivated_checks.update(checks)
+    return activated_checks, deactivated_checks
+
+
+@pytest.mark.parametrize(
+    "checks",
+    [
+        set(),
+        {"*"},
+        {"*", "bugprone-*", "misc-unused"},
+        {"bugprone-*", "bugprone-use-after-move", "bugprone-*-move", "bugprone-"},
+        {"bugprone-*", "bugprone*", "bugpron*"},
+        {"*", "**", "***"},
+        {"misc-*", "misc-unused", "modernize-*", "modernize-use-auto", "cert-err58-cpp"},
+    ],
+)
+def test_reduced_equals_pairwise_reduction(checks: t.Set[str]):
+    """A check is removed if another wildcard covers it, like the pairwise reduction."""
+    trie = unit.CheckTrie(checks)
+    expected = reduce_checks_pairwise(checks)
+
+    assert list(trie.reduced()) == sorted(expected)
+    assert trie.covered() == sorted(checks - expected)
+    assert [check for check in sorted(checks) if trie.is_covered(check)] == sorted(checks - expected)
+
+
+def test_set_operations():
+    """The trie behaves like a sorted set of checks."""
+    trie = unit.CheckTrie(["misc-unused", "bugprone-*"])
+    trie.add("misc-unused")
+    trie.add("misc-*")
+
+    assert len(trie) == 3
+    assert list(trie) == ["bugprone-*", "misc-*", "misc-unused"]
+    assert "misc-*" in trie
+    assert "misc-" not in trie
+    assert "misc-unused-alias" not in trie
+    assert trie.is_covered("misc-unused-alias")
+    assert not trie.is_covered("cert-err58-cpp")
+
+
+def merge_pairwise(activated_checks: t.Set[str], deactivated_checks: t.Set[str]) -> str:
+    """The `Checks` string as merged by the pairwise reduction."""
+    reduced_activated_checks = reduce_checks_pairwise(activated_checks)
+    before = reduced_activated_checks | reduce_checks_pairwise(deactivated_checks - {"*"})
+    assert before == reduce_checks_pairwise(before)
+    deactivated_checks_list = [f"-{check}" for check in sorted(reduce_checks_pairwise(deactivated_checks))]
+    return ",".join(deactivated_checks_list + sorted(reduced_activated_checks))
+
+
+def merge(activated_checks: t.Set[str], deactivated_checks: t.Set[str]) -> str:
+    """The `Checks` string as merged by the configs module."""
+    merged_config = {}
+    clang_tidy_configs.assert_checks(merged_config, activated_checks, deactivated_checks)
+    return merged_config["Checks"]
+
+
+def test_merge_equals_pairwise_reduction():
+    """Merging hundreds of checks results in the same `Checks` string as the pairwise reduction."""
+    activated_checks, deactivated_checks = get_benchmark_checks()
+
+    checks = merge(activated_checks, deactivated_checks)
+
+    assert checks == merge_pairwise(activated_checks, deactivated_checks)
+    assert checks.startswith("-*,")
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+def test_benchmark():
+    """Merging hundreds of checks is faster than the pairwise reduction."""
+    activated_checks, deactivated_checks = get_benchmark_checks()
+
+    trie_seconds, _ = benchmark.measure(lambda: merge(activated_checks, deactivated_checks))
+    pairwise_seconds, _ = benchmark.measure(lambda: merge_pairwise(activated_checks, deactivated_checks))
+
+    assert trie_seconds < pairwise_seconds, f"{trie_seconds:.3f}s trie, {pairwise_seconds:.3f}s pairwise"
@@ -0,0 +1,87 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_compilation_database module.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import quality.private.clang_tidy.tools.clang_tidy_compilation_database as unit
+
+
+def write_compile_commands(directory: Path, sandbox: str, src_file: str) -> Path:
+    """Helper that writes the compile commands of a translation unit as written by a clang-tidy action."""
+    directory.mkdir(parents=True)
+    compile_commands = directory / "compile_commands.json"
+    entry = {
+        "directory": sandbox,
+        "file": src_file,
+        "arguments": ["clang-tidy", f"-I{sandbox}/bazel-out/bin/lib", "-DFOO", src_file],
+    }
+    compile_commands.write_text(json.dumps([entry]))
+    return compile_commands
+
+
+def test_merge(tmp_path: Path):
+    """Paths are made relative to the execution root and each source file is kept once."""
+    bin_dir = tmp_path / "execroot" / "_main" / "bazel-out" / "k8-fastbuild" / "bin"
+    tidy_dir = bin_dir / "lib" / "_tidy"
+    write_compile_commands(
+        tidy_dir / "foo" / "lib_foo.cpp_compile_commands", "/sandbox/1/execroot/_main", "lib/foo.cpp"
+    )
+    write_compile_commands(
+        tidy_dir / "bar" / "lib_foo.cpp_compile_commands", "/sandbox/2/execroot/_main", "lib/foo.cpp"
+    )
+    write_compile_commands(
+        tidy_dir / "bar" / "lib_bar.cpp_compile_commands", "/sandbox/2/execroot/_main", "lib/bar.cpp"
+    )
+    (bin_dir / "lib" / "unrelated").mkdir()
+    (bin_dir / "lib" / "unrelated" / "compile_commands.json").write_text("[]")
+
+    compile_commands_files = sorted(unit.find_compile_commands([str(bin_dir)]))
+    execution_root = unit.get_execution_root(compile_commands_files[0])
+
+    assert len(compile_commands_files) == 3
+    assert execution_root == str(tmp_path / "execroot" / "_main")
+    assert unit.merge(compile_commands_files, execution_root) == [
+        {
+            "directory": execution_root,
+            "file": "lib/bar.cpp",
+            "arguments": ["clang-tidy", "-Ibazel-out/bin/lib", "-DFOO", "lib/bar.cpp"],
+        },
+        {
+            "directory": execution_root,
+            "file": "lib/foo.cpp",
+            "arguments": ["clang-tidy", "-Ibazel-out/bin/lib", "-DFOO", "lib/foo.cpp"],
+        },
+    ]
+
+
+def test_main(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The merged database is written to the output, missing compile commands fail."""
+    compile_commands = write_compile_commands(tmp_path / "_tidy" / "foo", "/sandbox", "foo.cpp")
+    output = tmp_path / "compile_commands.json"
+
+    monkeypatch.setattr(
+        sys, "argv", ["", str(compile_commands), "--execution_root", "/execroot", "--output", str(output)]
+    )
+    assert unit.main() == 0
+    assert json.loads(output.read_text())[0]["directory"] == "/execroot"
+
+    monkeypatch.setattr(sys, "argv", ["", str(tmp_path / "empty")])
+    assert unit.main() == 1
@@ -0,0 +1,84 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_config_merger module.
+"""
+
+from pathlib import Path
+
+import pytest
+import ruamel.yaml
+from pytest_mock import MockerFixture
+
+import quality.private.clang_tidy.tools.clang_tidy_config_merger as unit
+
+
+def write_config(path: Path, content: str) -> str:
+    """Writes a config file and returns its path as string."""
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_merge_config_files(tmp_path: Path):
+    """Configs are merged and the module type is added."""
+    config_files = [
+        write_config(tmp_path / "first", "Checks: 'check1'\n"),
+        write_config(tmp_path / "second", "Checks: 'check2'\n"),
+    ]
+
+    merged_config = unit.merge_config_files(config_files, "executable")
+
+    assert merged_config["Checks"] == "check1,check2"
+    assert merged_config["CheckOptions"] == [{"key": "ModuleType", "value": "executable"}]
+
+
+def test_merge_config_files_single_without_module_type(tmp_path: Path):
+    """A single config without module type stays untouched."""
+    config_files = [write_config(tmp_path / "first", "Checks: 'check1'\n")]
+
+    assert unit.merge_config_files(config_files, None) == {"Checks": "check1"}
+
+
+@pytest.mark.parametrize(
+    "second_config, expected_exit_code",
+    [
+        ("Checks: 'check2'\n", 0),
+        ("Checks: '-check1'\n", 1),
+    ],
+)
+def test_main(mocker: MockerFixture, tmp_path: Path, second_config: str, expected_exit_code: int):
+    """Test the main function."""
+    output = tmp_path / "merged"
+    mocker.patch(
+        "sys.argv",
+        [
+            "clang_tidy_config_merger",
+            "--config_file",
+            write_config(tmp_path / "first", "Checks: 'check1'\n"),
+            "--config_file",
+            write_config(tmp_path / "second", second_config),
+            "--module_type",
+            "static_library",
+            "--output",
+            str(output),
+        ],
+    )
+
+    assert unit.main() == expected_exit_code
+
+    if expected_exit_code == 0:
+        merged_config = ruamel.yaml.YAML(typ="safe", pure=True).load(output)
+        assert merged_config["Checks"] == "check1,check2"
+    else:
+        assert not output.exists()
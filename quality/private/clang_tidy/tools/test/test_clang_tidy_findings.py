@@ -0,0 +1,58 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_findings module.
+"""
+
+from pathlib import Path
+
+import quality.private.clang_tidy.tools.clang_tidy_findings as unit
+
+
+def get_diagnostic(file_path: str, offset: int) -> dict:
+    """Helper that provides a diagnostic as contained in a fixes file."""
+    return {
+        "DiagnosticName": "misc-const-correctness",
+        "DiagnosticMessage": {"Message": "variable 'a' can be const", "FilePath": file_path, "FileOffset": offset},
+        "Level": "Error",
+    }
+
+
+def test_to_record(tmp_path: Path):
+    """The offset is resolved into line and column, diagnostics without a location have none."""
+    src_file = tmp_path / "foo.cpp"
+    src_file.write_text("int a;\nint b;\n")
+
+    assert unit.to_record(get_diagnostic(str(src_file), 11), "foo.cpp") == {
+        "file": "foo.cpp",
+        "line": 2,
+        "column": 5,
+        "check": "misc-const-correctness",
+        "level": "error",
+        "message": "variable 'a' can be const",
+    }
+    assert unit.to_record(get_diagnostic("", 0), None)["line"] is None
+
+
+def test_write_and_read(tmp_path: Path):
+    """Records are written one per line and read back, no records result in an empty file."""
+    findings = tmp_path / "foo.findings.jsonl"
+    records = [{"file": "foo.cpp", "line": 1}, {"file": "bar.cpp", "line": 2}]
+
+    unit.write(str(findings), records)
+    assert list(unit.read(str(findings))) == records
+    assert len(findings.read_text().splitlines()) == 2
+
+    unit.write(str(findings), [])
+    assert findings.read_text() == ""
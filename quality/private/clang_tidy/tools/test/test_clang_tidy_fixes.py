@@ -0,0 +1,308 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_fixes module, including a benchmark against the round-trip loader and dumper.
+"""
+
+import io
+import typing as t
+from pathlib import Path
+
+import pytest
+import ruamel.yaml
+import yaml
+
+import quality.private.clang_tidy.tools.clang_tidy_fixes as unit
+from quality.private.clang_tidy.tools import common
+from quality.private.common.tools.test import benchmark
+
+FIXES_YAML = """---
+MainSourceFile:  '/tmp/temp.cpp'
+Diagnostics:
+  - DiagnosticName:  readability-identifier-naming
+    DiagnosticMessage:
+      Message:         'invalid case style for variable ''b'''
+      FilePath:        '/tmp/temp.cpp'
+      FileOffset:      4
+      Replacements:
+        - FilePath:        '/tmp/temp.cpp'
+          Offset:          4
+          Length:          1
+          ReplacementText: "k_b\\n\\n  "
+    Level:           Warning
+    BuildDirectory:  '/tmp'
+  - DiagnosticName:  cppcoreguidelines-avoid-c-arrays
+    DiagnosticMessage:
+      Message:         'do not declare C-style arrays, use std::array<> instead'
+      FilePath:        '/tmp/temp.cpp'
+      FileOffset:      242
+      Replacements:    []
+    Notes:
+      - Message:         'expanded from macro ''TEST'''
+        FilePath:        '/tmp/temp.cpp'
+        FileOffset:      89246
+        Replacements:    []
+    Level:           Error
+    BuildDirectory:  '/tmp'
+...
+"""
+
+# A fix of readability-braces-around-statements, clang-tidy continues multi-line quoted scalars at column 0
+BRACES_FIXES_YAML = """---
+MainSourceFile:  '/tmp/temp.cpp'
+Diagnostics:
+  - DiagnosticName:  readability-braces-around-statements
+    DiagnosticMessage:
+      Message:         statement should be inside braces
+      FilePath:        '/tmp/temp.cpp'
+      FileOffset:      30
+      Replacements:
+        - FilePath:        '/tmp/temp.cpp'
+          Offset:          30
+          Length:          0
+          ReplacementText: ' {
+'
+        - FilePath:        '/tmp/temp.cpp'
+          Offset:          42
+          Length:          0
+          ReplacementText: '
+
+}'
+    Level:           Warning
+    BuildDirectory:  '/tmp'
+  - DiagnosticName:  readability-braces-around-statements
+    DiagnosticMessage:
+      Message:         "statement should be inside \\"braces\\"
+- and is continued"
+      FilePath:        '/tmp/temp.cpp'
+      FileOffset:      50
+      Replacements:    []
+    Level:           Warning
+    BuildDirectory:  '/tmp'
+...
+"""
+
+# The benchmark streams a fixes file of several megabytes with many diagnostics and large replacement lists.
+# The round-trip is too slow for such files in a unit test, hence it is compared on a sample.
+BENCHMARK_DIAGNOSTICS = 1000
+BENCHMARK_MEGABYTES_PER_SECOND = 0.25
+SAMPLE_DIAGNOSTICS = 50
+BENCHMARK_REPLACEMENTS = 8
+
+
+def get_diagnostic(index: int) -> str:
+    """Helper that provides a diagnostic of the benchmark, in the layout written by clang-tidy."""
+    replacements = "".join(f"""        - FilePath:        '/workspace/src/component/module_{index % 50}.h'
+          Offset:          {index * 100 + replacement}
+          Length:          {replacement}
+          ReplacementText: 'std::array<std::uint32_t, {replacement}U> values_{index}_{replacement}'
+""" for replacement in range(BENCHMARK_REPLACEMENTS))
+    return f"""  - DiagnosticName:  cppcoreguidelines-avoid-c-arrays
+    DiagnosticMessage:
+      Message:         'do not declare C-style arrays, use ''std::array<>'' instead of ''values_{index}'''
+      FilePath:        '/workspace/src/component/module_{index % 50}.h'
+      FileOffset:      {index * 100}
+      Replacements:
+{replacements}    Notes:
+      - Message:         'expanded from macro ''DECLARE_VALUES'''
+        FilePath:        '/workspace/src/component/macros.h'
+        FileOffset:      {index}
+        Replacements:    []
+    Level:           Warning
+    BuildDirectory:  '/workspace'
+"""
+
+
+def write_benchmark_fixes(tmp_path: Path, diagnostics: int) -> Path:
+    """Helper that writes the fixes file of the benchmark."""
+    fixes = tmp_path / "benchmark.fixes.yaml"
+    with open(fixes, mode="w", encoding="utf-8") as fixes_file:
+        fixes_file.write("---\nMainSourceFile:  '/workspace/src/component/module.cpp'\nDiagnostics:\n")
+        for index in range(diagnostics):
+            fixes_file.write(get_diagnostic(index))
+        fixes_file.write("...\n")
+    return fixes
+
+
+def round_trip(fixes: Path) -> str:
+    """The round-trip load and dump which is replaced by the module."""
+    yaml = ruamel.yaml.YAML(typ="rt")
+    yaml.preserve_quotes = True
+    with open(fixes, encoding="utf-8") as fixes_file:
+        content = yaml.load(fixes_file)
+    yaml.explicit_start = True
+    yaml.explicit_end = True
+    yaml.width = 500
+    stream = io.StringIO()
+    yaml.dump(content, stream)
+    return stream.getvalue()
+
+
+def fast_trip(fixes: Path) -> str:
+    """The load and dump of the module."""
+    stream = io.StringIO()
+    unit.dump(unit.load(str(fixes)), stream)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("diagnostics_per_chunk", [1, unit.DIAGNOSTICS_PER_CHUNK])
+def test_load(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, diagnostics_per_chunk: int):
+    """The streamed diagnostics equal the ones of loading the whole document."""
+    monkeypatch.setattr(unit, "DIAGNOSTICS_PER_CHUNK", diagnostics_per_chunk)
+    fixes = tmp_path / "foo.fixes.yaml"
+    fixes.write_text(FIXES_YAML)
+
+    content = unit.load(str(fixes))
+
+    assert content == ruamel.yaml.YAML(typ="safe", pure=True).load(FIXES_YAML)
+    assert content["Diagnostics"][0]["DiagnosticMessage"]["Replacements"][0]["ReplacementText"] == "k_b\n\n  "
+
+
+@pytest.mark.parametrize("diagnostics_per_chunk", [1, unit.DIAGNOSTICS_PER_CHUNK])
+def test_load_multi_line_quoted_scalars(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, diagnostics_per_chunk: int):
+    """Quoted scalars continued at column 0 neither end the diagnostics nor start a new diagnostic."""
+    monkeypatch.setattr(unit, "DIAGNOSTICS_PER_CHUNK", diagnostics_per_chunk)
+    fixes = tmp_path / "foo.fixes.yaml"
+    fixes.write_text(BRACES_FIXES_YAML)
+
+    content = unit.load(str(fixes))
+
+    assert content == yaml.safe_load(BRACES_FIXES_YAML)
+    assert len(content["Diagnostics"]) == 2
+    assert [
+        replacement["ReplacementText"] for replacement in content["Diagnostics"][0]["DiagnosticMessage"]["Replacements"]
+    ] == [" { ", "\n}"]
+
+
+@pytest.mark.parametrize(
+    "line, quote, expected_quote",
+    [
+        ("          ReplacementText: ' {\n", None, "'"),
+        ("'\n", "'", None),
+        ("      Message:         'a ''quoted'' word'\n", None, None),
+        ('      Message:         "a \\" quote\n', None, '"'),
+        ("      Message:         don't\n", None, None),
+        ("  - 'item\n", None, "'"),
+        ("  - item # it's a comment\n", None, None),
+    ],
+)
+def test_get_open_quote(line: str, quote: t.Optional[str], expected_quote: t.Optional[str]):
+    """Only quotes at the start of a value open a scalar, escaped quotes do not close it."""
+    assert unit.get_open_quote(line, quote) == expected_quote
+
+
+def test_load_whole_document_if_split_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """A document whose chunks cannot be parsed is loaded as a whole."""
+    monkeypatch.setattr(unit, "split_document", lambda lines, header: iter([["- 'unterminated\n"]]))
+    fixes = tmp_path / "foo.fixes.yaml"
+    fixes.write_text(BRACES_FIXES_YAML)
+
+    assert unit.load(str(fixes)) == yaml.safe_load(BRACES_FIXES_YAML)
+
+
+def test_load_without_fixes(tmp_path: Path):
+    """Fixes files which only contain a note have no content."""
+    fixes = tmp_path / "foo.fixes.yaml"
+    fixes.write_text(common.NO_FIXES_REQUIRED)
+
+    assert unit.load(str(fixes)) is None
+
+
+def test_dump(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The dumped chunks form a single document which is loaded back unchanged."""
+    monkeypatch.setattr(unit, "DIAGNOSTICS_PER_CHUNK", 1)
+    fixes = tmp_path / "foo.fixes.yaml"
+    fixes.write_text(FIXES_YAML)
+    content = unit.load(str(fixes))
+
+    dumped = io.StringIO()
+    unit.dump(content, dumped)
+
+    assert dumped.getvalue().startswith("---\nMainSourceFile: '/tmp/temp.cpp'\nDiagnostics:\n- DiagnosticName:")
+    assert dumped.getvalue().endswith("\n...\n")
+    assert ruamel.yaml.YAML(typ="safe", pure=True).load(dumped.getvalue()) == content
+
+
+@pytest.mark.parametrize("fixes_yaml", [FIXES_YAML, None])
+def test_fast_trip_equals_round_trip(tmp_path: Path, fixes_yaml: t.Optional[str]):
+    """Loading and dumping a fixes file results in the same output as the round-trip, including the quotes."""
+    if fixes_yaml:
+        fixes = tmp_path / "foo.fixes.yaml"
+        fixes.write_text(fixes_yaml)
+    else:
+        fixes = write_benchmark_fixes(tmp_path, SAMPLE_DIAGNOSTICS)
+
+    assert fast_trip(fixes) == round_trip(fixes)
+
+
+def test_keep_quotes():
+    """An assigned value keeps the quotes of the scalar it replaces."""
+    assert isinstance(unit.keep_quotes(unit.SingleQuoted("/tmp"), "Omitted"), unit.SingleQuoted)
+    assert isinstance(unit.keep_quotes(unit.DoubleQuoted("/tmp"), "Omitted"), unit.DoubleQuoted)
+    assert type(unit.keep_quotes("/tmp", "Omitted")) is str  # pylint: disable=unidiomatic-typecheck
+
+
+@pytest.mark.parametrize("diagnostics_per_chunk", [1, unit.DIAGNOSTICS_PER_CHUNK])
+def test_iter_diagnostics(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, diagnostics_per_chunk: int):
+    """The diagnostics are yielded one at a time, the header is stored once they are exhausted."""
+    monkeypatch.setattr(unit, "DIAGNOSTICS_PER_CHUNK", diagnostics_per_chunk)
+    fixes = tmp_path / "foo.fixes.yaml"
+    fixes.write_text(FIXES_YAML)
+    header: t.Dict[str, t.Any] = {}
+
+    diagnostics = unit.iter_diagnostics(str(fixes), header)
+
+    assert next(diagnostics)["DiagnosticName"] == "readability-identifier-naming"
+    assert not header
+    assert next(diagnostics)["DiagnosticName"] == "cppcoreguidelines-avoid-c-arrays"
+    assert next(diagnostics, None) is None
+    assert header == {"MainSourceFile": "/tmp/temp.cpp", "Diagnostics": None}
+
+
+def test_iter_diagnostics_if_split_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """If a later chunk cannot be parsed, only the diagnostics which have not been yielded yet follow."""
+    first_chunk = ["- DiagnosticName: first\n"]
+    monkeypatch.setattr(unit, "split_document", lambda lines, header: iter([first_chunk, ["- 'unterminated\n"]]))
+    fixes = tmp_path / "foo.fixes.yaml"
+    fixes.write_text(FIXES_YAML)
+
+    diagnostics = list(unit.iter_diagnostics(str(fixes), {}))
+
+    assert [diagnostic["DiagnosticName"] for diagnostic in diagnostics] == [
+        "first",
+        "cppcoreguidelines-avoid-c-arrays",
+    ]
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+def test_benchmark_against_round_trip(tmp_path: Path):
+    """Loading and dumping a fixes file is faster than the round-trip."""
+    fixes = write_benchmark_fixes(tmp_path, SAMPLE_DIAGNOSTICS)
+
+    fast_seconds, _ = benchmark.measure(lambda: fast_trip(fixes))
+    round_trip_seconds, _ = benchmark.measure(lambda: round_trip(fixes), runs=1)
+
+    assert fast_seconds < round_trip_seconds, f"{fast_seconds:.3f}s, round-trip: {round_trip_seconds:.3f}s"
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+def test_benchmark_multi_megabyte(tmp_path: Path):
+    """A multi-megabyte fixes file is loaded and dumped within the throughput budget."""
+    fixes = write_benchmark_fixes(tmp_path, BENCHMARK_DIAGNOSTICS)
+    megabytes = fixes.stat().st_size / (1024 * 1024)
+    assert megabytes > 2
+
+    seconds, _ = benchmark.measure(lambda: fast_trip(fixes), runs=1)
+
+    assert megabytes / seconds > BENCHMARK_MEGABYTES_PER_SECOND, f"{megabytes / seconds:.1f} MB/s"
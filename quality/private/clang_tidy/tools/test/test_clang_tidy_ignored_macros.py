@@ -0,0 +1,143 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_ignored_macros module, including a throughput benchmark against the nested loop.
+"""
+
+import typing as t
+
+import pytest
+
+import quality.private.clang_tidy.tools.clang_tidy_ignored_macros as unit
+from quality.private.clang_tidy.tools import clang_tidy_result_filter
+from quality.private.common.tools.test import benchmark
+
+IGNORED_MACROS = ["TEST", "INSTANTIATE", "LOG_", "ASSERT_THAT", "he", "she", "hers"]
+
+# Hundreds of ignored macros and many findings with dense macro expansions
+BENCHMARK_MACROS = 400
+BENCHMARK_DIAGNOSTICS = 2000
+BENCHMARK_NOTES = 6
+
+
+def is_ignored_by_nested_loop(message: str, ignored_macros: t.List[str]) -> bool:
+    """The substring test of every ignored macro, as done by `counting_warning` before."""
+    return any(ignored_macro in message for ignored_macro in ignored_macros)
+
+
+def counting_warning_by_nested_loop(diagnostic: dict, ignored_macros: t.List[str]) -> bool:
+    """The nested loop over the notes and ignored macros which is replaced by the module."""
+    is_counting_warning = True
+    if "Notes" in diagnostic and "" not in ignored_macros:
+        for note in diagnostic["Notes"]:
+            message = note["Message"]
+            if "expanded from macro" in message:
+                for ignored_macro in ignored_macros:
+                    if ignored_macro in message:
+                        is_counting_warning = False
+    return is_counting_warning
+
+
+def get_benchmark_diagnostics() -> t.Tuple[t.List[str], t.List[dict]]:
+    """Helper that provides the ignored macros and the diagnostics of the benchmark."""
+    ignored_macros = [f"IGNORED_MACRO_{index}" for index in range(BENCHMARK_MACROS)]
+    diagnostics = []
+    for index in range(BENCHMARK_DIAGNOSTICS):
+        notes = [
+            {"Message": f"expanded from macro 'USER_MACRO_{(index + note) % 97}'"} for note in range(BENCHMARK_NOTES)
+        ]
+        if index % 10 == 0:
+            notes.append({"Message": f"expanded from macro 'IGNORED_MACRO_{index % BENCHMARK_MACROS}_IMPL'"})
+        diagnostics.append({"DiagnosticName": "misc-check", "Notes": notes})
+    return ignored_macros, diagnostics
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "expanded from macro 'TEST'",
+        "expanded from macro 'TEST_F'",
+        "expanded from macro 'GTEST_TEST'",
+        "expanded from macro 'INSTANTIATE_TEST_SUITE_P'",
+        "expanded from macro 'LOG_ERROR'",
+        "expanded from macro 'LOG'",
+        "expanded from macro 'EXPECT_EQ'",
+        "expanded from macro 'ushers'",
+        "expanded from macro 'xhex'",
+        "expanded from macro 'ASSERT'",
+        "expanded from macro ''",
+    ],
+)
+def test_is_ignored_equals_substring_test(message: str):
+    """A note is ignored if any ignored macro is contained in its message."""
+    ignored_macros = unit.IgnoredMacros(IGNORED_MACROS)
+
+    assert ignored_macros.is_ignored(message) == is_ignored_by_nested_loop(message, IGNORED_MACROS)
+    # The memoized verdict is the same
+    assert ignored_macros.is_ignored(message) == is_ignored_by_nested_loop(message, IGNORED_MACROS)
+
+
+def test_empty_macro_disables_suppression():
+    """An empty ignored macro disables the suppression by macros, like before."""
+    diagnostic = {"Notes": [{"Message": "expanded from macro 'TEST'"}]}
+
+    assert clang_tidy_result_filter.counting_warning(diagnostic, unit.IgnoredMacros(["TEST", ""]))
+    assert not clang_tidy_result_filter.counting_warning(diagnostic, unit.IgnoredMacros(["TEST"]))
+
+
+def test_verdicts_are_bounded(monkeypatch: pytest.MonkeyPatch):
+    """The memoized verdicts do not grow beyond the maximum, the verdicts stay the same."""
+    monkeypatch.setattr(unit, "MAX_VERDICTS", 4)
+    ignored_macros = unit.IgnoredMacros(IGNORED_MACROS)
+
+    messages = [f"expanded from macro 'LOG_{index}'" for index in range(10)]
+    assert all(ignored_macros.is_ignored(message) for message in messages)
+    assert len(ignored_macros.verdicts) <= 4
+    assert all(ignored_macros.is_ignored(message) for message in messages)
+
+
+def decide_compiled(ignored_macros: t.List[str], diagnostics: t.List[dict]) -> t.List[bool]:
+    """The verdicts of the module, compiled once per translation unit by `filter_warnings` without memoized ones."""
+    compiled_ignored_macros = unit.IgnoredMacros(ignored_macros)
+    return [
+        clang_tidy_result_filter.counting_warning(diagnostic, compiled_ignored_macros) for diagnostic in diagnostics
+    ]
+
+
+def decide_by_nested_loop(ignored_macros: t.List[str], diagnostics: t.List[dict]) -> t.List[bool]:
+    """The verdicts of the nested loop."""
+    return [counting_warning_by_nested_loop(diagnostic, ignored_macros) for diagnostic in diagnostics]
+
+
+def test_verdicts_equal_nested_loop():
+    """Findings with dense macro expansions get the same verdicts as by the nested loop."""
+    ignored_macros, diagnostics = get_benchmark_diagnostics()
+
+    verdicts = decide_compiled(ignored_macros, diagnostics)
+
+    assert verdicts == decide_by_nested_loop(ignored_macros, diagnostics)
+    assert verdicts.count(False) == BENCHMARK_DIAGNOSTICS // 10
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+def test_benchmark():
+    """Deciding on findings with dense macro expansions is faster than the nested loop."""
+    ignored_macros, diagnostics = get_benchmark_diagnostics()
+
+    compiled_seconds, _ = benchmark.measure(lambda: decide_compiled(ignored_macros, diagnostics))
+    nested_loop_seconds, _ = benchmark.measure(lambda: decide_by_nested_loop(ignored_macros, diagnostics))
+
+    assert (
+        compiled_seconds < nested_loop_seconds
+    ), f"{compiled_seconds:.3f}s compiled, {nested_loop_seconds:.3f}s nested loop"
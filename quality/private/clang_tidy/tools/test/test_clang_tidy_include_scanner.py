@@ -0,0 +1,98 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_include_scanner module.
+"""
+
+import os
+import stat
+import sys
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import quality.private.clang_tidy.tools.clang_tidy_include_scanner as unit
+
+FAKE_PREPROCESSOR = """#!{python}
+import sys
+
+src_file = sys.argv[-1]
+if src_file == "broken.cpp":
+    sys.exit(1)
+sys.stdout.write(src_file.replace(".cpp", ".o") + ": " + src_file + " \\\\\\n  include/" + src_file.replace(".cpp", ".h") + "\\n")
+"""
+
+
+@pytest.fixture(name="preprocessor")
+def fixture_preprocessor(tmp_path: Path) -> str:
+    """Provides a preprocessor which reports the header named after the source file as its only include."""
+    preprocessor = tmp_path / "preprocessor"
+    preprocessor.write_text(FAKE_PREPROCESSOR.format(python=sys.executable))
+    preprocessor.chmod(preprocessor.stat().st_mode | stat.S_IEXEC)
+    return str(preprocessor)
+
+
+@pytest.mark.parametrize(
+    "make_rule, expected_dependencies",
+    [
+        ("foo.o: foo.cpp foo.h\n", ["foo.cpp", "foo.h"]),
+        (
+            "foo.o: foo.cpp \\\n  include/foo.h \\\n  /usr/include/stdio.h\n",
+            ["foo.cpp", "include/foo.h", "/usr/include/stdio.h"],
+        ),
+        ("foo.o: foo.cpp my\\ header.h\n", ["foo.cpp", "my header.h"]),
+        ("", []),
+    ],
+)
+def test_parse_dependencies(make_rule: str, expected_dependencies: t.List[str]):
+    """Test the function parse_dependencies."""
+    assert unit.parse_dependencies(make_rule) == expected_dependencies
+
+
+def test_normalize_path():
+    """Paths within the working directory become exec paths."""
+    working_directory = os.path.join(os.sep, "execroot", "_main")
+
+    assert unit.normalize_path(os.path.join(working_directory, "include", "foo.h"), working_directory) == os.path.join(
+        "include", "foo.h"
+    )
+    assert unit.normalize_path("include/./foo.h", working_directory) == os.path.join("include", "foo.h")
+    assert unit.normalize_path("/usr/include/stdio.h", working_directory) == "/usr/include/stdio.h"
+
+
+def test_get_unused_inputs(preprocessor: str):
+    """Inputs which are not included by any translation unit are unused."""
+    translation_units = [("foo.cpp", ["clang-tidy"]), ("bar.cpp", ["clang-tidy"])]
+    prunable_inputs = ["include/foo.h", "include/bar.h", "include/baz.h", "baz.cpp"]
+
+    unused_inputs = unit.get_unused_inputs(preprocessor, translation_units, prunable_inputs)
+
+    assert unused_inputs == ["include/baz.h", "baz.cpp"]
+
+
+def test_get_unused_inputs_with_failing_scan(preprocessor: str):
+    """Nothing is reported as unused if any include scan fails."""
+    translation_units = [("foo.cpp", ["clang-tidy"]), ("broken.cpp", ["clang-tidy"])]
+
+    assert unit.get_unused_inputs(preprocessor, translation_units, ["include/baz.h"]) == []
+
+
+def test_write_unused_inputs(tmp_path: Path):
+    """The list contains one path per line."""
+    unused_inputs_list = tmp_path / "unused_inputs"
+
+    unit.write_unused_inputs(str(unused_inputs_list), ["include/baz.h", "baz.cpp"])
+
+    assert unused_inputs_list.read_text() == "include/baz.h\nbaz.cpp\n"
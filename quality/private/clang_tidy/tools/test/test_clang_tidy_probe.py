@@ -0,0 +1,104 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_probe module.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+import quality.private.clang_tidy.tools.clang_tidy_probe as unit
+
+
+@pytest.fixture(name="clang_tidy_bin")
+def fixture_clang_tidy_bin(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Provides a fake binary along with empty probe caches."""
+    monkeypatch.setenv(unit.CACHE_DIR_ENV, str(tmp_path / "cache"))
+    monkeypatch.setattr(unit, "_PROBE_CACHE", {})
+    clang_tidy_bin = tmp_path / "clang-tidy"
+    clang_tidy_bin.write_text("binary")
+    return clang_tidy_bin
+
+
+def mock_subprocess(mocker: MockerFixture, stdout: str):
+    """Mocks the spawned binary."""
+    return mocker.patch(
+        "subprocess.run",
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr=""),
+    )
+
+
+def test_get_version_spawns_binary_once(clang_tidy_bin: Path, mocker: MockerFixture):
+    """Repeated probes are answered from the in-process cache."""
+    run_mock = mock_subprocess(mocker, "LLVM version 19.1.0\n")
+
+    assert unit.get_version(str(clang_tidy_bin)) == "LLVM version 19.1.0\n"
+    assert unit.get_version(str(clang_tidy_bin)) == "LLVM version 19.1.0\n"
+
+    run_mock.assert_called_once()
+    assert run_mock.call_args.args[0] == [str(clang_tidy_bin), "--version"]
+
+
+def test_probe_is_cached_on_disk(clang_tidy_bin: Path, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch):
+    """A new process reuses the probe of a previous one."""
+    run_mock = mock_subprocess(mocker, "LLVM version 19.1.0\n")
+    unit.get_version(str(clang_tidy_bin))
+    monkeypatch.setattr(unit, "_PROBE_CACHE", {})
+
+    assert unit.get_version(str(clang_tidy_bin)) == "LLVM version 19.1.0\n"
+    run_mock.assert_called_once()
+
+
+def test_probe_is_invalidated_by_changed_binary(clang_tidy_bin: Path, mocker: MockerFixture):
+    """Another binary at the same path is probed again."""
+    run_mock = mock_subprocess(mocker, "LLVM version 19.1.0\n")
+    unit.get_version(str(clang_tidy_bin))
+
+    clang_tidy_bin.write_text("updated binary")
+    unit.get_version(str(clang_tidy_bin))
+
+    assert run_mock.call_count == 2
+
+
+def test_probe_without_binary(tmp_path: Path, mocker: MockerFixture):
+    """A binary which cannot be stat'ed is probed without any caching."""
+    run_mock = mock_subprocess(mocker, "")
+
+    unit.get_version(str(tmp_path / "missing"))
+    unit.get_version(str(tmp_path / "missing"))
+
+    assert run_mock.call_count == 2
+
+
+def test_probe_with_unwritable_cache(clang_tidy_bin: Path, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch):
+    """Failing to write the on-disk cache does not fail the probe."""
+    cache_dir = clang_tidy_bin.parent / "file"
+    cache_dir.write_text("")
+    monkeypatch.setenv(unit.CACHE_DIR_ENV, str(cache_dir))
+    mock_subprocess(mocker, "LLVM version 19.1.0\n")
+
+    assert unit.get_version(str(clang_tidy_bin)) == "LLVM version 19.1.0\n"
+
+
+def test_get_available_checks(clang_tidy_bin: Path, mocker: MockerFixture):
+    """The list of checks is parsed from the `--list-checks` output."""
+    run_mock = mock_subprocess(
+        mocker, "Enabled checks:\n    bugprone-macro-parentheses\n    misc-unused-alias-decls\n\n"
+    )
+
+    assert unit.get_available_checks(str(clang_tidy_bin)) == ["bugprone-macro-parentheses", "misc-unused-alias-decls"]
+    assert run_mock.call_args.args[0] == [str(clang_tidy_bin), "--list-checks", "--checks=*"]
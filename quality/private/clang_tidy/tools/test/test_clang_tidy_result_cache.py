@@ -0,0 +1,174 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_result_cache module.
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+import quality.private.clang_tidy.tools.clang_tidy_result_cache as unit
+from quality.private.clang_tidy.tools import common
+
+FAKE_PREPROCESSOR = """#!{python}
+import sys
+
+if "fail" in sys.argv:
+    sys.exit(1)
+with open(sys.argv[-1], encoding="utf-8") as src_file:
+    sys.stdout.write(src_file.read())
+"""
+
+
+@pytest.fixture(name="preprocessor")
+def fixture_preprocessor(tmp_path: Path, mocker: MockerFixture) -> str:
+    """Provides a preprocessor which just prints the source file, along with a fixed clang-tidy version."""
+    mocker.patch.object(unit.clang_tidy_probe, "get_version", return_value="LLVM version 19.1.0")
+    preprocessor = tmp_path / "preprocessor"
+    preprocessor.write_text(FAKE_PREPROCESSOR.format(python=sys.executable))
+    preprocessor.chmod(preprocessor.stat().st_mode | stat.S_IEXEC)
+    return str(preprocessor)
+
+
+def get_entry(stdout: str = "stdout") -> unit.CacheEntry:
+    """Helper that provides a cache entry."""
+    return unit.CacheEntry(
+        returncode=0,
+        stdout=stdout,
+        stderr="1 warning generated.",
+        fixes="---\nDiagnostics: []\n...\n",
+        tidy_findings=common.TidyFindings(errors=0, warnings=1, suppressions=0, nolints=0, counting=1),
+        no_tidy_findings=False,
+    )
+
+
+def test_get_preprocessor_command():
+    """Output related flags are dropped and the source file is preprocessed to stdout."""
+    compile_arguments = ["clang-tidy", "-Iinclude", "-c", "foo.cpp", "-o", "foo.o", "-MF", "foo.d", "-DFOO"]
+
+    command = unit.get_preprocessor_command("clang", compile_arguments, "foo.cpp")
+
+    assert command == ["clang", "-Iinclude", "-DFOO", "-E", "-C", "-dD", "-w", "foo.cpp"]
+
+
+def test_normalize():
+    """The working directory is stripped from paths."""
+    assert unit.normalize("/sandbox/1/execroot/bazel-out/foo", "/sandbox/1/execroot") == "bazel-out/foo"
+    assert unit.normalize("/sandbox/1/execroot", "/sandbox/1/execroot") == "."
+
+
+def test_get_cache_key(tmp_path: Path, preprocessor: str):
+    """The key changes with the preprocessed source, the flags and the config."""
+    src_file = tmp_path / "foo.cpp"
+    src_file.write_text("int main() {}\n")
+    config_file = tmp_path / ".clang-tidy"
+    config_file.write_text("Checks: '-*,bugprone-*'\n")
+
+    def get_cache_key(command):
+        return unit.get_cache_key(
+            preprocessor, ["clang-tidy", "-DFOO"], str(src_file), command, str(config_file), "clang-tidy"
+        )
+
+    key = get_cache_key(["clang-tidy", "--use-color"])
+    assert key == get_cache_key(["clang-tidy", "--use-color"])
+    assert key != get_cache_key(["clang-tidy", "--system-headers"])
+
+    config_file.write_text("Checks: '-*,misc-*'\n")
+    changed_config_key = get_cache_key(["clang-tidy", "--use-color"])
+    assert changed_config_key != key
+
+    src_file.write_text("int main() { return 0; }\n")
+    assert get_cache_key(["clang-tidy", "--use-color"]) not in [key, changed_config_key]
+
+
+def test_get_cache_key_when_preprocessing_fails(tmp_path: Path, preprocessor: str):
+    """Without the preprocessed source there is no key."""
+    config_file = tmp_path / ".clang-tidy"
+    config_file.write_text("")
+
+    key = unit.get_cache_key(preprocessor, ["clang-tidy", "fail"], "foo.cpp", ["clang-tidy"], str(config_file), "")
+
+    assert key is None
+
+
+def test_store_and_load(tmp_path: Path):
+    """A stored entry is loaded again, a missing one is a miss."""
+    unit.store(str(tmp_path), "abcdef", get_entry(), max_size=1024 * 1024)
+
+    assert unit.load(str(tmp_path), "abcdef") == get_entry()
+    assert unit.load(str(tmp_path), "fedcba") is None
+
+
+def test_replay(tmp_path: Path):
+    """Replaying restores the fixes file and provides the stored result."""
+    fixes = tmp_path / "foo.fixes.yaml"
+
+    result, tidy_findings, no_tidy_findings = unit.replay(get_entry(), str(fixes))
+
+    assert fixes.read_text() == get_entry().fixes
+    assert (result.returncode, result.stdout, result.stderr) == (0, "stdout", "1 warning generated.")
+    assert tidy_findings == get_entry().tidy_findings
+    assert not no_tidy_findings
+
+
+def test_evict_least_recently_used(tmp_path: Path):
+    """Once the maximum size is exceeded, the least recently used entries are evicted."""
+    for index, key in enumerate(["aa1", "bb2", "cc3"]):
+        unit.store(str(tmp_path), key, get_entry(), max_size=1024 * 1024)
+        os.utime(unit.get_entry_path(str(tmp_path), key), (index, index))
+    # Loading marks the oldest entry as recently used
+    unit.load(str(tmp_path), "aa1")
+
+    entry_size = os.path.getsize(unit.get_entry_path(str(tmp_path), "aa1"))
+    unit.evict(str(tmp_path), max_size=2 * entry_size)
+
+    assert [unit.load(str(tmp_path), key) is not None for key in ["aa1", "bb2", "cc3"]] == [True, False, True]
+
+
+def test_store_tracks_size(tmp_path: Path, mocker: MockerFixture):
+    """The cache directory is only scanned once the tracked size exceeds the maximum size."""
+    evict = mocker.spy(unit, "evict")
+    entry_size = None
+    for key in ["aa1", "bb2", "cc3", "aa1"]:
+        unit.store(str(tmp_path), key, get_entry(), max_size=3 * 1024)
+        entry_size = entry_size or os.path.getsize(unit.get_entry_path(str(tmp_path), key))
+
+    # The first store has no tracked size yet, overwriting an entry does not grow the cache
+    assert evict.call_count == 1
+    assert unit.read_size(str(tmp_path)) == 3 * entry_size
+
+    unit.store(str(tmp_path), "dd4", get_entry(), max_size=3 * entry_size)
+
+    assert evict.call_count == 2
+    assert unit.read_size(str(tmp_path)) <= 3 * entry_size * unit.EVICTED_SIZE_RATIO
+    assert unit.read_size(str(tmp_path)) == sum(
+        os.path.getsize(unit.get_entry_path(str(tmp_path), key))
+        for key in ["aa1", "bb2", "cc3", "dd4"]
+        if os.path.exists(unit.get_entry_path(str(tmp_path), key))
+    )
+
+
+def test_replay_findings(tmp_path: Path):
+    """The findings file is restored along with the fixes file, if the entry has stored it."""
+    findings = tmp_path / "foo.findings.jsonl"
+    entry = get_entry()._replace(findings='{"file":"foo.cpp"}\n')
+
+    unit.replay(entry, None, str(findings))
+
+    assert findings.read_text() == entry.findings
@@ -15,6 +15,8 @@
 Tests for the clang_tidy_result_filter module
 """
 
+import io
+import json
 import logging
 import os
 import tempfile
@@ -26,7 +28,13 @@ import pytest
 import ruamel.yaml
 
 import quality.private.clang_tidy.tools.clang_tidy_result_filter as unit
-from quality.private.clang_tidy.tools import clang_tidy_runner, common
+from quality.private.clang_tidy.tools import (
+    clang_tidy_changed_lines,
+    clang_tidy_findings,
+    clang_tidy_runner,
+    common,
+)
+from quality.private.common.tools.test import benchmark
 
 VALID_INPUT = """
 app/fas/test/determinant_unit2_test.cpp:68:1: warning: variable 'gtest_DeterminantTestFixture_Determinant3DPositive_registered_' is non-const and globally accessible, consider making it const [cppcoreguidelines-avoid-non-const-global-variables]
@@ -629,3 +637,247 @@ def test_get_ignored_macros(
 
     assert macros == expected_macros
     assert expected_log in caplog.text
+
+
+def test_drop_foreign_findings(monkeypatch: pytest.MonkeyPatch):
+    """Findings in foreign headers are dropped, absolute paths below the working directory are made relative."""
+    working_directory = os.path.join(os.sep, "execroot", "_main")
+    monkeypatch.setattr(unit, "getcwd", lambda: working_directory)
+
+    def get_finding(file_path: str) -> unit.FindingOutput:
+        return unit.FindingOutput({"DiagnosticMessage": {"FilePath": file_path}}, f"{file_path}: warning")
+
+    findings = [
+        get_finding("lib/foo.cpp"),
+        get_finding(os.path.join(working_directory, "lib", "bar.h")),
+        get_finding("lib/./baz.h"),
+        get_finding("/usr/include/stdio.h"),
+        get_finding(""),
+    ]
+
+    owned_findings = unit.drop_foreign_findings(findings, ["lib/bar.h", "lib/baz.h"])
+
+    assert owned_findings == [findings[0], findings[3], findings[4]]
+    assert unit.drop_foreign_findings(findings, None) == findings
+
+
+def test_drop_unchanged_findings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Only findings on changed lines are kept, findings without a location are never dropped."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "foo.cpp").write_text("int a;\nint b;\nint c;\n")
+    changed_lines = clang_tidy_changed_lines.ChangedLines({"foo.cpp": [[2, 2]]})
+
+    def get_finding(file_path: str, offset: int) -> unit.FindingOutput:
+        return unit.FindingOutput(
+            {"DiagnosticMessage": {"FilePath": file_path, "FileOffset": offset}}, f"{file_path}: warning"
+        )
+
+    findings = [get_finding("foo.cpp", 0), get_finding("foo.cpp", 9), get_finding("", 0)]
+
+    assert unit.drop_unchanged_findings(findings, changed_lines) == findings[1:]
+    assert unit.drop_unchanged_findings(findings, None) == findings
+
+
+def test_filter_stdout_writes_findings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    The filtered findings are written as records, built from their diagnostics. Their files are relative to the
+    execution root, even if its files are symlinks into the workspace like in a sandbox.
+    """
+    workspace = tmp_path / "workspace"
+    (workspace / "lib").mkdir(parents=True)
+    (workspace / "lib" / "source.cpp").write_text("int a;\nint b = 5;\n")
+    execroot = tmp_path / "execroot"
+    execroot.mkdir()
+    (execroot / "lib").symlink_to(workspace / "lib", target_is_directory=True)
+    monkeypatch.chdir(execroot)
+    src_file = execroot / "lib" / "source.cpp"
+    fixes = tmp_path / "source.fixes.yaml"
+    fixes.write_text(SINGLE_INPUT_FIXES_YAML.replace("/tmp/source.cpp", str(src_file)))
+    findings = tmp_path / "source.findings.jsonl"
+
+    unit.filter_stdout(SINGLE_INPUT, [], str(fixes), uses_color=False, findings_path=str(findings))
+
+    assert list(clang_tidy_findings.read(str(findings))) == [
+        {
+            "file": "lib/source.cpp",
+            "line": 2,
+            "column": 4,
+            "check": "magic-number",
+            "level": "warning",
+            "message": "5 is magic",
+        }
+    ]
+
+
+def test_parse_warnings_slices_output():
+    """Each warning reaches from the start of its line up to the line of the next warning."""
+    output = "prefix\n" + SINGLE_INPUT.lstrip("\n") * 2
+
+    assert unit.parse_warnings(output, uses_color=False) == [
+        "\x1b[0m\nfoo/bar.cpp:78:1: error: variable 'naming' [check]\nvoid name\n     ^",
+        "\x1b[0m\nfoo/bar.cpp:78:1: error: variable 'naming' [check]\nvoid name\n     ^\n",
+    ]
+
+
+@pytest.mark.parametrize("uses_color", [False, True])
+def test_parse_warnings_splits_all_findings(uses_color: bool):
+    """Each of many findings in the output is split into its own warning."""
+    single_input = SINGLE_COLORED_INPUT + "\n" if uses_color else SINGLE_INPUT
+
+    warnings = unit.parse_warnings(single_input * 1000, uses_color)
+
+    assert len(warnings) == 1000
+    assert len(set(warnings[:-1])) == 1
+
+
+@pytest.mark.parametrize(
+    "output, uses_color",
+    [
+        ("prefix\n" + SINGLE_INPUT.lstrip("\n") * 2, False),
+        (VALID_INPUT, False),
+        (HUGE_OUTPUT, False),
+        (EMPTY_INPUT, False),
+        ((SINGLE_COLORED_INPUT + "\n") * 3, True),
+        (SINGLE_COLORED_INPUT_ERROR_MULTILINE, True),
+    ],
+)
+def test_split_warnings_of_lines(output: str, uses_color: bool):
+    """The warnings split from the lines of an output are the ones parsed from the complete output."""
+    assert list(unit.split_warnings(io.StringIO(output), uses_color)) == unit.parse_warnings(output, uses_color)
+
+
+def test_filter_stdout_of_lines(tmp_path: Path):
+    """An output given as an iterable of its lines is filtered like the complete output."""
+    fixes = tmp_path / "source.fixes.yaml"
+    fixes.write_text(SINGLE_INPUT_FIXES_YAML)
+    expected = unit.filter_stdout(SINGLE_INPUT, [], str(fixes), uses_color=False)
+    fixes.write_text(SINGLE_INPUT_FIXES_YAML)
+
+    assert unit.filter_stdout(io.StringIO(SINGLE_INPUT), [], str(fixes), uses_color=False) == expected
+
+
+def test_filter_stdout_of_lines_with_missing_findings(tmp_path: Path):
+    """Each diagnostic needs its finding in the output, also if the findings are split while reading."""
+    fixes = tmp_path / "source.fixes.yaml"
+    fixes.write_text(SINGLE_INPUT_FIXES_YAML)
+
+    with pytest.raises(AssertionError, match="Number of diagnostic items do not match number of findings"):
+        unit.filter_stdout(io.StringIO(EMPTY_INPUT), [], str(fixes), uses_color=False)
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+@pytest.mark.parametrize("uses_color", [False, True])
+def test_parse_warnings_scales_linearly(uses_color: bool):
+    """Splitting the output of four times the findings takes about four times as long, not sixteen."""
+    single_input = SINGLE_COLORED_INPUT + "\n" if uses_color else SINGLE_INPUT
+    output = single_input * 10000
+    four_times_output = single_input * 40000
+
+    seconds, _ = benchmark.measure(lambda: unit.parse_warnings(output, uses_color))
+    four_times_seconds, _ = benchmark.measure(lambda: unit.parse_warnings(four_times_output, uses_color))
+
+    assert four_times_seconds < 8 * seconds, f"{seconds:.3f}s, four times the findings: {four_times_seconds:.3f}s"
+
+
+def test_filter_stdout_writes_suppression_stats(tmp_path: Path):
+    """The suppressed findings are counted per pattern, patterns without hits are listed as well."""
+    src_file = tmp_path / "source.cpp"
+    src_file.write_text("int a;\nint b = 5;\n")
+    fixes = tmp_path / "source.fixes.yaml"
+    fixes.write_text(SINGLE_INPUT_FIXES_YAML.replace("/tmp/source.cpp", str(src_file)))
+    suppression_stats = tmp_path / "source.suppression_stats.json"
+
+    _, tidy_findings = unit.filter_stdout(
+        SINGLE_INPUT,
+        ["unused", r"\d+ is magic"],
+        str(fixes),
+        uses_color=False,
+        suppression_stats_path=str(suppression_stats),
+    )
+
+    assert tidy_findings.suppressions == 1
+    assert json.loads(suppression_stats.read_text()) == {"diagnostics": 1, "hits": {"unused": 0, r"\d+ is magic": 1}}
+
+
+def make_symlink_forest(tmp_path: Path, files: int, depth: int) -> t.List[str]:
+    """Helper that mimics a sandbox, its files are reached via a chain of directory symlinks into the execroot."""
+    execroot = tmp_path / "execroot"
+    execroot.mkdir()
+    for index in range(files):
+        (execroot / f"header_{index}.h").write_text("int a;\n")
+
+    target = execroot
+    for level in range(depth):
+        link = tmp_path / f"sandbox_{level}"
+        link.symlink_to(target, target_is_directory=True)
+        target = link
+    return [str(target / f"header_{index}.h") for index in range(files)]
+
+
+def filter_symlinked_diagnostics(file_paths: t.List[str], diagnostics_per_file: int) -> None:
+    """Helper that filters and rewrites diagnostics located in the given files."""
+    diagnostics = []
+    warnings = []
+    for file_path in file_paths * diagnostics_per_file:
+        diagnostics.append(
+            {
+                "DiagnosticName": "misc-check",
+                "DiagnosticMessage": {"Message": "message", "FilePath": file_path},
+                "Level": "Warning",
+            }
+        )
+        warnings.append(f"{file_path}:1:1: warning: message [misc-check]")
+
+    resolver = unit.PathResolver()
+    filtered_warnings, _ = unit.filter_warnings([""], diagnostics, warnings, resolver)
+    unit.filter_findings([], diagnostics, warnings, resolver=resolver)
+    unit.remove_symlinks({"Diagnostics": [finding.diagnostic for finding in filtered_warnings]}, resolver)
+    assert len(filtered_warnings) == len(diagnostics)
+
+
+def test_path_resolution_is_memoized(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The symlink chains of a file are resolved once per run, no matter how many diagnostics it has."""
+    file_paths = make_symlink_forest(tmp_path, files=20, depth=8)
+    lstat_calls = []
+    lstat = os.lstat
+    monkeypatch.setattr(os, "lstat", lambda *args, **kwargs: lstat_calls.append(args) or lstat(*args, **kwargs))
+
+    filter_symlinked_diagnostics(file_paths, diagnostics_per_file=1)
+    calls_per_run = len(lstat_calls)
+    lstat_calls.clear()
+    filter_symlinked_diagnostics(file_paths, diagnostics_per_file=50)
+
+    assert len(lstat_calls) == calls_per_run
+
+
+def test_path_resolution_is_not_shared(tmp_path: Path):
+    """Each run resolves the paths again, e.g. a sandbox symlink which points elsewhere in the next build."""
+    for name in ["a.h", "b.h"]:
+        (tmp_path / name).write_text("int a;\n")
+    link = tmp_path / "link.h"
+    link.symlink_to(tmp_path / "a.h")
+    resolver = unit.PathResolver()
+    assert resolver.resolve(str(link)) == str(tmp_path / "a.h")
+
+    link.unlink()
+    link.symlink_to(tmp_path / "b.h")
+
+    assert resolver.resolve(str(link)) == str(tmp_path / "a.h")
+    assert unit.PathResolver().resolve(str(link)) == str(tmp_path / "b.h")
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+def test_path_resolution_benchmark(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Filtering the diagnostics of a sandbox-like symlink forest is faster with the memoized path resolution."""
+    file_paths = make_symlink_forest(tmp_path, files=20, depth=8)
+
+    def filter_diagnostics() -> None:
+        filter_symlinked_diagnostics(file_paths, diagnostics_per_file=25)
+
+    memoized_seconds, _ = benchmark.measure(filter_diagnostics)
+    with monkeypatch.context() as patch:
+        patch.setattr(unit.PathResolver, "resolve", lambda _, file_path: os.path.realpath(file_path))
+        patch.setattr(unit.PathResolver, "is_file", lambda _, file_path: os.path.isfile(file_path))
+        uncached_seconds, _ = benchmark.measure(filter_diagnostics)
+
+    assert memoized_seconds < uncached_seconds, f"{memoized_seconds:.3f}s memoized, {uncached_seconds:.3f}s uncached"
@@ -15,10 +15,13 @@
 Tests for the clang_tidy_runner module.
 """
 
+import io
 import json
 import logging
 import os
 import subprocess
+import sys
+import tempfile
 import typing as t
 import unittest
 from contextlib import nullcontext
@@ -30,7 +33,18 @@ import ruamel.yaml
 from pytest_mock import MockerFixture
 
 import quality.private.clang_tidy.tools.clang_tidy_runner as unit
-from quality.private.clang_tidy.tools import common
+from quality.private.clang_tidy.tools import (
+    clang_tidy_changed_lines,
+    clang_tidy_findings,
+    common,
+    persistent_worker,
+)
+
+
+@pytest.fixture(autouse=True)
+def version_probe(mocker: MockerFixture):
+    """The tests do not launch clang-tidy, hence its version is not probed either."""
+    return mocker.patch.object(unit.clang_tidy_probe, "get_version", return_value="")
 
 
 def get_all_keys_from_yaml(yaml_config_string):
@@ -119,8 +133,9 @@ def get_default_build_command_args() -> dict:
 class ClangTidyRunnerTests(unittest.TestCase):
     """Test class for Clang Tidy Runner."""
 
-    @patch(
-        "subprocess.run",
+    @patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(args=[], returncode=0, stderr="", stdout=""),
     )
     def test_run_clang_tidy_no_output(self, subprocess_patch):
@@ -129,8 +144,9 @@ class ClangTidyRunnerTests(unittest.TestCase):
         subprocess_patch.assert_called()
         self.assertTrue(success)
 
-    @patch(
-        "subprocess.run",
+    @patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(
             args=[],
             returncode=0,
@@ -144,8 +160,9 @@ class ClangTidyRunnerTests(unittest.TestCase):
         subprocess_patch.assert_called()
         self.assertTrue(success)
 
-    @patch(
-        "subprocess.run",
+    @patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(
             args=[],
             returncode=1,
@@ -159,8 +176,9 @@ class ClangTidyRunnerTests(unittest.TestCase):
         subprocess_patch.assert_called()
         self.assertFalse(success)
 
-    @patch(
-        "subprocess.run",
+    @patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(
             args=[],
             returncode=0,
@@ -174,6 +192,21 @@ class ClangTidyRunnerTests(unittest.TestCase):
         subprocess_patch.assert_called()
         self.assertTrue(success)
 
+    @patch.object(
+        unit,
+        "run_buffered",
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stderr="", stdout=""),
+    )
+    def test_run_clang_tidy_probes_version_only_when_verbose(self, subprocess_patch):
+        """Test run clang tidy only spawns the version probe in verbose mode."""
+        with patch.object(unit.clang_tidy_probe, "get_version", return_value="") as get_version_patch:
+            unit.run_clang_tidy(**{**get_default_run_clang_tidy_args(), "verbose": False})
+            get_version_patch.assert_not_called()
+            self.assertEqual(subprocess_patch.call_count, 1)
+
+            unit.run_clang_tidy(**{**get_default_run_clang_tidy_args(), "verbose": True})
+            get_version_patch.assert_called_once()
+
     def test_get_result_count(self):
         """Test get result count."""
         self.assertEqual(unit.get_result_count(r"(.*)", "100"), 100)
@@ -201,6 +234,15 @@ class ClangTidyRunnerTests(unittest.TestCase):
         self.assertEqual(results.suppressions, 4535)
         self.assertEqual(results.nolints, 71)
 
+    def test_check_output_only_counts_first_match(self):
+        """Test check output only counts the first match of each summary, as for a single search."""
+        arbitrary_output = (
+            "foo.cpp:1:1: warning: 3 errors in macro [check]\n2 warnings generated.\n5 errors generated.\n"
+        )
+        results = unit.check_output(arbitrary_output)
+        self.assertEqual(results.errors, 3)
+        self.assertEqual(results.warnings, 2)
+
     def test_build_command_when_all_possible_arguments_are_used(self):
         """Test build command when all possible arguments are used."""
         run_args = get_default_build_command_args()
@@ -376,8 +418,9 @@ def test_run_clang_tidy_internal_error(mocker: MockerFixture, caplog: pytest.Log
     """Test run_clang_tidy when a clang_tidy internal error occurs."""
     stderr = "clang-tidy internal error"
 
-    mocker.patch(
-        "subprocess.run",
+    mocker.patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(
             args=[],
             returncode=1,
@@ -396,8 +439,9 @@ def test_run_clang_tidy_non_verbose_no_fixes(mocker: MockerFixture, caplog: pyte
     args["fixes"] = None
     args["verbose"] = False
 
-    mocker.patch(
-        "subprocess.run",
+    mocker.patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(args=[], returncode=0, stderr="", stdout=""),
     )
 
@@ -415,8 +459,9 @@ def test_run_clang_tidy_one_warning_not_treated_as_error(mocker: MockerFixture):
     args = get_default_run_clang_tidy_args()
     args["treat_clang_tidy_warnings_as_errors"] = False
 
-    mocker.patch(
-        "subprocess.run",
+    mocker.patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(
             args=[],
             returncode=0,
@@ -601,6 +646,10 @@ def test_filter_results(  # pylint: disable=too-many-arguments
         expected_stdout_arg,
         fixes,
         uses_color=True,
+        foreign_headers=None,
+        changed_lines=None,
+        findings_path=None,
+        suppression_stats_path=None,
     )
 
 
@@ -625,7 +674,7 @@ def test_find_clang_tidy_config(
 ):
     """Test the function find_clang_tidy_config."""
 
-    mocker.patch("glob.glob", return_value=expected_config_files)
+    mocker.patch.object(unit, "get_runfiles_index", return_value={"config_name": expected_config_files})
 
     with expected_behavior as e, caplog.at_level(logging.DEBUG):
         assert unit.find_clang_tidy_config("config_name") == e
@@ -633,6 +682,43 @@ def test_find_clang_tidy_config(
     assert expected_log_message in caplog.text
 
 
+def test_find_clang_tidy_config_with_path(tmp_path: Path, mocker: MockerFixture):
+    """A config path passed by the aspect is used without looking into the index."""
+    config_file = tmp_path / ".clang-tidy"
+    config_file.write_text("Checks: '*'")
+    index_mock = mocker.patch.object(unit, "get_runfiles_index")
+
+    assert unit.find_clang_tidy_config(str(config_file)) == str(config_file)
+    index_mock.assert_not_called()
+
+
+def test_get_runfiles_index_by_walking_the_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Without a runfiles manifest the tree is walked once and the index is cached."""
+    monkeypatch.delenv("RUNFILES_MANIFEST_FILE", raising=False)
+    monkeypatch.setattr(unit, "_RUNFILES_INDEX_CACHE", {})
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / ".clang-tidy").write_text("")
+    (tmp_path / "b" / ".clang-tidy").write_text("")
+
+    index = unit.get_runfiles_index(str(tmp_path))
+    (tmp_path / "c").write_text("")
+
+    assert index[".clang-tidy"] == [os.path.join("a", ".clang-tidy"), os.path.join("b", ".clang-tidy")]
+    assert unit.get_runfiles_index(str(tmp_path)) is index
+    assert "c" not in index
+
+
+def test_get_runfiles_index_from_manifest(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The runfiles manifest is preferred over walking the tree."""
+    manifest_file = tmp_path / "MANIFEST"
+    manifest_file.write_text("_main/config/.clang-tidy /abs/config/.clang-tidy\n_main/empty \n")
+    monkeypatch.setenv("RUNFILES_MANIFEST_FILE", str(manifest_file))
+    monkeypatch.setattr(unit, "_RUNFILES_INDEX_CACHE", {})
+
+    assert unit.get_runfiles_index(str(tmp_path)) == {".clang-tidy": ["/abs/config/.clang-tidy"]}
+
+
 @pytest.mark.parametrize(
     "yaml_config, custom_option_dict, expected_dict",
     [
@@ -728,8 +814,9 @@ def test_windows_specifics(mocker: MockerFixture):
     warnings_as_errors_index = args.index("--warnings-as-errors")
     assert args[warnings_as_errors_index + 1] == "'*'"
 
-    mocker.patch(
-        "subprocess.run",
+    mocker.patch.object(
+        unit,
+        "run_buffered",
         return_value=subprocess.CompletedProcess(
             args=[],
             returncode=0,
@@ -742,3 +829,550 @@ def test_windows_specifics(mocker: MockerFixture):
     assert os.environ["PROGRAMDATA"] == "C:\\ProgramData"
     assert os.environ["SYSTEMROOT"] == "C:\\WINDOWS"
     assert os.environ["WINDIR"] == "C:\\WINDOWS"
+
+
+def test_get_merged_config_path():
+    """The merged config is placed next to the compile commands file, if any."""
+    assert unit.get_merged_config_path("/tmp/foo/compile_commands.json") == Path("/tmp/foo/.clang-tidy-merged")
+    assert unit.get_merged_config_path(None) == Path(".clang-tidy-merged")
+
+
+@pytest.mark.parametrize(
+    "extra_args, run_result, expected_exit_code, expected_output",
+    [
+        ([], True, 0, ""),
+        (["--treat_clang_tidy_warnings_as_errors"], False, 1, "At least one clang-tidy finding was treated as error."),
+        ([], SystemExit(1), 1, ""),
+    ],
+)
+def test_process_work_request(
+    mocker: MockerFixture,
+    extra_args: list,
+    run_result: t.Union[bool, SystemExit],
+    expected_exit_code: int,
+    expected_output: str,
+):
+    """Test the function process_work_request."""
+    arguments = [
+        "--src_file",
+        "/source.cpp",
+        "--fixes",
+        "/fixes/",
+        "--tool_bin",
+        "clang_tidy_bin",
+        "--config_file",
+        ".clang_tidy",
+    ]
+
+    mocker.patch(
+        "quality.private.clang_tidy.tools.clang_tidy_runner.run_clang_tidy",
+        side_effect=[run_result],
+    )
+
+    exit_code, output = unit.process_work_request(arguments + extra_args)
+
+    assert exit_code == expected_exit_code
+    assert expected_output in output
+
+
+@pytest.mark.parametrize(
+    "arguments, expected_error",
+    [
+        (
+            ["--src_file", "a.cpp", "--fixes", "a.yaml", "--tool_bin", "clang-tidy", "--config_file", ".clang-tidy"]
+            + ["--bogus_flag"],
+            "unrecognized arguments: --bogus_flag",
+        ),
+        (["--bogus_flag"], "the following arguments are required: --src_file, --fixes, --tool_bin"),
+        (
+            ["--src_file", "a.cpp", "--src_file", "b.cpp", "--fixes", "a.yaml", "--tool_bin", "clang-tidy"]
+            + ["--config_file", ".clang-tidy"],
+            "--fixes must be given exactly once per --src_file",
+        ),
+    ],
+)
+def test_process_work_request_with_invalid_arguments(
+    capsys: pytest.CaptureFixture, arguments: t.List[str], expected_error: str
+):
+    """The usage and the error of invalid arguments are the output of the work response."""
+    response = persistent_worker.process_request({"arguments": arguments}, unit.process_work_request)
+
+    assert response["exitCode"] == 2
+    assert response["output"].startswith("usage: ")
+    assert f"error: {expected_error}\n" in response["output"]
+    assert capsys.readouterr().err == ""
+
+
+def test_main_as_persistent_worker(mocker: MockerFixture):
+    """Test the main function when started as a persistent worker."""
+    mocker.patch("sys.argv", ["clang_tidy_runner", "--persistent_worker"])
+    worker_run_mock = mocker.patch(
+        "quality.private.clang_tidy.tools.persistent_worker.run",
+        return_value=0,
+    )
+
+    assert unit.main() == 0
+    worker_run_mock.assert_called_once_with(unit.process_work_request)
+
+
+def get_batch_arguments(src_files: t.List[str]) -> t.List[str]:
+    """Helper that provides runner arguments for multiple translation units."""
+    arguments = ["--tool_bin", "clang_tidy_bin", "--config_file", ".clang_tidy", "--jobs", "2"]
+    for src_file in src_files:
+        arguments += [
+            "--src_file",
+            src_file,
+            "--arguments",
+            f"clang-tidy;-DFILE={src_file}",
+            "--compile_commands_file",
+            f"/tmp/{src_file}/compile_commands.json",
+            "--fixes",
+            f"/tmp/{src_file}.fixes.yaml",
+        ]
+    return arguments
+
+
+def test_parse_args_with_missing_per_file_arguments():
+    """Per file arguments must be given once per src file."""
+    arguments = get_batch_arguments(["a.cpp", "b.cpp"]) + ["--src_file", "c.cpp"]
+
+    with pytest.raises(SystemExit):
+        unit.parse_args(arguments)
+
+
+def test_get_translation_units():
+    """Test the function get_translation_units."""
+    translation_units = unit.get_translation_units(unit.parse_args(get_batch_arguments(["a.cpp", "b.cpp"])))
+
+    assert translation_units == [
+        common.TranslationUnit(
+            "a.cpp", "clang-tidy;-DFILE=a.cpp", "/tmp/a.cpp/compile_commands.json", "/tmp/a.cpp.fixes.yaml"
+        ),
+        common.TranslationUnit(
+            "b.cpp", "clang-tidy;-DFILE=b.cpp", "/tmp/b.cpp/compile_commands.json", "/tmp/b.cpp.fixes.yaml"
+        ),
+    ]
+
+
+def test_execute_multiple_translation_units(mocker: MockerFixture, caplog: pytest.LogCaptureFixture):
+    """Each translation unit is analyzed and its output is presented en bloc."""
+    src_files = ["a.cpp", "b.cpp", "fail.cpp", "d.cpp"]
+
+    def run_clang_tidy(src_file, *_):
+        logging.info(f"start {src_file}")
+        logging.info(f"end {src_file}")
+        return src_file != "fail.cpp"
+
+    run_clang_tidy_mock = mocker.patch(
+        "quality.private.clang_tidy.tools.clang_tidy_runner.run_clang_tidy",
+        side_effect=run_clang_tidy,
+    )
+
+    with caplog.at_level(logging.INFO):
+        exit_code = unit.execute(unit.parse_args(get_batch_arguments(src_files)))
+
+    assert exit_code == 1
+    assert sorted(call.args[0] for call in run_clang_tidy_mock.call_args_list) == sorted(src_files)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert sorted(messages) == sorted([f"{event} {src_file}" for src_file in src_files for event in ["start", "end"]])
+    for index in range(0, len(messages), 2):
+        assert messages[index].replace("start", "end") == messages[index + 1]
+
+
+def test_run_clang_tidy_with_merged_config_file(mocker: MockerFixture, tmp_path: Path):
+    """An already merged config is used as is, without loading and merging the config files."""
+    merged_config_file = tmp_path / ".clang-tidy-merged"
+    merged_config_file.write_text("Checks: '*'\n", encoding="utf-8")
+
+    args = get_default_run_clang_tidy_args()
+    args["config_files"] = None
+    args["merged_config_file"] = str(merged_config_file)
+
+    load_configuration_mock = mocker.patch("quality.private.clang_tidy.tools.clang_tidy_runner.load_configuration")
+    subprocess_mock = mocker.patch.object(
+        unit,
+        "run_buffered",
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stderr="", stdout=""),
+    )
+
+    assert unit.run_clang_tidy(**args)
+
+    load_configuration_mock.assert_not_called()
+    command = subprocess_mock.call_args.args[0]
+    assert command[command.index("--config-file") + 1] == str(merged_config_file)
+
+
+def test_parse_args_without_any_config():
+    """Either a config file or a merged config file is required."""
+    with pytest.raises(SystemExit):
+        unit.parse_args(["--src_file", "a.cpp", "--fixes", "a.yaml", "--tool_bin", "clang-tidy"])
+
+    args = unit.parse_args(
+        ["--src_file", "a.cpp", "--fixes", "a.yaml", "--tool_bin", "clang-tidy", "--merged_config_file", "merged"]
+    )
+    assert args.merged_config_file == "merged"
+
+
+STREAMED_CLANG_TIDY_SCRIPT = """
+import sys
+
+for index in range(2000):
+    sys.stdout.write(f"foo.cpp:{index}:1: warning: finding [check]\\n")
+sys.stderr.write("2000 warnings generated.\\nSuppressed 10 warnings (8 in non-user code, 2 NOLINT).\\n")
+sys.exit(1)
+"""
+
+
+def test_run_streamed(monkeypatch: pytest.MonkeyPatch):
+    """Output beyond the spool size is read back completely and the findings are counted while reading."""
+    monkeypatch.setattr(unit, "SPOOL_MAX_SIZE", 1024)
+
+    result = unit.run_streamed([sys.executable, "-c", STREAMED_CLANG_TIDY_SCRIPT], os.environ)
+
+    assert result.returncode == 1
+    assert result.tidy_findings == common.TidyFindings(
+        errors=0, warnings=2000, suppressions=10, nolints=2, counting=1992
+    )
+    assert sum(1 for line in result.stdout_lines() if "warning: finding" in line) == 2000
+    assert result.stdout.count("warning: finding") == 2000
+    assert result.stderr.startswith("2000 warnings generated.")
+
+    result.stdout = "filtered"
+    result.release()
+    assert result.stdout == "filtered"
+    assert result.stderr.startswith("2000 warnings generated.")
+
+
+def test_run_clang_tidy_with_stream_output(mocker: MockerFixture):
+    """
+    In streaming mode the findings of the streamed run are used instead of parsing the complete stderr. The
+    spools are closed once the run has been evaluated.
+    """
+    spools = [io.StringIO(""), io.StringIO("")]
+    streamed_result = unit.StreamedResult(0, *spools, common.TidyFindings(0, 0, 0, 0, 0))
+    run_streamed_mock = mocker.patch.object(unit, "run_streamed", return_value=streamed_result)
+    check_output_mock = mocker.patch.object(unit, "check_output")
+    subprocess_mock = mocker.patch.object(unit, "run_buffered")
+
+    assert unit.run_clang_tidy(**{**get_default_run_clang_tidy_args(), "verbose": False, "stream_output": True})
+
+    run_streamed_mock.assert_called_once()
+    check_output_mock.assert_not_called()
+    subprocess_mock.assert_not_called()
+    assert all(spool.closed for spool in spools)
+
+
+def test_run_clang_tidy_replays_cached_result(tmp_path: Path, mocker: MockerFixture):
+    """On a result cache hit clang-tidy is not launched and the cached fixes file is restored."""
+    fixes = tmp_path / "foo.fixes.yaml"
+    cache_entry = unit.clang_tidy_result_cache.CacheEntry(
+        returncode=0,
+        stdout="",
+        stderr="",
+        fixes="cached fixes",
+        tidy_findings=common.TidyFindings(0, 0, 0, 0, 0),
+        no_tidy_findings=True,
+    )
+    mocker.patch.object(unit.clang_tidy_result_cache, "get_cache_key", return_value="key")
+    load_mock = mocker.patch.object(unit.clang_tidy_result_cache, "load", return_value=cache_entry)
+    subprocess_mock = mocker.patch.object(unit, "run_buffered")
+    result_cache = unit.clang_tidy_result_cache.ResultCacheConfig(str(tmp_path), "clang", 1024)
+
+    arguments = {**get_default_run_clang_tidy_args(), "verbose": False, "fixes": str(fixes)}
+    assert unit.run_clang_tidy(**arguments, result_cache=result_cache)
+
+    load_mock.assert_called_once_with(str(tmp_path), "key")
+    subprocess_mock.assert_not_called()
+    assert fixes.read_text() == "cached fixes"
+
+
+def test_run_clang_tidy_stores_result_on_cache_miss(tmp_path: Path, mocker: MockerFixture):
+    """On a result cache miss clang-tidy is launched and its result is stored."""
+    mocker.patch.object(unit.clang_tidy_result_cache, "get_cache_key", return_value="key")
+    mocker.patch.object(unit.clang_tidy_result_cache, "load", return_value=None)
+    store_mock = mocker.patch.object(unit.clang_tidy_result_cache, "store")
+    mocker.patch.object(
+        unit,
+        "run_buffered",
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stderr="", stdout=""),
+    )
+    result_cache = unit.clang_tidy_result_cache.ResultCacheConfig(str(tmp_path), "clang", 1024)
+
+    arguments = {**get_default_run_clang_tidy_args(), "verbose": False, "fixes": None}
+    assert unit.run_clang_tidy(**arguments, result_cache=result_cache)
+
+    store_mock.assert_called_once()
+    assert store_mock.call_args.args[1] == "key"
+
+
+def test_execute_writes_unused_inputs(tmp_path: Path, mocker: MockerFixture):
+    """The unused inputs of all translation units are reported after running clang-tidy."""
+    unused_inputs_list = tmp_path / "unused_inputs"
+    arguments = get_batch_arguments(["a.cpp", "b.cpp"]) + [
+        "--unused_inputs_list",
+        str(unused_inputs_list),
+        "--prunable_inputs",
+        "a.h",
+        "c.h",
+        "--preprocessor",
+        "clang",
+    ]
+    mocker.patch.object(unit, "run_translation_units", return_value=True)
+    get_unused_inputs_mock = mocker.patch.object(
+        unit.clang_tidy_include_scanner, "get_unused_inputs", return_value=["c.h"]
+    )
+
+    assert unit.execute(unit.parse_args(arguments)) == 0
+
+    get_unused_inputs_mock.assert_called_once_with(
+        "clang",
+        [("a.cpp", ["clang-tidy", "-DFILE=a.cpp"]), ("b.cpp", ["clang-tidy", "-DFILE=b.cpp"])],
+        ["a.h", "c.h"],
+    )
+    assert unused_inputs_list.read_text() == "c.h\n"
+
+
+def test_parse_args_with_unused_inputs_list_without_preprocessor():
+    """The include scanning requires a preprocessor."""
+    with pytest.raises(SystemExit):
+        unit.parse_args(get_batch_arguments(["a.cpp"]) + ["--unused_inputs_list", "unused_inputs"])
+
+
+def test_get_translation_units_with_foreign_headers():
+    """The foreign headers are given once per src file, an empty list is valid."""
+    arguments = get_batch_arguments(["a.cpp", "b.cpp"]) + ["--foreign_headers", "b.h;dep.h", "--foreign_headers", ""]
+
+    translation_units = unit.get_translation_units(unit.parse_args(arguments))
+
+    assert [translation_unit.foreign_headers for translation_unit in translation_units] == [["b.h", "dep.h"], []]
+
+
+def test_get_translation_units_with_dependency_headers(tmp_path: Path):
+    """The headers reported by the dependencies are foreign headers of every src file."""
+    dependency_headers_file = tmp_path / "dependency_headers.txt"
+    dependency_headers_file.write_text("dep/dep.h\ndep/types.h\n")
+    arguments = get_batch_arguments(["a.cpp", "b.cpp"]) + ["--foreign_headers", "b.h", "--foreign_headers", ""]
+    arguments += ["--dependency_headers_file", str(dependency_headers_file)]
+
+    translation_units = unit.get_translation_units(unit.parse_args(arguments))
+
+    assert [translation_unit.foreign_headers for translation_unit in translation_units] == [
+        ["b.h", "dep/dep.h", "dep/types.h"],
+        ["dep/dep.h", "dep/types.h"],
+    ]
+
+
+def test_run_clang_tidy_stores_check_profile(tmp_path: Path, mocker: MockerFixture):
+    """The profile stored by clang-tidy is moved to the declared check profile."""
+    check_profile = tmp_path / "foo.check_profile.json"
+    args = {**get_default_run_clang_tidy_args(), "fixes": None, "verbose": False, "check_profile": str(check_profile)}
+
+    def run(command, *_):
+        store_flag = next(argument for argument in command if argument.startswith("--store-check-profile="))
+        profile_dir = Path(store_flag.partition("=")[2])
+        profile_dir.mkdir()
+        (profile_dir / "20250101-source.cpp.json").write_text(
+            json.dumps({"file": "source.cpp", "profile": {"time.clang-tidy.misc-unused.wall": 0.5}})
+        )
+        return subprocess.CompletedProcess(args=command, returncode=0, stderr="", stdout="")
+
+    run_mock = mocker.patch.object(unit, "run_buffered", side_effect=run)
+
+    assert unit.run_clang_tidy(**args)
+
+    assert "--enable-check-profile" in run_mock.call_args[0][0]
+    assert json.loads(check_profile.read_text()) == {
+        "file": "source.cpp",
+        "profile": {"time.clang-tidy.misc-unused.wall": 0.5},
+    }
+    assert not Path(f"{check_profile}.d").exists()
+
+
+def test_execute_writes_trace_file(tmp_path: Path, mocker: MockerFixture):
+    """The phases of each translation unit are written as Chrome trace."""
+    trace_file = tmp_path / "trace.json"
+    merged_config_file = tmp_path / ".clang-tidy-merged"
+    merged_config_file.write_text("Checks: '-*,bugprone-*'\n")
+    arguments = [
+        "--tool_bin",
+        "clang-tidy",
+        "--merged_config_file",
+        str(merged_config_file),
+        "--src_file",
+        "foo.cpp",
+        "--arguments",
+        "clang-tidy;-DFOO",
+        "--compile_commands_file",
+        str(tmp_path / "compile_commands.json"),
+        "--fixes",
+        str(tmp_path / "foo.fixes.yaml"),
+        "--trace_file",
+        str(trace_file),
+    ]
+    mocker.patch.object(
+        unit,
+        "run_buffered",
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stderr="", stdout=""),
+    )
+
+    assert unit.execute(unit.parse_args(arguments)) == 0
+
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == [
+        "process_name",
+        "compile_commands write",
+        "clang-tidy",
+        "filter_stdout",
+        "run_clang_tidy",
+    ]
+    assert events[-1]["args"] == {"src_file": "foo.cpp"}
+
+
+def test_run_streamed_with_timeout(monkeypatch: pytest.MonkeyPatch):
+    """A streamed run exceeding the timeout is killed and its spools are closed."""
+    spools = []
+    spooled_temporary_file = tempfile.SpooledTemporaryFile
+
+    def spool(*args, **kwargs):
+        spools.append(spooled_temporary_file(*args, **kwargs))
+        return spools[-1]
+
+    monkeypatch.setattr(tempfile, "SpooledTemporaryFile", spool)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        unit.run_streamed([sys.executable, "-c", "import time; time.sleep(30)"], os.environ, timeout=0.2)
+
+    assert len(spools) == 2
+    assert all(spool.closed for spool in spools)
+
+
+@pytest.mark.parametrize(
+    "run_side_effect, resource_limits, expected_reason",
+    [
+        (
+            subprocess.TimeoutExpired(cmd=["clang-tidy"], timeout=60),
+            unit.ResourceLimits(timeout=60, memory_limit=None),
+            "clang-tidy exceeded the time limit of 60 second(s)",
+        ),
+        (
+            [subprocess.CompletedProcess(args=[], returncode=-6, stderr="LLVM ERROR: out of memory\n", stdout="")] * 2,
+            unit.ResourceLimits(timeout=None, memory_limit=512 * 1024 * 1024),
+            "clang-tidy exceeded the memory limit of 512 MiB",
+        ),
+    ],
+)
+def test_run_clang_tidy_aborted(  # pylint: disable=too-many-arguments
+    tmp_path: Path,
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+    run_side_effect: t.Any,
+    resource_limits: unit.ResourceLimits,
+    expected_reason: str,
+):
+    """A translation unit exceeding a resource limit is marked as aborted in its fixes, findings and statistics."""
+    fixes = tmp_path / "foo.fixes.yaml"
+    findings = tmp_path / "foo.findings.jsonl"
+    suppression_stats = tmp_path / "foo.suppression_stats.json"
+    args = {
+        **get_default_run_clang_tidy_args(),
+        "fixes": str(fixes),
+        "findings": str(findings),
+        "suppression_stats": str(suppression_stats),
+        "suppress_patterns": ("foo.*",),
+        "verbose": False,
+        "resource_limits": resource_limits,
+    }
+    mocker.patch.object(unit, "run_buffered", side_effect=run_side_effect)
+
+    assert not unit.run_clang_tidy(**args)
+    assert unit.run_clang_tidy(**{**args, "treat_clang_tidy_warnings_as_errors": False})
+
+    assert fixes.read_text() == f"Analysis aborted: {expected_reason}\n"
+    assert list(clang_tidy_findings.read(str(findings))) == [
+        {
+            "file": "source.cpp",
+            "line": None,
+            "column": None,
+            "check": "clang-tidy-analysis-aborted",
+            "level": "error",
+            "message": expected_reason,
+        }
+    ]
+    assert json.loads(suppression_stats.read_text()) == {
+        "diagnostics": 0,
+        "hits": {"foo.*": 0},
+        "aborted": expected_reason,
+    }
+    assert f"The analysis of source.cpp was aborted: {expected_reason}" in caplog.text
+
+
+MEMORY_LIMITED_CLANG_TIDY_SCRIPT = """#!{executable}
+import os
+import resource
+import sys
+import time
+
+# The limit is set by the runner right after launching the process
+deadline = time.monotonic() + 30
+while resource.getrlimit(resource.RLIMIT_AS)[0] == resource.RLIM_INFINITY and time.monotonic() < deadline:
+    time.sleep(0.01)
+with open(os.path.join({limits_dir!r}, str(os.getpid())), mode="w", encoding="utf-8") as limit_file:
+    limit_file.write(str(resource.getrlimit(resource.RLIMIT_AS)[0]))
+sys.stderr.write("1 warning generated.\\nSuppressed 1 warnings (1 in non-user code).\\n")
+"""
+
+
+@pytest.mark.parametrize("stream_output", [False, True])
+def test_execute_with_jobs_and_memory_limit(tmp_path: Path, stream_output: bool):
+    """The memory limit is applied to each concurrently running clang-tidy process."""
+    limits_dir = tmp_path / "limits"
+    limits_dir.mkdir()
+    clang_tidy = tmp_path / "clang-tidy"
+    clang_tidy.write_text(
+        MEMORY_LIMITED_CLANG_TIDY_SCRIPT.format(executable=sys.executable, limits_dir=str(limits_dir))
+    )
+    clang_tidy.chmod(0o755)
+    merged_config_file = tmp_path / ".clang-tidy-merged"
+    merged_config_file.write_text("Checks: '-*,bugprone-*'\n")
+
+    src_files = ["a.cpp", "b.cpp", "c.cpp", "d.cpp"]
+    arguments = ["--tool_bin", str(clang_tidy), "--merged_config_file", str(merged_config_file)]
+    arguments += ["--jobs", "2", "--memory_limit_mb", "4096"] + (["--stream_output"] if stream_output else [])
+    for src_file in src_files:
+        arguments += [
+            "--src_file",
+            src_file,
+            "--arguments",
+            f"clang-tidy;-DFILE={src_file}",
+            "--compile_commands_file",
+            str(tmp_path / f"{src_file}.compile_commands.json"),
+            "--fixes",
+            str(tmp_path / f"{src_file}.fixes.yaml"),
+        ]
+
+    assert unit.execute(unit.parse_args(arguments)) == 0
+
+    limits = [limit_file.read_text() for limit_file in limits_dir.iterdir()]
+    assert limits == [str(4096 * 1024 * 1024)] * len(src_files)
+
+
+def test_build_command_with_line_filter():
+    """The line filter restricts the findings of clang-tidy to the changed lines."""
+    line_filter = '[{"name":"bar/foo.cpp","lines":[[1,2]]}]'
+
+    command = unit.build_command(**get_default_build_command_args(), line_filter=line_filter)
+
+    assert command[command.index("--line-filter") + 1] == line_filter
+
+
+def test_run_clang_tidy_skips_unchanged_translation_unit(tmp_path: Path, mocker: MockerFixture):
+    """Without any changed line in the src file or a header, clang-tidy is not launched at all."""
+    fixes = tmp_path / "foo.fixes.yaml"
+    args = {**get_default_run_clang_tidy_args(), "fixes": str(fixes), "verbose": False}
+    run_mock = mocker.patch.object(unit, "run_buffered")
+
+    assert unit.run_clang_tidy(**args, changed_lines=clang_tidy_changed_lines.ChangedLines({"other.cpp": [[1, 1]]}))
+
+    run_mock.assert_not_called()
+    assert fixes.read_text() == common.NO_FIXES_REQUIRED
@@ -0,0 +1,111 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_summary module.
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import quality.private.clang_tidy.tools.clang_tidy_summary as unit
+from quality.private.clang_tidy.tools import common
+
+FIXES = """---
+MainSourceFile: '{src_file}'
+Diagnostics:
+- DiagnosticName: bugprone-argument-comment
+  DiagnosticMessage:
+    Message: 'argument name ''call'' in comment does not match parameter name ''lib'''
+    FilePath: 'lib/lib.h'
+    FileOffset: 42
+    Replacements: []
+  Notes:
+  - Message: 'declared here'
+    FilePath: 'lib/other.h'
+    FileOffset: 7
+  Level: Warning
+- DiagnosticName: misc-const-correctness
+  DiagnosticMessage:
+    Message: 'variable ''a'' can be const'
+    FilePath: '{src_file}'
+    FileOffset: 10
+    Replacements: []
+  Level: Warning
+...
+"""
+
+
+@pytest.fixture(name="fixes_files")
+def fixes_files_fixture(tmp_path: Path) -> list:
+    """Provides the fixes files of two translation units sharing a finding in a header, and an aborted one."""
+    fixes_files = []
+    for name in ["b", "a"]:
+        fixes_file = tmp_path / f"{name}.fixes.yaml"
+        fixes_file.write_text(FIXES.format(src_file=f"lib/{name}.cpp"))
+        fixes_files.append(str(fixes_file))
+    aborted = tmp_path / "c.fixes.yaml"
+    aborted.write_text(common.ANALYSIS_ABORTED.format(reason="timeout"))
+    no_fixes = tmp_path / "d.fixes.yaml"
+    no_fixes.write_text(common.NO_FIXES_REQUIRED)
+    return fixes_files + [str(aborted), str(no_fixes), str(no_fixes)]
+
+
+def test_aggregate(fixes_files: list):
+    """Findings are written once and counted per check and per file, the inputs are sorted."""
+    text_output = io.StringIO()
+
+    structured_summary = unit.aggregate(fixes_files, text_output)
+
+    text_summary = text_output.getvalue()
+    assert text_summary.startswith(
+        "Aggregated clang-tidy output\n"
+        "Aggregating 4 result file(s): a.fixes.yaml,b.fixes.yaml,c.fixes.yaml,d.fixes.yaml\n\n"
+    )
+    assert text_summary.count("bugprone-argument-comment") == 1
+    assert text_summary.index("lib/a.cpp") < text_summary.index("lib/b.cpp")
+    assert "'argument name ''call'' in comment does not match parameter name ''lib'''" in text_summary
+    assert common.NO_FIXES_REQUIRED in text_summary
+    assert structured_summary == {
+        "fixes_files": 4,
+        "findings": 3,
+        "duplicates": 1,
+        "aborted": [fixes_files[2]],
+        "per_check": {"misc-const-correctness": 2, "bugprone-argument-comment": 1},
+        "per_file": {"lib/a.cpp": 1, "lib/b.cpp": 1, "lib/lib.h": 1},
+    }
+
+
+def test_aggregate_without_outputs():
+    """Without any fixes file the summary says so."""
+    text_output = io.StringIO()
+
+    assert unit.aggregate([], text_output)["findings"] == 0
+    assert unit.NO_OUTPUTS in text_output.getvalue()
+
+
+def test_main(tmp_path: Path, fixes_files: list, monkeypatch: pytest.MonkeyPatch):
+    """The inputs are read from a params file."""
+    params_file = tmp_path / "summary.params"
+    params_file.write_text("\n".join(["--output", str(tmp_path / "summary.out")] + fixes_files))
+    structured_output = tmp_path / "summary.json"
+
+    monkeypatch.setattr(sys, "argv", ["", f"@{params_file}", "--structured_output", str(structured_output)])
+
+    assert unit.main() == 0
+    assert (tmp_path / "summary.out").read_text().startswith(unit.SUMMARY_HEADER)
+    assert json.loads(structured_output.read_text())["findings"] == 3
@@ -0,0 +1,116 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_suppressions module.
+"""
+
+import json
+import re
+import sys
+import typing as t
+from pathlib import Path
+
+import pytest
+
+import quality.private.clang_tidy.tools.clang_tidy_suppressions as unit
+
+PATTERNS = [
+    r"variable '\w+' is non-const",
+    r"do not use C-style arrays",
+    r"(?:.*)expanded from macro",
+    r"(\w+) is \1",
+    r"do not use.*",
+    r"no hit at all",
+]
+
+MESSAGES = [
+    "variable 'foo' is non-const and globally accessible",
+    "do not use C-style arrays, use std::array<> instead",
+    "do not use pointer arithmetic",
+    "note: expanded from macro 'TEST'",
+    "same is same",
+    "same is other",
+    "",
+]
+
+
+@pytest.mark.parametrize(
+    "pattern, expected_prefix",
+    [
+        ("do not use", ("do not use", True)),
+        (r"std::array\<\> instead", ("std::array<> instead", True)),
+        (r"variable '\w+'", ("variable '", False)),
+        ("members?", ("member", False)),
+        ("a{2}", ("", False)),
+        ("prefix+", ("prefix", False)),
+        ("(?i)case", ("", False)),
+        ("foo|bar", ("", False)),
+        (r"\d+ warnings", ("", False)),
+    ],
+)
+def test_get_literal_prefix(pattern: str, expected_prefix: t.Tuple[str, bool]):
+    """Only the text every match starts with is literal, optional characters are not part of the prefix."""
+    assert unit.get_literal_prefix(pattern) == expected_prefix
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_match_equals_matching_in_order(message: str):
+    """A message is attributed to the first matching pattern, like matching each pattern in order."""
+    expected = next((index for index, pattern in enumerate(PATTERNS) if re.match(pattern, message)), None)
+
+    assert unit.SuppressionPatterns(PATTERNS).match(message) == expected
+
+
+def test_patterns_which_cannot_be_combined():
+    """Patterns with global flags are matched one by one."""
+    patterns = unit.SuppressionPatterns([r"(?i)VARIABLE", r".*arrays"])
+
+    assert patterns.combined is None
+    assert patterns.match("variable 'foo'") == 0
+    assert patterns.match("C-style arrays") == 1
+    assert patterns.match("pointer arithmetic") is None
+
+
+def test_aggregate_suppression_stats(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """The hits of all translation units are summed up, patterns without any hit are reported."""
+    (tmp_path / "a").mkdir()
+    unit.write_stats(str(tmp_path / "a" / f"foo.cpp{unit.SUPPRESSION_STATS_SUFFIX}"), PATTERNS[:2], {PATTERNS[0]: 2}, 5)
+    unit.write_stats(str(tmp_path / f"bar.cpp{unit.SUPPRESSION_STATS_SUFFIX}"), PATTERNS[:2], {PATTERNS[0]: 1}, 1)
+    output = tmp_path / "suppressions.json"
+
+    monkeypatch.setattr(sys, "argv", ["", str(tmp_path), "--output", str(output)])
+
+    assert unit.main() == 0
+    assert json.loads(output.read_text()) == {"diagnostics": 6, "hits": {PATTERNS[0]: 3, PATTERNS[1]: 0}}
+    report = capsys.readouterr().out
+    assert "3 diagnostic(s) suppressed by 1 of 2 pattern(s)." in report
+    assert report.endswith(f"Patterns without any hit:\n  {PATTERNS[1]}\n")
+
+
+def test_aggregate_aborted_suppression_stats(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    """The statistics of an aborted analysis are counted, but reported as incomplete."""
+    aborted = tmp_path / f"foo.cpp{unit.SUPPRESSION_STATS_SUFFIX}"
+    unit.write_stats(str(aborted), PATTERNS[:1], {}, 0, aborted="timeout")
+
+    hits, diagnostics, count = unit.aggregate([str(aborted)])
+
+    assert (hits, diagnostics, count) == ({PATTERNS[0]: 0}, 0, 1)
+    assert f"The suppression statistics {aborted} are incomplete, the analysis was aborted: timeout" in caplog.text
+
+
+def test_aggregate_without_suppression_stats(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """An empty directory is an error."""
+    monkeypatch.setattr(sys, "argv", ["", str(tmp_path)])
+
+    assert unit.main() == 1
@@ -0,0 +1,63 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the clang_tidy_workspace_runner module.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+import quality.private.clang_tidy.tools.clang_tidy_workspace_runner as unit
+
+DATABASE = [
+    {"directory": "/execroot", "file": "lib/foo.cpp", "arguments": ["clang-tidy", "-DFOO", "lib/foo.cpp"]},
+    {"directory": "/execroot", "file": "test/foo_test.cpp", "arguments": ["clang-tidy", "test/foo_test.cpp"]},
+]
+
+
+def test_select_entries():
+    """Entries are selected by their source file."""
+    assert unit.select_entries(DATABASE, "^lib/") == DATABASE[:1]
+    assert unit.select_entries(DATABASE, "") == DATABASE
+
+
+def test_get_runner_arguments():
+    """Each entry becomes a translation unit of one runner batch."""
+    args = unit.parse_args(["db.json", "--config_file", "/.clang-tidy", "--tool_bin", "/clang-tidy", "--jobs", "4"])
+
+    runner_args = unit.clang_tidy_runner.parse_args(unit.get_runner_arguments(DATABASE, "/out", args))
+
+    assert runner_args.src_file == ["lib/foo.cpp", "test/foo_test.cpp"]
+    assert runner_args.arguments == ["/clang-tidy;-DFOO;lib/foo.cpp", "/clang-tidy;test/foo_test.cpp"]
+    assert runner_args.fixes == ["/out/0/fixes.yaml", "/out/1/fixes.yaml"]
+    assert (runner_args.merged_config_file, runner_args.jobs) == ("/.clang-tidy", 4)
+
+
+def test_main(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture):
+    """The runner is executed in the directory of the entries."""
+    database = tmp_path / "compile_commands.json"
+    database.write_text(json.dumps([{**DATABASE[0], "directory": str(tmp_path)}]))
+    execute_mock = mocker.patch.object(unit.clang_tidy_runner, "execute", return_value=0)
+    monkeypatch.chdir(tmp_path)
+
+    monkeypatch.setattr(sys, "argv", ["", str(database), "--config_file", ".clang-tidy"])
+    assert unit.main() == 0
+    assert execute_mock.call_args[0][0].merged_config_file == str(tmp_path / ".clang-tidy")
+
+    monkeypatch.setattr(sys, "argv", ["", str(database), "--config_file", ".clang-tidy", "--files", "^test/"])
+    assert unit.main() == 1
@@ -0,0 +1,175 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Tests for the persistent_worker module.
+"""
+
+import io
+import json
+import logging
+import threading
+import typing as t
+
+import pytest
+
+import quality.private.clang_tidy.tools.persistent_worker as unit
+
+
+def echo_handler(arguments: t.List[str]) -> t.Tuple[int, str]:
+    """A handler returning its arguments as output."""
+    return len(arguments), " ".join(arguments)
+
+
+def run_worker(requests: str, handler=echo_handler) -> t.List[dict]:
+    """Runs the worker main loop on the given requests and returns the parsed responses."""
+    output_stream = io.StringIO()
+    assert unit.run(handler, io.StringIO(requests), output_stream) == 0
+    return [json.loads(line) for line in output_stream.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["--persistent_worker"], True),
+        (["--src_file", "foo.cpp"], False),
+        ([], False),
+    ],
+)
+def test_is_persistent_worker(argv: t.List[str], expected: bool):
+    """Test the function is_persistent_worker."""
+    assert unit.is_persistent_worker(argv) == expected
+
+
+def test_run_singleplex_requests_in_order():
+    """Singleplex requests without a request id are answered in order."""
+    requests = '{"arguments": ["a"]}\n{"arguments": ["b", "c"]}\n'
+
+    responses = run_worker(requests)
+
+    assert responses == [
+        {"exitCode": 1, "output": "a", "requestId": 0},
+        {"exitCode": 2, "output": "b c", "requestId": 0},
+    ]
+
+
+def test_run_multi_line_requests():
+    """Requests may be pretty printed over multiple lines."""
+    requests = '{\n  "arguments": [\n    "a"\n  ]\n}\n\n{"arguments": []}\n'
+
+    responses = run_worker(requests)
+
+    assert [response["output"] for response in responses] == ["a", ""]
+
+
+def test_run_multiplex_requests_concurrently():
+    """Multiplex requests are processed concurrently and answered with their request id."""
+    barrier = threading.Barrier(2, timeout=10)
+
+    def blocking_handler(arguments: t.List[str]) -> t.Tuple[int, str]:
+        # Both requests must be in flight at the same time to pass the barrier
+        barrier.wait()
+        return 0, arguments[0]
+
+    requests = '{"arguments": ["a"], "requestId": 1}\n{"arguments": ["b"], "requestId": 2}\n'
+
+    responses = run_worker(requests, blocking_handler)
+
+    assert sorted((response["requestId"], response["output"]) for response in responses) == [(1, "a"), (2, "b")]
+
+
+def test_process_request_with_sandbox_dir():
+    """Multiplex sandboxing is rejected."""
+    response = unit.process_request({"arguments": [], "requestId": 3, "sandboxDir": "sandbox/3"}, echo_handler)
+
+    assert response["exitCode"] == 1
+    assert response["requestId"] == 3
+    assert "not supported" in response["output"]
+
+
+@pytest.mark.parametrize(
+    "exception, expected_exit_code, expected_output",
+    [
+        (SystemExit(2), 2, "2"),
+        (unit.WorkRequestError("usage: runner\nrunner: error: invalid\n", exit_code=2), 2, "runner: error: invalid"),
+        (SystemExit("No file named foo found"), 1, "No file named foo found"),
+        (RuntimeError("unexpected"), 1, "RuntimeError: unexpected"),
+    ],
+)
+def test_process_request_with_exception(exception: BaseException, expected_exit_code: int, expected_output: str):
+    """Exceptions of the handler do not stop the worker but fail the request."""
+
+    def raising_handler(_: t.List[str]) -> t.Tuple[int, str]:
+        raise exception
+
+    response = unit.process_request({"arguments": []}, raising_handler)
+
+    assert response["exitCode"] == expected_exit_code
+    assert expected_output in response["output"]
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        (None, 0),
+        (0, 0),
+        (3, 3),
+        ("message", 1),
+    ],
+)
+def test_get_exit_code(code, expected: int):
+    """Test the function get_exit_code."""
+    assert unit.get_exit_code(SystemExit(code)) == expected
+
+
+def test_captured_logs_only_of_current_thread():
+    """Only messages of the current thread and above the requested level are captured."""
+    logging.getLogger().setLevel(logging.DEBUG)
+
+    with unit.captured_logs(logging.INFO, "%(levelname)s: %(message)s") as stream:
+        logging.debug("hidden debug message")
+        logging.info("visible info message")
+        thread = threading.Thread(target=logging.warning, args=("message from other thread",))
+        thread.start()
+        thread.join()
+
+    logging.info("message after capturing")
+
+    assert stream.getvalue() == "INFO: visible info message\n"
+
+
+def test_argument_parser_raises_errors(capsys: pytest.CaptureFixture):
+    """Errors of a work request are raised along with the usage, nothing is printed to the stderr of the worker."""
+    parser = unit.ArgumentParser(prog="runner")
+    parser.add_argument("--src_file", required=True)
+
+    with pytest.raises(unit.WorkRequestError) as error:
+        parser.parse_args(["--bogus_flag"])
+
+    assert error.value.exit_code == 2
+    assert str(error.value).startswith("usage: runner [-h] --src_file SRC_FILE\nrunner: error: ")
+    assert capsys.readouterr().err == ""
+
+
+def test_captured_logs_set_the_root_level():
+    """The root logger is at the lowest level of the captures in flight, its level is restored afterwards."""
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.WARNING)
+
+    with unit.captured_logs(logging.INFO, "%(message)s"):
+        assert root_logger.level == logging.INFO
+        with unit.captured_logs(logging.DEBUG, "%(message)s"):
+            assert root_logger.level == logging.DEBUG
+        assert root_logger.level == logging.INFO
+
+    assert root_logger.level == logging.WARNING
@@ -0,0 +1,72 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Startup of the clang-tidy runner, measured from the first import until clang-tidy would be launched.
+"""
+
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from quality.private.common.tools.test import benchmark
+
+# The runner is started once per translation unit, hence its startup is budgeted
+STARTUP_BUDGET_SECONDS = 0.2
+RUNS = 3
+
+# Modules which must only be loaded on the code paths which need them
+HEAVY_MODULES = ["jsonschema", "ruamel.yaml", "yaml"]
+
+
+def run_startup(tmp_path: Path) -> t.Dict[str, t.Any]:
+    """Runs the runner up to the clang-tidy launch in a fresh interpreter."""
+    merged_config_file = tmp_path / ".clang-tidy-merged"
+    merged_config_file.write_text("Checks: '-*,bugprone-*'\n")
+    arguments = [
+        "--tool_bin",
+        "clang-tidy",
+        "--merged_config_file",
+        str(merged_config_file),
+        "--src_file",
+        "foo.cpp",
+        "--arguments",
+        "clang-tidy;-DFOO",
+        "--compile_commands_file",
+        str(tmp_path / "compile_commands.json"),
+        "--fixes",
+        str(tmp_path / "foo.fixes.yaml"),
+    ]
+    startup = benchmark.run_startup(
+        "quality.private.clang_tidy.tools.clang_tidy_runner",
+        "clang_tidy_runner.execute(clang_tidy_runner.parse_args(sys.argv[1:]))",
+        arguments,
+    )
+    assert startup["launched"], "The runner finished without launching clang-tidy"
+    return startup
+
+
+@pytest.mark.skipif(not benchmark.ENABLED, reason=benchmark.SKIP_REASON)
+def test_startup_within_budget(tmp_path: Path):
+    """The runner reaches the clang-tidy launch within the budget."""
+    seconds = min(run_startup(tmp_path)["seconds"] for _ in range(RUNS))
+
+    assert seconds < STARTUP_BUDGET_SECONDS
+
+
+def test_startup_without_heavy_modules(tmp_path: Path):
+    """Heavy modules are not loaded before clang-tidy is launched."""
+    modules = run_startup(tmp_path)["modules"]
+
+    assert [module for module in HEAVY_MODULES if module in modules] == []
@@ -0,0 +1,92 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Helpers of the benchmarks within the tests of the runners.
+
+Wall-clock timings depend on the load of the machine, hence the benchmarks are skipped unless they are enabled
+via the `QUALITY_BENCHMARKS` environment variable, e.g. `bazel test --test_env=QUALITY_BENCHMARKS=1`.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+import typing as t
+
+ENABLED = os.environ.get("QUALITY_BENCHMARKS", "") not in ("", "0")
+SKIP_REASON = "Benchmarks only run if QUALITY_BENCHMARKS is set"
+
+# Number of runs of a measurement, the fastest one is the least disturbed by other load
+RUNS = 3
+
+STARTUP_SCRIPT = """
+import json
+import subprocess
+import sys
+import time
+
+start = time.perf_counter()
+
+
+class Launched(Exception):
+    pass
+
+
+def launch(*args, **kwargs):
+    raise Launched()
+
+
+subprocess.run = launch
+subprocess.Popen.__init__ = launch
+
+from {module} import {name}
+
+launched = False
+try:
+    {main}
+except Launched:
+    launched = True
+
+seconds = time.perf_counter() - start
+print(json.dumps({{"launched": launched, "seconds": seconds, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(function: t.Callable[[], t.Any], runs: int = RUNS) -> t.Tuple[float, t.Any]:
+    """Returns the seconds of the fastest of several calls of the function, along with the result of the last one."""
+    seconds = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), result
+
+
+def run_startup(module: str, main: str, arguments: t.List[str]) -> t.Dict[str, t.Any]:
+    """
+    Runs the main call of a runner module in a fresh interpreter up to the launch of its first subprocess. Returns
+    whether it got launched, the seconds since the first import and the loaded modules.
+    """
+    package, _, name = module.rpartition(".")
+    script = STARTUP_SCRIPT.format(module=package, name=name, main=main)
+    result = subprocess.run(
+        [sys.executable, "-c", script, *arguments],
+        check=True,
+        universal_newlines=True,
+        stdout=subprocess.PIPE,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    return json.loads(result.stdout.splitlines()[-1])
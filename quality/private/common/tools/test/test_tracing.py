@@ -0,0 +1,127 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""Tests for the tracing module."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from quality.private.common.tools import tracing
+
+
+def test_phase_without_active_tracer():
+    """Phases are a no-op unless a tracer is active."""
+    with tracing.phase("untraced"):
+        pass
+
+    with tracing.activated(None), tracing.phase("untraced"):
+        pass
+
+
+def test_phases_are_recorded_per_thread():
+    """Only the phases of the thread which activated the tracer are recorded."""
+    tracer = tracing.Tracer("runner")
+
+    def untraced():
+        with tracing.phase("other thread"):
+            pass
+
+    with tracing.activated(tracer):
+        with tracing.phase("outer", src_file="foo.cpp"), tracing.phase("inner"):
+            thread = threading.Thread(target=untraced)
+            thread.start()
+            thread.join()
+
+    with tracing.phase("after"):
+        pass
+
+    events = tracer.events
+    assert [event["name"] for event in events] == ["inner", "outer"]
+    assert events[1]["args"] == {"src_file": "foo.cpp"}
+    assert events[1]["ts"] <= events[0]["ts"]
+    assert events[1]["dur"] >= events[0]["dur"]
+    assert all(event["ph"] == "X" and event["cat"] == "runner" for event in events)
+
+
+def test_child_usage():
+    """The resource usage of a child is recorded in the innermost phase waiting for it."""
+    tracer = tracing.Tracer("runner")
+
+    with tracer.phase("outer"), tracer.phase("child"):
+        result = tracing.run([sys.executable, "-c", "print('child')"], check=True, stdout=subprocess.PIPE, text=True)
+
+    assert result.stdout == "child\n"
+    events = {event["name"]: event["args"] for event in tracer.events}
+    assert events["outer"] == {}
+    if hasattr(os, "wait4"):
+        assert set(events["child"]) == {"child_user_cpu_s", "child_system_cpu_s", "child_max_rss"}
+        assert events["child"]["child_max_rss"] > 0
+
+
+def test_child_usage_per_thread():
+    """The children of other threads are not attributed to a phase."""
+    tracer = tracing.Tracer("runner")
+
+    def run(name, code):
+        with tracing.activated(tracer), tracing.phase(name):
+            tracing.run([sys.executable, "-c", code], check=True)
+
+    busy = threading.Thread(target=run, args=("busy", "sum(range(20_000_000))"))
+    idle = threading.Thread(target=run, args=("idle", "import time; time.sleep(1.5)"))
+    idle.start()
+    busy.start()
+    busy.join()
+    idle.join()
+
+    usage = {event["name"]: event["args"] for event in tracer.events}
+    if hasattr(os, "wait4"):
+        assert usage["idle"]["child_user_cpu_s"] < usage["busy"]["child_user_cpu_s"]
+
+
+def test_run_with_timeout():
+    """A child exceeding the timeout is killed, like with `subprocess.run`."""
+    with pytest.raises(subprocess.TimeoutExpired):
+        tracing.run([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2)
+
+
+def test_run_with_check():
+    """A failing child raises if checked, like with `subprocess.run`."""
+    with pytest.raises(subprocess.CalledProcessError):
+        tracing.run([sys.executable, "-c", "raise SystemExit(3)"], check=True)
+
+    assert tracing.run([sys.executable, "-c", "raise SystemExit(3)"]).returncode == 3
+
+
+def test_write(tmp_path: Path):
+    """The trace is written in the Chrome trace event format."""
+    tracer = tracing.Tracer("runner")
+    with tracer.phase("phase"):
+        pass
+    trace_file = tmp_path / "trace.json"
+
+    tracer.write(str(trace_file))
+
+    trace = json.loads(trace_file.read_text())
+    assert trace["traceEvents"][0] == {
+        "name": "process_name",
+        "ph": "M",
+        "pid": trace["traceEvents"][1]["pid"],
+        "args": {"name": "runner"},
+    }
+    assert trace["traceEvents"][1]["name"] == "phase"
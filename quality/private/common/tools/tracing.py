@@ -0,0 +1,163 @@
+# *******************************************************************************
+# Copyright (c) 2025 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+"""
+Phase level tracing of the runners, written in the Chrome trace event format.
+
+A tracer is activated per thread, instrumented code records its phases via `phase` and does not need to
+know whether tracing is enabled at all. Timestamps are microseconds since the unix epoch, such that the
+trace of an action can be loaded into Perfetto alongside the `--profile` of bazel.
+
+Child processes launched via `Popen` or `run` are reaped via `os.wait4`, such that the resource usage of each
+child is recorded in the innermost phase of the thread which waits for it. The usage of all children of the
+process would include the children of other threads, e.g. of concurrently analyzed translation units.
+"""
+
+import contextlib
+import json
+import os
+import subprocess
+import threading
+import time
+
+_ACTIVE = threading.local()
+
+
+def get_open_phases():
+    """Returns the arguments of the phases which are currently recorded by this thread, innermost last."""
+    if not hasattr(_ACTIVE, "phases"):
+        _ACTIVE.phases = []
+    return _ACTIVE.phases
+
+
+def record_child_usage(usage):
+    """Adds the resource usage of a reaped child process to the innermost phase of this thread, if any."""
+    phases = get_open_phases()
+    if not phases:
+        return
+    args = phases[-1]
+    args["child_user_cpu_s"] = round(args.get("child_user_cpu_s", 0) + usage.ru_utime, 6)
+    args["child_system_cpu_s"] = round(args.get("child_system_cpu_s", 0) + usage.ru_stime, 6)
+    # Maximum over the children of the phase, kilobytes on Linux and bytes on macOS
+    args["child_max_rss"] = max(args.get("child_max_rss", 0), usage.ru_maxrss)
+
+
+class Popen(subprocess.Popen):
+    """A `subprocess.Popen` which records the resource usage of its child process once it is waited for."""
+
+    def wait(self, timeout=None):
+        if self.returncode is not None or not hasattr(os, "wait4"):
+            return super().wait(timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.0005
+        try:
+            while True:
+                pid, status, usage = os.wait4(self.pid, 0 if deadline is None else os.WNOHANG)
+                if pid == self.pid:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(self.args, timeout)
+                delay = min(delay * 2, remaining, 0.05)
+                time.sleep(delay)
+        except ChildProcessError:
+            # The child has already been reaped, e.g. by a concurrent `poll`
+            return super().wait(timeout)
+
+        self.returncode = os.waitstatus_to_exitcode(status)
+        record_child_usage(usage)
+        return self.returncode
+
+
+def run(*popenargs, timeout=None, check=False, **kwargs):
+    """Runs a command like `subprocess.run`, the resource usage of the child process is recorded."""
+    with Popen(*popenargs, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, process.args, stdout, stderr)
+    return subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+
+
+class Tracer:
+    """Records complete trace events of one action, thread safe."""
+
+    def __init__(self, name):
+        self.name = name
+        self._events = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name, **args):
+        """Records the duration of the enclosed code, along with the resource usage of its child processes."""
+        phases = get_open_phases()
+        phases.append(args)
+        start = time.time_ns()
+        try:
+            yield
+        finally:
+            duration = time.time_ns() - start
+            phases.pop()
+            event = {
+                "name": name,
+                "cat": self.name,
+                "ph": "X",
+                "ts": start // 1000,
+                "dur": duration // 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self._events.append(event)
+
+    @property
+    def events(self):
+        """Returns a copy of the recorded events."""
+        with self._lock:
+            return list(self._events)
+
+    def write(self, trace_file):
+        """Writes the recorded events as a Chrome trace."""
+        process_name = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "args": {"name": self.name},
+        }
+        with open(trace_file, mode="w", encoding="utf-8") as trace:
+            json.dump({"traceEvents": [process_name] + self.events, "displayTimeUnit": "ms"}, trace)
+
+
+@contextlib.contextmanager
+def activated(tracer):
+    """Activates the tracer for the current thread, a None tracer disables tracing."""
+    previous = getattr(_ACTIVE, "tracer", None)
+    _ACTIVE.tracer = tracer
+    try:
+        yield tracer
+    finally:
+        _ACTIVE.tracer = previous
+
+
+def phase(name, **args):
+    """Records a phase with the tracer of the current thread, a no-op if tracing is not active."""
+    tracer = getattr(_ACTIVE, "tracer", None)
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.phase(name, **args)
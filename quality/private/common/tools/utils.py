@@ -17,9 +17,6 @@ import logging
 import sys
 from pathlib import Path
 
-import jsonschema
-import yaml
-
 
 def escape_quotes(arguments):
     """
@@ -33,6 +30,10 @@ def escape_quotes(arguments):
 
 def read_and_validate_yaml_file(yaml_file: Path, schema: dict) -> dict:
     """Read and validate a yaml file using a schema, then, return its content as a dict."""
+    # Imported lazily, since loading them dominates the startup of tools which only need `escape_quotes`
+    import jsonschema  # pylint: disable=import-outside-toplevel
+    import yaml  # pylint: disable=import-outside-toplevel
+
     with yaml_file.open(mode="r", encoding="UTF-8") as stream:
         try:
             content = yaml.safe_load(stream)
@@ -59,6 +59,7 @@ run_command "bazel test //..." "tests (bzlmod mode)"
 run_command "bazel build --config=clang_tidy --keep_going //..." "clang-tidy exit 0 (bzlmod mode)"
 run_command "bazel build --config=clang_tidy --features=treat_clang_tidy_warnings_as_errors //...; [ \$? -eq 1 ]" "clang_tidy exit 1 (bzlmod mode)"
 run_command "bazel build --config=clang_format --keep_going //..." "clang-format (bzlmod mode)"
+run_command "bazel aquery --config=clang_tidy --features=batch_clang_tidy 'mnemonic(ClangTidyAnalysis, //...)' | grep -q -- '--jobs'" "clang-tidy batched jobs (bzlmod mode)"
 
 # Run checks in workspace mode
 run_command "bazel --output_base=${BZL_WORSKPACE_OUTPUT_BASE} test --config=use_workspace_mode //..." "tests (workspace mode)"